@@ -1,15 +1,33 @@
 #! /usr/bin/env python3
 # coding: utf-8
 
+import argparse
 import logging
 import traceback
 
-from controller.main import Controller
+from controller.main import Controller, NAV_DEPTH
+from model.storage import BACKENDS
 
 logging.basicConfig(filename="CTM.log", filemode="w", level=logging.INFO)
 
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "-s",
+    "--storage",
+    choices=BACKENDS,
+    default="tinydb",
+    help="Storage backend used to save & load the data",
+)
+parser.add_argument(
+    "--history",
+    type=int,
+    default=NAV_DEPTH,
+    help="Number of pages kept in the navigation history",
+)
+args = parser.parse_args()
+
 try:
-    control = Controller()
+    control = Controller(storage=args.storage, nav_depth=args.history)
     control.open_menu_base()
     control.start()
 except Exception as e:
@@ -0,0 +1,56 @@
+#! /usr/bin/env python3
+# coding: utf-8
+
+""" The purpose of this module is to import an existing tournament.json in a SQLite file
+"""
+
+import argparse
+import os
+
+from model.world import World
+from model.tiny import TinyDbIO
+from model.sqlite import SqliteIO
+
+
+def migrate(source, target):
+    """Import the content of a TinyDB file (and its journal) into a SQLite file.
+
+    The content of the SQLite file is replaced.
+
+    Parameters
+    ----------
+    source : str
+        The path of the TinyDB file
+    target : str
+        The path of the SQLite file
+
+    Returns
+    -------
+    The number of imported tournaments and players
+    """
+
+    TinyDbIO.path = source
+    TinyDbIO.journal_path = os.path.splitext(source)[0] + ".journal"
+    SqliteIO.path = target
+
+    World.load(*TinyDbIO.load_all(), TinyDbIO.load_journal())
+    SqliteIO.save_all()
+
+    return len(World.tournaments), len(World.get_all_actors())
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("source", nargs="?", default=TinyDbIO.path)
+    parser.add_argument("target", nargs="?", default=SqliteIO.path)
+    args = parser.parse_args()
+
+    num_tournaments, num_players = migrate(args.source, args.target)
+
+    print(f"{num_tournaments} tournoi(s) et {num_players} joueur(s) importés")
+    print(f"Utilisez 'python3 CTM.py --storage sqlite' pour utiliser {args.target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#! /usr/bin/env python3
+# coding: utf-8
+
+""" The purpose of this module is to benchmark the memory used by the players
+
+It imports fake players from a JSON export (as a federation import would do)
+and compares the bytes per player of the compact Player (slots, date ordinal,
+interned names) with the previous layout (instance __dict__, datetime, set).
+
+    >>> python3 -m benchmarks.bench_memory
+"""
+
+import argparse
+import datetime
+import json
+import random
+import re
+import tracemalloc
+import uuid
+
+from model.player import Player
+
+from utils import FakePlayer
+
+
+class LegacyPlayer:
+    """ Reproduce the previous Player layout (only the stored attributes). """
+
+    def __init__(self, family_name, first_name, birthdate, sex, elo, score=0, uid=None):
+        self.family_name = family_name
+        self.first_name = first_name
+        s = re.search("^([0-9]{1,2})[-/. ]([0-9]{1,2})[-/. ]([0-9]{4})$", birthdate).groups()
+        self._birthdate = datetime.datetime(int(s[2]), int(s[1]), int(s[0]))
+        self._sex = sex[0:1].capitalize()
+        self._elo = int(elo)
+        self.score = score
+        self.played_actors = set()
+        self.uid = uid if uid is not None else uuid.uuid1().hex
+        self.dirty = True
+
+
+def measure(cls, export):
+    """Return the bytes allocated per player to import the given JSON export.
+
+    Parameters
+    ----------
+    cls : class
+        the player class to instantiate
+    export : str
+        the JSON list of the serialized players
+    """
+
+    tracemalloc.start()
+    players = [cls(**x) for x in json.loads(export)]  # the parsed records are freed
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return size / len(players)
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-p", "--players", type=int, default=100000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    export = json.dumps(
+        [
+            {
+                "uid": uuid.uuid4().hex,
+                "family_name": p["familyname"],
+                "first_name": p["firstname"],
+                "birthdate": p["birthdate"],
+                "sex": p["sex"],
+                "elo": p["elo"],
+                "score": 0,
+            }
+            for p in FakePlayer().gen(args.players)
+        ]
+    )
+
+    legacy_size = measure(LegacyPlayer, export)
+    new_size = measure(Player, export)
+
+    print(f"{args.players} players")
+    print(
+        f"legacy {legacy_size:7.1f} bytes/player | "
+        + f"compact {new_size:7.1f} bytes/player | "
+        + f"saved {1 - new_size / legacy_size:5.1%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#! /usr/bin/env python3
+# coding: utf-8
+
+""" The purpose of this module is to benchmark the pairing engines
+
+It plays every round of synthetic tournaments (fake players and results based
+on their ELO) with each pairing engine, and records for each round the pairing
+latency (Tournament.start_round), the peak of allocated memory, the number of
+players left unpaired and the number of rematches.
+The results are written in a JSON file, so the engines (or two versions of
+the same engine) can be compared.
+
+    >>> python3 -m benchmarks.bench_pairing
+    >>> python3 -m benchmarks.bench_pairing -s 8 512 10000 -e dutch -o dutch.json
+"""
+
+import argparse
+import json
+import math
+import platform
+import random
+import time
+import tracemalloc
+
+from model.pairing import PAIRINGS
+from model.world import World
+
+from utils import gen_fake_tournament, get_fake_score_from_elo
+
+
+def default_rounds(num_players):
+    """ Return the usual number of rounds of a swiss tournament with the given number of players. """
+
+    return min(num_players - 1, math.ceil(math.log2(num_players)) + 1)
+
+
+def play_tournament(pairing, num_players, num_rounds, seed, trace=False):
+    """Play every round of a fake tournament and return the measures of each round.
+
+    Parameters
+    ----------
+    pairing : str
+        the name of the pairing engine (see model.pairing)
+    num_players : int
+        the number of fake players
+    num_rounds : int
+        the number of rounds to play
+    seed : int
+        the seed of the random generator (same players and results for every engine)
+    trace : bool(False)
+        measure the peak of allocated memory of each round (slower, so the latency is not measured)
+    """
+
+    random.seed(seed)
+    World.clear()
+    tournament = gen_fake_tournament(World, num_players, num_rounds=num_rounds)
+    tournament.pairing = pairing
+
+    measures = []
+    met = set()
+    for round_index in range(num_rounds):
+        if trace:
+            tracemalloc.start()
+            tournament.start_round()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            duration = None
+        else:
+            start = time.perf_counter()
+            tournament.start_round()
+            duration = time.perf_counter() - start
+            peak = None
+
+        games = tournament.current_round().games
+        rematches = 0
+        for i, ((player1, _), (player2, _)) in enumerate(games):
+            pair = frozenset((player1, player2))
+            if pair in met:
+                rematches += 1
+            met.add(pair)
+
+            elo1 = World.get_actor(player1).elo
+            elo2 = World.get_actor(player2).elo
+            tournament.set_results(i, *get_fake_score_from_elo(elo1, elo2))
+
+        measures.append(
+            {
+                "round": round_index + 1,
+                "latency_ms": duration * 1000 if duration is not None else None,
+                "peak_kib": peak / 1024 if peak is not None else None,
+                "unpaired": num_players - 2 * len(games),
+                "rematches": rematches,
+            }
+        )
+
+    return measures
+
+
+def bench(pairing, num_players, num_rounds, seed, memory=True):
+    """Return the measures of a fake tournament played with the given pairing engine.
+
+    The tournament is played twice when the memory is measured,
+    since tracemalloc slows down the pairing.
+    """
+
+    rounds = play_tournament(pairing, num_players, num_rounds, seed)
+    if memory:
+        traced = play_tournament(pairing, num_players, num_rounds, seed, trace=True)
+        for measure, traced_measure in zip(rounds, traced):
+            measure["peak_kib"] = traced_measure["peak_kib"]
+
+    latencies = [x["latency_ms"] for x in rounds]
+    return {
+        "pairing": pairing,
+        "players": num_players,
+        "num_rounds": num_rounds,
+        "total_ms": sum(latencies),
+        "max_ms": max(latencies),
+        "peak_kib": max(x["peak_kib"] for x in rounds) if memory else None,
+        "unpaired": sum(x["unpaired"] for x in rounds),
+        "rematches": sum(x["rematches"] for x in rounds),
+        "rounds": rounds,
+    }
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-s", "--sizes", type=int, nargs="+", default=[8, 64, 512])
+    parser.add_argument(
+        "-e", "--engines", nargs="+", default=sorted(PAIRINGS), choices=sorted(PAIRINGS)
+    )
+    parser.add_argument("-r", "--rounds", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true")
+    parser.add_argument("-o", "--output", default="bench_pairing.json")
+    args = parser.parse_args()
+
+    results = []
+    for num_players in args.sizes:
+        num_rounds = args.rounds if args.rounds is not None else default_rounds(num_players)
+        for pairing in args.engines:
+            result = bench(pairing, num_players, num_rounds, args.seed, not args.no_memory)
+            results.append(result)
+
+            peak = f"{result['peak_kib']:10.1f} KiB" if result["peak_kib"] is not None else ""
+            print(
+                f"{pairing:10} {num_players:6} players / {num_rounds:2} rounds : "
+                + f"max {result['max_ms']:9.2f} ms | total {result['total_ms']:10.2f} ms | "
+                + f"{result['unpaired']:4} unpaired | {result['rematches']:4} rematches {peak}"
+            )
+
+    with open(args.output, "w") as f:
+        json.dump(
+            {
+                "python": platform.python_version(),
+                "seed": args.seed,
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+    print(f"results written in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
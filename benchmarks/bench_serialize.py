@@ -0,0 +1,99 @@
+#! /usr/bin/env python3
+# coding: utf-8
+
+""" The purpose of this module is to benchmark the tournaments serialization
+
+It compares the single-pass Tournament.serialize with the previous path,
+which encoded / decoded the data with json three times before TinyDB did it once more.
+
+    >>> python3 -m benchmarks.bench_serialize
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from model.world import World
+from model.tournament import EnumEncoder
+
+from utils import gen_fake_tournament
+
+
+def legacy_serialize(tournament):
+    """ Reproduce the previous serialization path (Tournament.serialize + TinyDbIO.save_all). """
+
+    data = {
+        "uid": tournament.uid,
+        "name": tournament.name,
+        "place": tournament.place,
+        "start_date": tournament.start_date,
+        "end_date": tournament.end_date,
+        "num_rounds": tournament.num_rounds,
+        "rounds": [json.loads(json.dumps(x.serialize())) for x in tournament.rounds],
+        "players": tournament.players,
+        "game_type": tournament.game_type,
+        "description": tournament.description,
+        "status": tournament.status,
+        "pairing": tournament.pairing,
+    }
+
+    return json.loads(json.dumps(json.loads(json.dumps(data, cls=EnumEncoder))))
+
+
+def measure(func, tournament, repeat):
+    """Return the mean duration (in seconds) and the peak of allocated memory (in bytes).
+
+    Parameters
+    ----------
+    func : function
+        the serialization function to measure
+    tournament : Tournament
+        the tournament instance to serialize
+    repeat : int
+        the number of calls used to compute the mean duration
+    """
+
+    start = time.perf_counter()
+    for i in range(repeat):
+        func(tournament)
+    duration = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    func(tournament)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return duration, peak
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-p", "--players", type=int, default=400)
+    parser.add_argument("-r", "--rounds", type=int, default=10)
+    parser.add_argument("-n", "--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    World.clear()
+    tournament = gen_fake_tournament(
+        World, args.players, num_rounds=args.rounds, played_rounds=args.rounds
+    )
+
+    if legacy_serialize(tournament) != tournament.serialize():
+        raise SystemExit("The single-pass serializer output differs from the legacy")
+
+    legacy_time, legacy_peak = measure(legacy_serialize, tournament, args.repeat)
+    new_time, new_peak = measure(lambda x: x.serialize(), tournament, args.repeat)
+
+    print(f"{args.players} players / {args.rounds} rounds : identical outputs")
+    for label, duration, peak in (
+        ("legacy", legacy_time, legacy_peak),
+        ("single-pass", new_time, new_peak),
+    ):
+        print(f"{label:12}: {duration * 1000:8.2f} ms | peak {peak / 1024:8.1f} KiB")
+    print(f"{'speedup':12}: {legacy_time / new_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
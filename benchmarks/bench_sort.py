@@ -0,0 +1,120 @@
+#! /usr/bin/env python3
+# coding: utf-8
+
+""" The purpose of this module is to benchmark the sorting of the players
+
+It compares Player.multisort (one sort per field on the stored attributes) with the previous
+path, which sorted the container once per field through the properties, and with a single
+sort on one precomputed tuple key per player (slower in CPython, so not used by multisort).
+
+    >>> python3 -m benchmarks.bench_sort
+"""
+
+import argparse
+import random
+import datetime
+import math
+import time
+from operator import attrgetter, neg
+
+from model.player import Player, SORT_FIELDS
+
+from utils import FakePlayer
+
+
+def legacy_multisort(container, seqsort):
+    """ Reproduce the previous Player.multisort (one sort per field). """
+
+    for key, reverse in reversed(seqsort):
+        container.sort(key=attrgetter(key), reverse=reverse)
+    return container
+
+
+def tuple_key_multisort(container, seqsort):
+    """Sort the container once, with one precomputed tuple key per player.
+
+    The descending numeric fields are negated, and the descending text fields
+    are replaced by their inverted rank among the distinct values.
+    """
+
+    today = datetime.date.today().toordinal()
+
+    columns = []
+    for name, reverse in seqsort:
+        if name == "age":
+            values = [math.floor((today - x._birth_ordinal) / 365.2425) for x in container]
+        else:
+            values = list(map(attrgetter(SORT_FIELDS.get(name, name)), container))
+
+        if reverse and values and isinstance(values[0], str):
+            ranks = {x: -i for i, x in enumerate(sorted(set(values)))}
+            values = list(map(ranks.__getitem__, values))
+        elif reverse:
+            values = list(map(neg, values))
+        columns.append(values)
+
+    keys = list(zip(*columns))
+    order = sorted(range(len(container)), key=keys.__getitem__)
+    container[:] = [container[i] for i in order]
+    return container
+
+
+def measure(func, players, seqsort, repeat):
+    """Return the mean duration (in seconds) and the sorted players.
+
+    Parameters
+    ----------
+    func : function
+        the sort function to measure
+    players : list(Player)
+        the players to sort (copied before each sort)
+    seqsort : tuple
+        the ordering sequence (see Player.get_sort_key)
+    repeat : int
+        the number of sorts used to compute the mean duration
+    """
+
+    duration = 0
+    for i in range(repeat):
+        container = list(players)
+        start = time.perf_counter()
+        func(container, seqsort)
+        duration += time.perf_counter() - start
+
+    return duration / repeat, container
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-p", "--players", type=int, default=50000)
+    parser.add_argument("-n", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(0)
+    players = [
+        Player(p["familyname"], p["firstname"], p["birthdate"], p["sex"], p["elo"])
+        for p in FakePlayer().gen(args.players)
+    ]
+    for player in players:
+        player.score = random.choice([0, 0.5, 1, 1.5, 2, 2.5, 3])
+
+    print(f"{args.players} players")
+    for sortby in ("alpha", "elo", "score", "age", "sex"):
+        seqsort = Player.get_sort_key(sortby)
+        legacy_time, legacy_order = measure(legacy_multisort, players, seqsort, args.repeat)
+        new_time, new_order = measure(Player.multisort, players, seqsort, args.repeat)
+        tuple_time, tuple_order = measure(tuple_key_multisort, players, seqsort, args.repeat)
+
+        if not legacy_order == new_order == tuple_order:
+            raise SystemExit(f"The sort by {sortby} differs from the legacy")
+
+        print(
+            f"{sortby:6}: legacy {legacy_time * 1000:8.2f} ms | "
+            + f"multisort {new_time * 1000:8.2f} ms ({legacy_time / new_time:3.1f}x) | "
+            + f"tuple key {tuple_time * 1000:8.2f} ms ({legacy_time / tuple_time:3.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#! /usr/bin/env python3
+# coding: utf-8
+
+""" The purpose of this module is to benchmark the validation of the form fields
+
+It compares the compiled form tests (Dispatcher.test) with the previous path,
+which evaluated the source of the test expression on each validation.
+
+    >>> python3 -m benchmarks.bench_validation
+"""
+
+import argparse
+import time
+
+from controller.dispatch import Dispatcher
+from controller.validation import Validation
+from model.player import Player
+from model.tournament import Tournament
+
+# a valid input of each field
+VALUES = {
+    "family_name": "Skywalker",
+    "first_name": "Luke",
+    "birthdate": "25/05/1977",
+    "elo": "1800",
+    "sex": "H",
+    "name": "Open",
+    "place": "Paris",
+    "start_date": "01/01/2021",
+    "end_date": "02/01/2021",
+    "num_rounds": "4",
+    "game_type": "Blitz",
+    "pairing": "Dutch",
+}
+
+
+def legacy_validate(test, value):
+    """ Reproduce the previous Controller._form_test check (eval of the expression). """
+
+    return eval(test, {"Validation": Validation}, {"value": value}) is True
+
+
+def compiled_validate(test, value):
+    """ Reproduce the current Controller._form_test check. """
+
+    return Dispatcher.test(test)(value) is True
+
+
+def measure(func, fields, repeat):
+    """Return the number of validations per second.
+
+    Parameters
+    ----------
+    func : function
+        the validation function to measure
+    fields : list(tuple(str, str))
+        the test and input value of each field
+    repeat : int
+        the number of validations of each field
+    """
+
+    start = time.perf_counter()
+    for i in range(repeat):
+        for test, value in fields:
+            if not func(test, value):
+                raise SystemExit(f"{test} failed on {value}")
+    duration = time.perf_counter() - start
+
+    return repeat * len(fields) / duration
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--repeat", type=int, default=10000)
+    args = parser.parse_args()
+
+    fields = [
+        (row["test"], VALUES[row["name"]])
+        for row in Player.get_fields() + Tournament.get_fields()
+        if row.get("test") is not None
+    ]
+
+    legacy = measure(legacy_validate, fields, args.repeat)
+    compiled = measure(compiled_validate, fields, args.repeat)
+
+    print(f"{len(fields)} fields x {args.repeat}")
+    print(
+        f"legacy {legacy:12,.0f} validations/s | "
+        + f"compiled {compiled:12,.0f} validations/s | "
+        + f"speedup {compiled / legacy:5.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
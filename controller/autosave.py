@@ -0,0 +1,249 @@
+#! /usr/bin/env python3
+# coding: utf-8
+
+""" This module handles the background saves of the app data """
+
+import datetime
+import logging
+import queue
+import threading
+import time
+
+from model.world import World
+
+
+class AutoSave:
+    """This class writes the modified data from a worker thread.
+
+    Each recorded mutation of the World (see World.record) schedules a save,
+    and a burst of mutations is coalesced into one save once the World has been
+    quiet for `delay` seconds (or at most `max_delay` seconds after the first one).
+
+    The modified tournaments and players are serialized on the UI thread by tick()
+    (so the World is never read while it changes), then the worker thread writes
+    the snapshot with the storage backend. The journal records are dropped
+    once the snapshot is written.
+
+    Attributes
+    ----------
+    storage : StorageIO
+        the storage backend class used to write the data
+    delay : float
+        the number of quiet seconds waited before saving
+    max_delay : float
+        the maximum number of seconds a save can be postponed by new mutations
+    last_saved : datetime
+        the time of the last successful save (or None)
+    error : str
+        the message of the last failed save (or None)
+
+    Public Methods
+    --------------
+    notify(op=None)
+        Schedule a save (called after each recorded mutation)
+    tick()
+        Take the scheduled snapshot and process the written ones (called from the UI loop)
+    flush(wait=True)
+        Take a snapshot right away (and wait until everything is written)
+    join()
+        Wait until the worker thread wrote all the snapshots (from any thread)
+    queue_depth()
+        Return the number of snapshots not written yet
+    status()
+        Return a short text describing the save status
+    close(discard=False)
+        Write (or drop) the pending snapshots and stop the worker thread
+    """
+
+    def __init__(self, storage, delay=2.0, max_delay=10.0):
+        self.storage = storage
+        self.delay = delay
+        self.max_delay = max_delay
+        self.last_saved = None
+        self.error = None
+
+        self._first = None  # time of the first mutation since the last snapshot
+        self._due = None  # time of the next snapshot
+        self._pending = 0
+        self._seq = 0  # number of snapshots taken
+        self._restored = 0  # number of snapshots taken before the last failed one was restored
+        self._dropped = 0  # number of journal bytes dropped
+        self._jobs = queue.Queue()
+        self._done = queue.Queue()
+        self._failed = None  # last snapshot the worker couldn't write (until it is restored)
+        self._failed_error = None
+
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+        World.listeners.append(self.notify)
+
+    # === PUBLIC METHODS ===
+
+    def notify(self, op=None):
+        """Schedule a save (called after each recorded mutation).
+
+        Parameters
+        ----------
+        op : str
+            The name of the recorded mutation (unused)
+        """
+
+        now = time.monotonic()
+        if self._first is None:
+            self._first = now
+        self._due = min(now + self.delay, self._first + self.max_delay)
+
+    def tick(self):
+        """ Take the scheduled snapshot and process the written ones (called from the UI loop). """
+
+        self._process_done()
+
+        if self._due is not None and time.monotonic() >= self._due:
+            self._snapshot()
+
+    def flush(self, wait=True):
+        """Take a snapshot right away (and wait until everything is written).
+
+        Parameters
+        ----------
+        wait : bool(True)
+            Should we wait for the worker thread to write all the snapshots ?
+        """
+
+        self._snapshot()
+
+        if wait:
+            self.join()
+            self._process_done()
+
+    def join(self):
+        """Wait until the worker thread wrote all the snapshots (from any thread).
+
+        The written snapshots are processed by the next tick() on the UI thread.
+        """
+
+        self._jobs.join()
+
+    def queue_depth(self):
+        """ Return the number of snapshots not written yet. """
+
+        return self._pending
+
+    def status(self):
+        """ Return a short text describing the save status. """
+
+        if self.error is not None:
+            return "Erreur de sauvegarde !"
+        if self._pending > 0 or self._due is not None:
+            return f"Sauvegarde en attente ({self._pending})"
+        if self.last_saved is not None:
+            return f"Sauvegardé à {self.last_saved.strftime('%H:%M:%S')}"
+        return ""
+
+    def close(self, discard=False):
+        """Write (or drop) the pending snapshots and stop the worker thread.
+
+        Parameters
+        ----------
+        discard : bool(False)
+            Drop the snapshots not written yet (the one being written is kept)
+        """
+
+        if not self._thread.is_alive():
+            return
+
+        if self.notify in World.listeners:
+            World.listeners.remove(self.notify)
+
+        if discard:
+            self._first = None
+            self._due = None
+            while True:
+                try:
+                    self._jobs.get_nowait()
+                except queue.Empty:
+                    break
+                self._pending -= 1
+                self._jobs.task_done()
+
+        self._process_done()
+        self._jobs.join()
+        self._jobs.put(None)
+        self._thread.join()
+        self._process_done()
+
+    # === PRIVATE METHODS ===
+
+    def _snapshot(self):
+        """ Serialize the modified data and hand them over to the worker thread. """
+
+        self._first = None
+        self._due = None
+
+        snapshot = self.storage.snapshot_changes()
+        if not snapshot["tournaments"] and not snapshot["actors"]:
+            return
+
+        self._seq += 1
+        snapshot["seq"] = self._seq
+        snapshot["dropped"] = self._dropped
+        snapshot["restored"] = self._restored
+
+        self._pending += 1
+        self._jobs.put(snapshot)
+
+    def _process_done(self):
+        """ Update the save status and the journal with the snapshots written by the worker. """
+
+        while True:
+            try:
+                snapshot, error = self._done.get_nowait()
+            except queue.Empty:
+                return
+
+            self._pending -= 1
+
+            if error is not None:
+                # the journal is kept, so nothing is lost if the app is closed now
+                self.error = error
+                self.storage.restore_snapshot(snapshot)
+                self._restored = self._seq
+                self.notify()
+                continue
+
+            self.last_saved = datetime.datetime.now()
+            self.error = None
+
+            if snapshot["seq"] > self._restored:  # the journal holds no restored changes
+                # the offset was measured before the journal was truncated by the older snapshots
+                offset = snapshot["journal_offset"] - (self._dropped - snapshot["dropped"])
+                self.storage._truncate_journal(offset)
+                self._dropped += offset
+
+    def _run(self):
+        """ Write the snapshots (worker thread). """
+
+        while True:
+            snapshot = self._jobs.get()
+            if snapshot is None:
+                self._jobs.task_done()
+                return
+
+            try:
+                if self._failed is not None and snapshot["restored"] < self._failed:
+                    # the content of the failed snapshot is missing from this one, so it
+                    # would store a journal seq past records that aren't saved yet:
+                    # it is restored as well and taken again with the failed content
+                    raise RuntimeError(self._failed_error)
+
+                self.storage.write_snapshot(snapshot)
+                self._failed = None
+                self._done.put((snapshot, None))
+            except Exception as e:
+                logging.exception("AUTOSAVE: write failed")
+                self._failed = snapshot["seq"]
+                self._failed_error = str(e)
+                self._done.put((snapshot, str(e)))
+            finally:
+                self._jobs.task_done()
@@ -0,0 +1,180 @@
+#! /usr/bin/env python3
+# coding: utf-8
+
+""" This module resolves the menu actions and the form tests of the controller """
+
+import ast
+import builtins
+import inspect
+
+from controller.validation import Validation
+
+
+class Dispatcher:
+    """This class resolves the names of the menu actions and the form test expressions once.
+
+    The actions are bound to the methods of the target (the controller),
+    and the tests are compiled into functions of the input value,
+    so nothing is parsed again when a row is selected or a field is validated.
+
+    Attributes
+    ----------
+    target : object
+        The instance whose methods are called by the actions
+    tests : dict(str, function)
+        The compiled form tests, by expression (shared by all the instances)
+
+    Public Methods
+    --------------
+    action(name)
+        Return the bound method of the target named by the given action
+    check(menus, fields)
+        Resolve every action of the given menus and every test of the given fields
+
+    Static & Class Methods
+    ----------------------
+    test(expression)
+        Return the function of the input value computing the given test expression
+    """
+
+    tests = {}
+
+    def __init__(self, target):
+        self.target = target
+        self._actions = {}
+
+    # === PUBLIC METHODS ===
+
+    def action(self, name):
+        """Return the bound method of the target named by the given action.
+
+        Parameters
+        ----------
+        name : str
+            The name of the method (as found in the menus and listings)
+
+        Raises
+        ------
+        UnknownAction
+            if the target has no such method
+        """
+
+        try:
+            return self._actions[name]
+        except KeyError:
+            pass
+
+        method = getattr(self.target, name, None)
+        if not callable(method):
+            raise UnknownAction(f"Action inconnue : {name}")
+
+        self._actions[name] = method
+        return method
+
+    def check(self, menus, fields):
+        """Resolve every action of the given menus and every test of the given fields.
+
+        Parameters
+        ----------
+        menus : class
+            The class whose static methods return the menus (see view.menu.Menu)
+        fields : list(list(dict))
+            The rows of the forms (see Player.get_fields)
+
+        Raises
+        ------
+        UnknownAction
+            if an action doesn't match any method of the target
+        InvalidTest
+            if a test can't be compiled or uses an unknown name
+        """
+
+        for name, member in vars(menus).items():
+            if not isinstance(member, staticmethod):
+                continue
+
+            menu = getattr(menus, name)
+            if any(
+                x.default is inspect.Parameter.empty
+                for x in inspect.signature(menu).parameters.values()
+            ):
+                continue
+
+            for option in menu():
+                if option[1] is not None:
+                    self.action(option[1])
+
+        for rows in fields:
+            for row in rows:
+                if row.get("test") is not None:
+                    self.test(row["test"])
+
+    # === STATIC & CLASS METHODS ===
+
+    @classmethod
+    def test(cls, expression):
+        """Return the function of the input value computing the given test expression.
+
+        Every name of the expression is resolved first: 'value', the Validation
+        methods and the builtins.
+
+        Parameters
+        ----------
+        expression : str
+            A Python expression of 'value' (such as "Validation.is_valid_date(value)")
+
+        Raises
+        ------
+        InvalidTest
+            if the expression can't be compiled or uses an unknown name
+        """
+
+        try:
+            return cls.tests[expression]
+        except KeyError:
+            pass
+
+        try:
+            tree = ast.parse(expression, mode="eval")
+            code = compile(f"lambda value: ({expression})", f"<test {expression}>", "eval")
+        except SyntaxError as e:
+            raise InvalidTest(f"Test invalide : {expression}") from e
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Name) and node.id not in ("value", "Validation"):
+                if not hasattr(builtins, node.id):
+                    raise InvalidTest(f"Test invalide : {expression} ({node.id} inconnu)")
+            elif (
+                isinstance(node, ast.Attribute)
+                and isinstance(node.value, ast.Name)
+                and node.value.id == "Validation"
+                and not callable(getattr(Validation, node.attr, None))
+            ):
+                raise InvalidTest(
+                    f"Test invalide : {expression} (Validation.{node.attr} inconnu)"
+                )
+
+        cls.tests[expression] = eval(code, {"Validation": Validation})
+        return cls.tests[expression]
+
+
+# === Dispatcher ERRORS ===
+
+
+class UnknownAction(Exception):
+    """Dispatcher Exception relative to the menu actions.
+
+    Should be returned when an action doesn't match any method of the controller.
+    """
+
+    pass
+
+
+class InvalidTest(Exception):
+    """Dispatcher Exception relative to the form tests.
+
+    Should be returned when a test expression of a form field can't be compiled
+    or uses a name that can't be resolved.
+    """
+
+    pass
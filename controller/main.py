@@ -5,18 +5,25 @@
     of this chess tournament manager
 """
 
+import asyncio
+from collections import deque
 import curses
+import functools
+from operator import itemgetter
 import sys
 import atexit
 import logging
 
-from controller.validation import Validation
+from controller.autosave import AutoSave
+from controller.dispatch import Dispatcher
+from controller.pages import PageCache
 
 from view.menu import Menu
 from view.curses import CurseView
 
-from model.tiny import TinyDbIO
+from model.storage import get_backend
 from model.player import Player
+from model.rows import LazyRows
 from model.round import Round
 from model.world import World
 from model.tournament import (
@@ -29,15 +36,17 @@ from model.tournament import (
 
 from utils import FakePlayer
 
+POLL_DELAY = 0.02  # seconds waited before reading the keyboard again when no key was pressed
+NAV_DEPTH = 50  # number of pages kept in the navigation history
+PAGE_CACHE_SIZE = 16  # number of rendered pages kept for the back navigation
+
+nav_history = deque(maxlen=NAV_DEPTH)
 
-def saveNav(f):
-    """ Decorator used to track the navigation history. """
 
-    global nav_history
-    nav_history = []
+def saveNav(f):
+    """ Decorator used to track the navigation history (the oldest pages are dropped). """
 
     def wrapper(*args, **kwargs):
-        global nav_history
         nav_history.append([f, args, kwargs])
         return f(*args, **kwargs)
 
@@ -48,14 +57,39 @@ def resetNav(f):
     """ Decorator used to clear the navigation history. """
 
     def wrapper(*args, **kwargs):
-        global nav_history
-        nav_history = []
+        nav_history.clear()
         nav_history.append([f, args, kwargs])
         return f(*args, **kwargs)
 
     return wrapper
 
 
+def cachePage(f):
+    """ Decorator used to repaint a page from the page cache when its data didn't change. """
+
+    @functools.wraps(f)  # so logNav logs the name of the page
+    def wrapper(self, *args, **kwargs):
+        key = self.pages.key(f, args, kwargs, World)
+        calls = self.pages.get(key)
+
+        if calls is not None:
+            for name, call_args, call_kwargs in calls:
+                getattr(self, name)(*call_args, **call_kwargs)
+            return
+
+        outer, self._recording = self._recording, []
+        try:
+            f(self, *args, **kwargs)
+        finally:
+            calls, self._recording = self._recording, outer
+
+        self.pages.put(key, calls)
+        if outer is not None:  # the page is part of a page being recorded
+            outer.extend(calls)
+
+    return wrapper
+
+
 def logNav(f):
     """ Decorator used to log the naviation calls & parameters  """
 
@@ -81,6 +115,14 @@ class Controller:
     ----------
     curses_view : CurseView
         one instance of the CurseView Class, so we can draw stuffs coming from controlers
+    storage : StorageIO
+        the storage backend class used to save & load the data (TinyDbIO or SqliteIO)
+    autosave : AutoSave
+        the service saving the modified data from a worker thread
+    dispatcher : Dispatcher
+        the menu actions and form tests, resolved once (checked at startup)
+    pages : PageCache
+        the last rendered pages (repainted by the back navigation while their data didn't change)
 
 
     Public Methods
@@ -143,7 +185,7 @@ class Controller:
         Open the page displaying the games (matchs) of the selected tournament (or current one)
 
     open_save()
-        Save the content of the app and display a message
+        Save the content of the app (from the autosave worker thread)
     open_load()
         Load the content of the app and display a message
     open_load_save()
@@ -152,7 +194,7 @@ class Controller:
     open_quit_menu()
         Open the menu offering to quit with or without saving data
     quit()
-        Display an exit message and close the application
+        Drop the changes not saved yet, display an exit message and close the application
     save_n_quit()
         Save the data and display a message, then call quit()
 
@@ -164,12 +206,21 @@ class Controller:
     Private Methods
     ---------------
 
+    _main()
+        Read the keystrokes without blocking, so the timers and the tasks run between them
+    _handle_key(key)
+        Control the app with the given keystroke
+    _spawn(coro)
+        Run the given coroutine as a task of the app loop
+    _show_error(text, delay=None)
+        Display the given message in the error window, and clear it once the delay is over
+
     _generate_fake_players()
         Demo method used to quickly generate fake players (bind to CTRL+F12)
-    _align_to_larger(options)
-        Align the size of the provided list to the size of the larger item (filling with space)
     _move_selection(key)
         Control the mouvement of the selection when displaying a menu or a  list of selectable items
+    _scroll_lines(sdata, key)
+        Control the scrolling of a list of text lines
 
     _set_focus(focus)
         Control the CurseView focus
@@ -210,11 +261,38 @@ class Controller:
 
     """
 
-    def __init__(self):
+    def __init__(self, storage="tinydb", nav_depth=NAV_DEPTH, page_cache=PAGE_CACHE_SIZE):
         logging.info("< Open Controller")
 
+        global nav_history
+        nav_history = deque(nav_history, maxlen=nav_depth)
+        self.pages = PageCache(page_cache)
+        self._recording = None  # view calls of the page being drawn (see cachePage)
+
+        # every menu action and form test must resolve before the app starts
+        self.dispatcher = Dispatcher(self)
+        self.dispatcher.check(
+            Menu,
+            [Player.get_fields(), Tournament.get_fields(), Tournament.get_fields_final_note()],
+        )
+
         self.curses_view = CurseView()
+        self.storage = get_backend(storage)
         self._list_data = {}
+        self._busy = 0  # number of running tasks (the keystrokes wait until they are done)
+        self._failure = None  # exception raised by a task (raised again by the main loop)
+        self._error_timer = None  # expiry of the displayed message
+
+        records = self.storage.load_journal()
+        if len(records) > 0:  # the last session was interrupted before saving
+            logging.info(f"Replay {len(records)} journal records")
+            World.load(*self.storage.load_all(), records)
+        self.storage.open_journal()
+
+        self.autosave = AutoSave(self.storage)
+        World.journal.compact = self.autosave.notify  # the autosave keeps the journal short
+        if len(records) > 0:
+            self.autosave.notify()
 
         atexit.register(self.close)
 
@@ -222,34 +300,21 @@ class Controller:
 
     @logNav
     def start(self):
-        """ Start the 'infinite' loop than runs the app. """
+        """ Start the 'infinite' loop than runs the app (on an asyncio event loop). """
 
-        while 1:
-            key = self.curses_view.screen.getch()
-            logging.debug(f"LOOP : key = {key}")
-
-            if key == 147 or key == 64 or key == 163:  # 2 above TAB or @ or £ (Pounds)
-                self.curses_view.swap_focus()
-            elif key == curses.KEY_RESIZE:
-                logging.warning("RESIZE")  # TODO ?
-            elif key == 43:  # +
-                t = World.get_active_tournament()
-                if t is not None and t.status == Status.INITIALIZED:
-                    self._generate_fake_players()
-            elif key == 263:  # BACKSPACE
-                self.go_back()
-
-            self._move_selection(key)
+        asyncio.run(self._main())
 
     def close(self):
         """ Clean-up at exit. """
 
         logging.info("> Close Controller")
+        self.autosave.close()
+        self.storage.close_journal()
         self.curses_view.close()
 
     @logNav
     def start_new_round(self, tournament=None):
-        """Start a new round in the active tournament.
+        """Start a new round in the active tournament (the pairing runs in a worker thread).
 
         Parameters
         ----------
@@ -261,21 +326,7 @@ class Controller:
         if tournament is None:
             tournament = World.get_active_tournament()
 
-        try:
-            tournament.start_round()
-            self.open_tournament_opened(tournament)
-
-        except WrongPlayersNumber as e:
-            self.curses_view.display_error(str(e))
-            curses.napms(3000)
-            self.curses_view.display_error("")
-        except IsNotReady as e:
-            logging.critical(
-                "Calling start_new_round on an uninitialized or closed tournament"
-            )
-            raise e
-        except IsComplete:
-            self.open_tournament_finalize(tournament)
+        self._spawn(self._start_round(tournament))
 
     # === PUBLIC NAVIGATION METHODS ===
 
@@ -340,6 +391,7 @@ class Controller:
 
     @saveNav
     @logNav
+    @cachePage
     def open_select_tournament_load(self):
         """ Open the page that offers to select an existing tournament then load it. """
 
@@ -395,7 +447,7 @@ class Controller:
         if tournament is None:
             tournament = World.get_active_tournament()
 
-        tournament.status = Status.INITIALIZED
+        tournament.set_status(Status.INITIALIZED)
 
         self._set_focus("menu")
         self._set_head_view(
@@ -480,7 +532,7 @@ class Controller:
         if tournament is None:
             tournament = World.get_active_tournament()
 
-        tournament.status = Status.PLAYING
+        tournament.set_status(Status.PLAYING)
 
         self._set_focus("menu")
         self._set_head_view(
@@ -505,7 +557,7 @@ class Controller:
         if tournament is None:
             tournament = World.get_active_tournament()
 
-        tournament.status = Status.CLOSING
+        tournament.set_status(Status.CLOSING)
 
         self._set_focus("menu")
         self._set_head_view(
@@ -529,7 +581,7 @@ class Controller:
         if tournament is None:
             tournament = World.get_active_tournament()
 
-        tournament.status = Status.CLOSED
+        tournament.set_status(Status.CLOSED)
 
         self._set_focus("menu")
         self._set_head_view("print-line", text=f"Tournoi <{tournament.name}> clos")
@@ -583,6 +635,7 @@ class Controller:
 
     @saveNav
     @logNav
+    @cachePage
     def open_select_actor(self, sortby=None):
         """Open the page used to select an actor (for editing it).
 
@@ -622,6 +675,7 @@ class Controller:
 
     @saveNav
     @logNav
+    @cachePage
     def open_reports(self, source):
         """Open the base menu used to acces the various reports from the root menu.
 
@@ -641,6 +695,7 @@ class Controller:
 
     @saveNav
     @logNav
+    @cachePage
     def open_report_all_actors(self, sortby=None):
         """Open the page displaying all the actors of all the tournaments.
 
@@ -662,6 +717,7 @@ class Controller:
 
     @saveNav
     @logNav
+    @cachePage
     def open_report_all_tournament(self):
         """ Open the page displaying all the existing tournaments. """
 
@@ -670,7 +726,7 @@ class Controller:
         self._set_menu_view("list", call=Menu.only_back)
         self._set_main_view(
             "list",
-            call=Tournament.select_tournament_load,
+            call=Tournament.list_tournaments,
             call_params={"world": World},
             active_links=False,
             autostart=False,
@@ -678,6 +734,7 @@ class Controller:
 
     @saveNav
     @logNav
+    @cachePage
     def open_select_tournament_report(self, route):
         """Open the page that offers to select an existing
             tournament then dislay the corresponding report.
@@ -699,6 +756,7 @@ class Controller:
 
     @saveNav
     @logNav
+    @cachePage
     def open_report_tournament_actors(self, tournament=None, sortby=None):
         """Open the page displaying the actors of
             the selected tournament (or current one).
@@ -730,6 +788,7 @@ class Controller:
 
     @saveNav
     @logNav
+    @cachePage
     def open_report_tournament_rounds(self, tournament=None):
         """Open the page displaying the rounds of
             the selected tournament (or current one).
@@ -759,6 +818,7 @@ class Controller:
 
     @saveNav
     @logNav
+    @cachePage
     def open_report_tournament_matchs(self, tournament=None):
         """Open the page displaying the games (matchs) of
             the selected tournament (or current one).
@@ -790,16 +850,13 @@ class Controller:
 
     @logNav
     def open_save(self):
-        """ Save the content of the app and display a message. """
+        """ Save the content of the app (from the autosave worker thread). """
 
         self._set_focus("menu")
 
-        self.curses_view.display_error("Sauvegarde ...")
-        TinyDbIO.save_all()
-
-        curses.napms(500)
+        self.autosave.flush(wait=False)
+        self.curses_view.display_status(self.autosave.status())
 
-        self.curses_view.display_error("")
         self.go_back()
 
     @logNav
@@ -808,17 +865,12 @@ class Controller:
 
         self._set_focus("menu")
 
-        self.curses_view.display_error("Chargement ...")
-        World.load(*TinyDbIO.load_all())
-
-        curses.napms(500)
-
-        self.curses_view.display_error("")
-        # self.go_back()
-        self.open_select_tournament_load()
+        self._show_error("Chargement ...")
+        self._spawn(self._load())
 
     @saveNav
     @logNav
+    @cachePage
     def open_load_save(self):
         """ Open the menu offering to load or save data. """
 
@@ -834,22 +886,18 @@ class Controller:
 
     @logNav
     def quit(self):
-        """ Display an exit message and close the application. """
+        """Drop the changes not saved yet, display an exit message and close the application.
 
-        self._set_full_view("print-line", text="Closing...")
-        curses.napms(500)
-        self._set_full_view("print-line", text="Bye!")
-        curses.napms(500)
-        sys.exit(0)
+        The changes already saved by the autosave are kept.
+        """
+
+        self._spawn(self._quit())
 
     @logNav
     def save_n_quit(self):
         """ Save the data and display a message, then call quit()."""
 
-        self._set_full_view("print-line", text="Sauvegarde...")
-        TinyDbIO.save_all()
-        curses.napms(500)
-        self.quit()
+        self._spawn(self._save_n_quit())
 
     # --- Back menu ---
 
@@ -872,6 +920,198 @@ class Controller:
             target = nav_history[-1]
             target[0](*target[1], **target[2])
 
+    # === EVENT LOOP methods ===
+
+    async def _main(self):
+        """ Read the keystrokes without blocking, so the timers and the tasks run between them. """
+
+        self.curses_view.screen.nodelay(True)
+
+        while 1:
+            if self._failure is not None:
+                raise self._failure
+
+            if self._busy > 0:  # the keystrokes wait in the terminal until the tasks are done
+                await asyncio.sleep(POLL_DELAY)
+                continue
+
+            self.autosave.tick()
+            self.curses_view.display_status(self.autosave.status())
+
+            key = self.curses_view.screen.getch()
+            if key == -1:  # no keystroke
+                await asyncio.sleep(POLL_DELAY)
+                continue
+
+            self._handle_key(key)
+
+    def _handle_key(self, key):
+        """Control the app with the given keystroke.
+
+        Parameters
+        ----------
+        key : int
+            The key code returned by getch
+        """
+
+        logging.debug(f"LOOP : key = {key}")
+
+        if key == 147 or key == 64 or key == 163:  # 2 above TAB or @ or £ (Pounds)
+            self.curses_view.swap_focus()
+        elif key == curses.KEY_RESIZE:
+            logging.warning("RESIZE")  # TODO ?
+        elif key == 43:  # +
+            t = World.get_active_tournament()
+            if t is not None and t.status == Status.INITIALIZED:
+                self._generate_fake_players()
+        elif key == 263:  # BACKSPACE
+            self.go_back()
+
+        self._move_selection(key)
+
+    def _spawn(self, coro):
+        """Run the given coroutine as a task of the app loop.
+
+        The keystrokes wait until the task is done, so the World isn't changed
+        by the user while a worker thread uses it.
+
+        Parameters
+        ----------
+        coro : coroutine
+            The job to run (such as self._load())
+        """
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:  # outside of the app loop (before start)
+            asyncio.run(coro)
+            return
+
+        self._busy += 1
+        loop.create_task(coro).add_done_callback(self._task_done)
+
+    def _task_done(self, task):
+        """ Release the keystrokes and keep the exception of the given task (raised by the main loop). """
+
+        self._busy -= 1
+        if not task.cancelled() and task.exception() is not None:
+            self._failure = task.exception()
+
+    def _show_error(self, text, delay=None):
+        """Display the given message in the error window, and clear it once the delay is over.
+
+        Parameters
+        ----------
+        text : str
+            The text to display
+        delay : float
+            The number of seconds before the message is cleared (never cleared if None)
+        """
+
+        if self._error_timer is not None:
+            self._error_timer.cancel()
+            self._error_timer = None
+
+        self.curses_view.display_error("")
+        self.curses_view.display_error(text)
+        if delay is None:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:  # outside of the app loop (before start)
+            curses.napms(int(delay * 1000))
+            self.curses_view.display_error("")
+            return
+
+        self._error_timer = loop.call_later(delay, self._show_error, "")
+
+    async def _start_round(self, tournament):
+        """ Pair the players of the new round in a worker thread, then open the tournament page. """
+
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, tournament.start_round)
+            self.open_tournament_opened(tournament)
+
+        except WrongPlayersNumber as e:
+            self._show_error(str(e), 3)
+        except IsNotReady as e:
+            logging.critical(
+                "Calling start_new_round on an uninitialized or closed tournament"
+            )
+            raise e
+        except IsComplete:
+            self.open_tournament_finalize(tournament)
+
+    async def _load(self):
+        """ Read the storage in a worker thread, then load the data in the World. """
+
+        loop = asyncio.get_running_loop()
+
+        self.autosave.flush(wait=False)
+        await loop.run_in_executor(None, self.autosave.join)
+        self.autosave.tick()
+
+        tournaments, players = await loop.run_in_executor(None, self.storage.load_all)
+        records = await loop.run_in_executor(None, self.storage.load_journal)
+        World.load(tournaments, players, records)
+
+        self._show_error("Chargement ...", 0.5)
+        # self.go_back()
+        self.open_select_tournament_load()
+
+    async def _quit(self, discard=True):
+        """Stop the autosave in a worker thread, then display the exit messages.
+
+        Parameters
+        ----------
+        discard : bool(True)
+            Drop the changes not saved yet (the ones saved in the background are kept),
+            otherwise the journal is kept if the last snapshots can't be written
+        """
+
+        self._set_full_view("print-line", text="Closing...")
+        await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(self.autosave.close, discard=discard)
+        )
+        # the journal is only dropped once the last snapshots are written (or discarded)
+        failed = not discard and self.autosave.error is not None
+        self.storage.close_journal(discard=not failed)
+        if failed:
+            self._set_full_view(
+                "print-line",
+                text=f"Erreur : {self.autosave.error} (les changements seront rejoués "
+                + "au prochain lancement)",
+            )
+            await asyncio.sleep(3)
+        elif discard and self.autosave.last_saved is not None:
+            saved = self.autosave.last_saved.strftime("%H:%M:%S")
+            self._set_full_view(
+                "print-line", text=f"Les données sauvées à {saved} sont conservées"
+            )
+            await asyncio.sleep(1.5)
+        else:
+            await asyncio.sleep(0.5)
+        self._set_full_view("print-line", text="Bye!")
+        await asyncio.sleep(0.5)
+        sys.exit(0)
+
+    async def _save_n_quit(self):
+        """ Save the data from the autosave worker thread, then quit (or display the error). """
+
+        self._set_full_view("print-line", text="Sauvegarde...")
+        self.autosave.flush(wait=False)
+        await asyncio.get_running_loop().run_in_executor(None, self.autosave.join)
+        self.autosave.tick()
+
+        if self.autosave.error is not None:
+            self._set_full_view("print-line", text=f"Erreur : {self.autosave.error}")
+            await asyncio.sleep(3)
+            self.open_menu_base()
+            return
+
+        await self._quit(discard=False)
+
     # === DEMO methods ===
 
     @logNav
@@ -902,23 +1142,13 @@ class Controller:
 
     # === PRIVATE METHODS ===
 
-    def _align_to_larger(self, options):
-        """Align the size of the provided list to the size
-            of the larger item (filling with space).
-
-        Parameters
-        ----------
-        options : list
-            The list to adjust to its larger element
-        """
-
-        max_size = max([len(option) for option in options])
-        return [option.ljust(max_size) for option in options]
-
     def _move_selection(self, key):
         """Control the mouvement of the selection when
             displaying a menu or a  list of selectable items.
 
+        [UP] / [DOWN] move the selection by one row, [PAGE UP] / [PAGE DOWN] by one page,
+        [HOME] / [END] to the first / last row.
+
         Parameters
         ----------
         key : int
@@ -934,13 +1164,15 @@ class Controller:
             if screen is not self.curses_view.focus:
                 continue
 
+            if "lines" in sdata:
+                self._scroll_lines(sdata, key)
+                continue
+
             current_row = sdata["current_row"]
             buttons = sdata["buttons"]
+            page = self.curses_view.page_size(screen)
             # colors = sdata["colors"]
 
-            # clear existing texts
-            self.curses_view.menu.clear()
-
             if key == curses.KEY_UP:
                 logging.debug("KEY UP")
                 if current_row > 0:
@@ -953,28 +1185,37 @@ class Controller:
                     current_row += 1
                 else:
                     current_row = 0
+            elif key == curses.KEY_PPAGE:
+                current_row = max(0, current_row - page)
+            elif key == curses.KEY_NPAGE:
+                current_row = min(len(buttons) - 1, current_row + page)
+            elif key == curses.KEY_HOME:
+                current_row = 0
+            elif key == curses.KEY_END:
+                current_row = len(buttons) - 1
             elif key == curses.KEY_ENTER or key in [10, 13]:
                 logging.debug("KEY ENTER")
-                actions = sdata["actions"]
-                params = sdata["params"]
                 active_links = sdata["active_links"]
 
-                if active_links is False:
+                if active_links is False or current_row < 0:
                     return
 
-                if actions[current_row] is None:
+                option = sdata["options"][current_row]  # only the selected row is rendered
+                action = option[1]
+                param = option[2] if len(option) > 2 else None
+
+                if action is None:
                     return
-                    # labels = sdata["labels"]
                     # self._set_main_view(
                     #     "print-line",
-                    #     text=f"You selected '{labels[current_row]}'",
+                    #     text=f"You selected '{option[0]}'",
                     #     colors=colors,
                     # )
                 else:
-                    if params[current_row] is None:
-                        eval(f"self.{actions[current_row]}")()
+                    if param is None:
+                        self.dispatcher.action(action)()
                     else:
-                        eval(f"self.{actions[current_row]}")(params[current_row])
+                        self.dispatcher.action(action)(param)
                     return
 
             self._list_data[screen]["current_row"] = current_row
@@ -982,6 +1223,40 @@ class Controller:
 
             self.curses_view.display_select(screen, buttons, current_row)
 
+    def _scroll_lines(self, sdata, key):
+        """Control the scrolling of a list of text lines.
+
+        Parameters
+        ----------
+        sdata : dict
+            The displayed lines and their scroll offset
+        key : int
+            A key number
+        """
+
+        screen = sdata["screen"]
+        page = self.curses_view.page_size(screen)
+        last_top = max(0, len(sdata["lines"]) - page)
+        top = sdata["top"]
+
+        if key == curses.KEY_UP:
+            top -= 1
+        elif key == curses.KEY_DOWN:
+            top += 1
+        elif key == curses.KEY_PPAGE:
+            top -= page
+        elif key == curses.KEY_NPAGE:
+            top += page
+        elif key == curses.KEY_HOME:
+            top = 0
+        elif key == curses.KEY_END:
+            top = last_top
+
+        top = max(0, min(top, last_top))
+        if top != sdata["top"]:
+            sdata["top"] = top
+            self.curses_view.display_list(screen, sdata["lines"], sdata["colors"], top)
+
     # === View controls ===
 
     def _set_focus(self, focus):
@@ -993,6 +1268,9 @@ class Controller:
             A shortname to indicate where to place the focus
         """
 
+        if self._recording is not None:
+            self._recording.append(("_set_focus", (focus,), {}))
+
         if focus == "main":
             self.curses_view.focus = self.curses_view.main
         elif focus == "full":
@@ -1077,6 +1355,10 @@ class Controller:
             Used to pass various parameters depending upon the action
         """
 
+        if self._recording is not None:
+            # the page is repainted with the same calls (and the listings built now)
+            self._recording.append(("_set_view", (view, action), kwargs))
+
         if view == "menu":
             screen = self.curses_view.menu
         elif view == "main":
@@ -1091,6 +1373,9 @@ class Controller:
         else:
             colors = [1, 2]
 
+        # the previous list of the view can't be scrolled anymore
+        self._list_data.pop(screen, None)
+
         # --- Clear the view ---
         if action == "clear":
             self.curses_view.display_text(screen, "")
@@ -1113,17 +1398,18 @@ class Controller:
             else:
                 active_links = False
 
-            labels = [x[0] for x in options]
-            actions = [x[1] for x in options]
-            params = [x[2] if len(x) > 2 else None for x in options]
-            buttons = self._align_to_larger(labels)
+            # the rows are only rendered when they are displayed or selected
+            if not isinstance(options, LazyRows):
+                options = LazyRows(options, lambda x: x)
+            buttons = options.map(itemgetter(0))
+
+            if self._recording is not None:
+                kwargs.update(call=lambda: options, call_params=None)
 
             self._list_data[screen] = {
                 "screen": screen,
                 "current_row": current_row,
-                "labels": labels,
-                "actions": actions,
-                "params": params,
+                "options": options,
                 "buttons": buttons,
                 "colors": colors,
                 "active_links": active_links,
@@ -1137,7 +1423,16 @@ class Controller:
 
         # --- Print several text lines into the view ---
         elif action == "print-lines":
-            self.curses_view.display_list(screen, kwargs.get("rows", ["Error"]), colors)
+            lines = list(kwargs.get("rows", ["Error"]))
+            if self._recording is not None:
+                kwargs["rows"] = lines
+            self._list_data[screen] = {
+                "screen": screen,
+                "lines": lines,
+                "top": 0,
+                "colors": colors,
+            }
+            self.curses_view.display_list(screen, lines, colors)
 
         # --- Print several inputs as a form ---
         elif action == "form":
@@ -1284,7 +1579,7 @@ class Controller:
     def _form_test(self, value, test, errormsg, error_win):
         """ Control the form tests. """
 
-        if test is None or eval(test) is True:
+        if test is None or Dispatcher.test(test)(value) is True:
             error_win.clear()
             error_win.refresh()
             return True
@@ -1325,6 +1620,7 @@ class Controller:
             inputs["game_type"],
             inputs["description"],
             inputs["num_rounds"],
+            pairing=inputs["pairing"].strip().lower(),
         )
 
         World.add_tournament(tournament)
@@ -1349,6 +1645,8 @@ class Controller:
         source.game_type = inputs["game_type"]
         source.description = inputs["description"]
         source.num_rounds = int(inputs["num_rounds"])
+        source.pairing = inputs["pairing"].strip().lower()
+        World.record("tournament", data=source.serialize(rounds=False))
 
         # self.go_back()
         self.open_tournament_initialize()
@@ -1392,6 +1690,7 @@ class Controller:
         source.birthdate = inputs["birthdate"]
         source.sex = inputs["sex"]
         source.elo = inputs["elo"]
+        World.record("actor", t=None, data=source.serialize())
 
         self.go_back()
 
@@ -1409,6 +1708,7 @@ class Controller:
         source.description = inputs["description"]
 
         self.open_tournament_closed()
+        World.record("tournament", data=source.serialize(rounds=False))
 
     def _form_exit_input_scores(self, inputs, source):
         """Process the round score inputs and transmit to the model.
@@ -1436,9 +1736,3 @@ class UnstackAll(Exception):
     """
 
     pass
-
-
-""" I initialize this variable to get ride of flake8 error...
-Validation is used by my eval expessions and thus it's not directly visible.
-On a real project I wouldn't add this variable """
-v = Validation()
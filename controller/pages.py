@@ -0,0 +1,130 @@
+#! /usr/bin/env python3
+# coding: utf-8
+
+""" This module keeps the last rendered pages of the controller """
+
+from collections import OrderedDict
+
+
+class PageCache:
+    """This class keeps the last rendered pages, so they are repainted without being built again.
+
+    A page is stored as the list of the view calls that drew it (with the listings
+    already sorted), under a key made of its route, its parameters and the version
+    of the World data. Any recorded change of the World makes the stored pages stale.
+    The least recently used pages are dropped once the cache is full.
+
+    Attributes
+    ----------
+    size : int
+        The maximum number of pages kept
+    hits : int
+        The number of pages repainted from the cache
+    misses : int
+        The number of pages built (then stored)
+
+    Public Methods
+    --------------
+    get(key)
+        Return the view calls of the given page (or None)
+    put(key, calls)
+        Store the view calls of the given page
+    clear()
+        Drop all the stored pages
+
+    Static & Class Methods
+    ----------------------
+    key(route, args, kwargs, world)
+        Return the key of the page drawn by the given route and parameters (or None)
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._pages = OrderedDict()
+
+    def __len__(self):
+        return len(self._pages)
+
+    # === PUBLIC METHODS ===
+
+    def get(self, key):
+        """Return the view calls of the given page (or None).
+
+        Parameters
+        ----------
+        key : tuple
+            The key of the page (see PageCache.key)
+        """
+
+        if key is None:
+            return None
+
+        try:
+            calls = self._pages[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        self._pages.move_to_end(key)
+        self.hits += 1
+        return calls
+
+    def put(self, key, calls):
+        """Store the view calls of the given page.
+
+        Parameters
+        ----------
+        key : tuple
+            The key of the page (see PageCache.key)
+        calls : list(tuple(str, tuple, dict))
+            The name and parameters of each view method called to draw the page
+        """
+
+        if key is None or self.size <= 0:
+            return
+
+        self._pages[key] = calls
+        self._pages.move_to_end(key)
+
+        while len(self._pages) > self.size:
+            self._pages.popitem(last=False)
+
+    def clear(self):
+        """ Drop all the stored pages. """
+
+        self._pages.clear()
+
+    # === STATIC & CLASS METHODS ===
+
+    @staticmethod
+    def key(route, args, kwargs, world):
+        """Return the key of the page drawn by the given route and parameters (or None).
+
+        Parameters
+        ----------
+        route : function
+            The controller method drawing the page
+        args : tuple
+            The positional parameters of the method (without the controller)
+        kwargs : dict
+            The keyword parameters of the method
+        world : World
+            The World class (its version and active tournament are part of the key)
+        """
+
+        key = (
+            route,
+            args,
+            tuple(sorted(kwargs.items())),
+            world.version,
+            world.active_tournament,
+        )
+
+        try:
+            hash(key)
+        except TypeError:  # such parameters can't be compared, the page isn't stored
+            return None
+
+        return key
@@ -5,6 +5,8 @@
 
 import re
 
+from model.pairing import PAIRINGS
+
 
 class Validation:
     """This class offers variours methods prepared to validate the input fields.
@@ -17,6 +19,8 @@ class Validation:
         Check if the provided value is a positive integer
     is_valid_gtype(v)
         Check if the provided value is a value game type (blitz/bullet/coup rapide)
+    is_valid_pairing(v)
+        Check if the provided value is the name of a pairing engine (greedy/blossom/dutch/backtrack)
     is_valid_sex(v)
         Check if the provided value either starts with h or f (Homme or Femme)
     is_valid_score_symbol(v)
@@ -56,6 +60,12 @@ class Validation:
             return True
         return False
 
+    @staticmethod
+    def is_valid_pairing(v):
+        """ Check if the provided value is the name of a pairing engine (greedy/blossom/dutch/backtrack). """
+
+        return v.strip().lower() in PAIRINGS
+
     @staticmethod
     def is_valid_sex(v):
         """ Check if the provided value either starts with h or f (Homme or Femme) """
@@ -0,0 +1,160 @@
+#! /usr/bin/env python3
+# coding: utf-8
+
+""" This module handles the append-only journal of the app mutations """
+
+import json
+import logging
+import os
+
+
+class Journal:
+    """This class records one compact line per mutation since the last saved snapshot.
+
+    Each record is flushed to the OS as soon as it is appended (so a crash of the
+    app loses nothing), and an fsync is only requested every `sync_every` records.
+
+    Each record holds a sequence number ('seq') that keeps growing across the
+    truncations, so the records already part of a saved snapshot can be skipped
+    when the journal couldn't be truncated (crash right after a save).
+
+    Attributes
+    ----------
+    path : str
+        The path of the journal file
+    sync_every : int
+        The number of records appended between two fsync calls
+    threshold : int
+        The size (in bytes) past which the journal is compacted
+    compact : function
+        The function called to fold the journal into a fresh snapshot (or None)
+    seq : int
+        The sequence number of the last appended record
+
+    Public Methods
+    --------------
+    append(op, **data)
+        Append a new record to the journal
+    sync()
+        Force the pending records to be written on the disk
+    size()
+        Return the current size of the journal in bytes
+    read()
+        Return the records currently stored in the journal
+    truncate(offset=None)
+        Remove the records (once they are part of a saved snapshot)
+    close()
+        Sync and close the journal file
+    """
+
+    def __init__(
+        self, path, sync_every=16, threshold=1024 * 1024, compact=None, seq=0
+    ):
+        self.path = path
+        self.sync_every = sync_every
+        self.threshold = threshold
+        self.compact = compact
+        self.seq = max([seq] + [x.get("seq", 0) for x in self.read_file(path)])
+
+        self._file = open(path, "a", encoding="utf-8")
+        self._pending = 0
+
+    # === PUBLIC METHODS ===
+
+    def append(self, op, **data):
+        """Append a new record to the journal.
+
+        Parameters
+        ----------
+        op : str
+            The name of the recorded mutation
+        **data : *
+            The JSON compatible values required to replay the mutation
+        """
+
+        self.seq += 1
+        data["op"] = op
+        data["seq"] = self.seq
+        self._file.write(json.dumps(data, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+        self._pending += 1
+        if self._pending >= self.sync_every:
+            self.sync()
+
+        if self.compact is not None and self.size() > self.threshold:
+            logging.info(f"JOURNAL: compaction ({self.size()} bytes)")
+            self.compact()
+
+    def sync(self):
+        """ Force the pending records to be written on the disk. """
+
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def size(self):
+        """ Return the current size of the journal in bytes. """
+
+        return self._file.tell()
+
+    def read(self):
+        """ Return the records currently stored in the journal. """
+
+        return self.read_file(self.path)
+
+    def truncate(self, offset=None):
+        """Remove the records (once they are part of a saved snapshot).
+
+        Parameters
+        ----------
+        offset : int(None)
+            Only remove the records written before this size (see size()),
+            so the records appended since a snapshot was taken are kept.
+        """
+
+        tail = ""
+        if offset is not None and offset < self.size():
+            self._file.flush()
+            with open(self.path, encoding="utf-8") as f:
+                f.seek(offset)
+                tail = f.read()
+
+        self._file.seek(0)
+        self._file.truncate()
+        self._file.write(tail)
+        self.sync()
+
+    def close(self):
+        """ Sync and close the journal file. """
+
+        self.sync()
+        self._file.close()
+
+    # === STATIC & CLASS METHODS ===
+
+    @staticmethod
+    def read_file(path):
+        """Return the records stored in the given journal file.
+
+        A partially written last line (crash during a write) is ignored.
+
+        Parameters
+        ----------
+        path : str
+            The path of the journal file
+        """
+
+        if not os.path.exists(path):
+            return []
+
+        records = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    logging.warning(f"JOURNAL: ignored record {line!r}")
+                    break
+
+        return records
@@ -0,0 +1,890 @@
+#! /usr/bin/env python3
+# coding: utf-8
+
+""" This module handles the pairing engines used to generate the games of the rounds
+
+Every engine receives the score brackets of the participants, as a list of
+(score, players) tuples (best score first, each bracket sorted by rating),
+the index of the round and a has_played(player1, player2) function,
+and returns the pairs of players uid (best boards first).
+"""
+
+import logging
+import time
+
+UNPAIRED_COST = 1000  # cost of each player left unpaired (see search_pairing)
+
+
+def pair_greedy(brackets, round_index, has_played):
+    """Pair each player with the next one he didn't play yet (the original algorithm).
+
+    It may leave some players unpaired when the greedy choices dead-end in late rounds.
+
+    Parameters
+    ----------
+    brackets : list(tuple(float, list(Player)))
+        The participants grouped by score (best first)
+    round_index : int
+        The index of the round to pair
+    has_played : function
+        Return True if the two given players already played together
+    """
+
+    players = _flatten(brackets)
+    if round_index == 0:
+        return pair_halves(players)
+
+    pairs = []
+    drafted = set()
+    for i, player1 in enumerate(players):
+        if player1.uid in drafted:
+            continue
+
+        for player2 in players[i + 1:]:
+            if player2.uid in drafted:
+                continue
+
+            if has_played(player1, player2) is not True:
+                pairs.append((player1.uid, player2.uid))
+                drafted.update((player1.uid, player2.uid))
+                break
+
+    return pairs
+
+
+def pair_blossom(brackets, round_index, has_played, width=16):
+    """Pair the players with a maximum weight matching of their compatibility graph.
+
+    The players who already played together are never paired, and the weight of
+    the other edges favors the players with the closest scores, then the closest
+    ratings. A complete pairing is always returned if one exists.
+
+    To stay fast with big fields, each player is first only linked to the `width`
+    players following him in the standings; the graph is widened (up to the
+    complete graph) while the matching isn't complete.
+
+    Parameters
+    ----------
+    brackets : list(tuple(float, list(Player)))
+        The participants grouped by score (best first)
+    round_index : int
+        The index of the round to pair
+    has_played : function
+        Return True if the two given players already played together
+    width : int(16)
+        The number of following players first linked to each player
+    """
+
+    players = _flatten(brackets)
+    if round_index == 0:
+        return pair_halves(players)
+
+    scores = [score for score, bracket in brackets for player in bracket]
+
+    num_players = len(players)
+    while True:
+        edges = _weighted_edges(players, scores, has_played, width)
+        mate = max_weight_matching(edges, num_players, maxcardinality=True)
+
+        if -1 not in mate or width >= num_players:
+            break
+        width *= 2
+
+    return [(players[i].uid, players[j].uid) for i, j in enumerate(mate) if j > i]
+
+
+def pair_dutch(brackets, round_index, has_played, max_steps=10000):
+    """Pair the players bracket by bracket (FIDE Dutch system, simplified).
+
+    Each score bracket (with the players floating down from the previous one
+    at its top) is split in two halves, and the players of the top half are
+    paired with the players of the bottom half, in rating order, swapping the
+    bottom half players to avoid the rematches. The players who can't be paired
+    in their bracket float down to the next one. If the last bracket can't be
+    paired, it is merged with the previous ones until a complete pairing is found.
+
+    The cost depends on the size of the brackets, not on the size of the field.
+
+    Parameters
+    ----------
+    brackets : list(tuple(float, list(Player)))
+        The participants grouped by score (best first)
+    round_index : int
+        The index of the round to pair
+    has_played : function
+        Return True if the two given players already played together
+    max_steps : int(10000)
+        The number of swaps tried in a bracket before using a weighted matching
+    """
+
+    if round_index == 0:
+        return pair_halves(_flatten(brackets))
+
+    paired = []  # list of (group, pairs) by bracket
+    floaters = []
+    for score, bracket in brackets:
+        group = floaters + bracket
+        pairs, floaters = _pair_bracket(group, has_played, max_steps)
+        paired.append((group, pairs))
+
+    # collapse the last brackets until the leftover players are paired
+    while floaters and len(paired) > 1:
+        group = paired.pop()[0]
+        previous_group = paired.pop()[0]
+        floated = {x.uid for x in group}
+        group = [x for x in previous_group if x.uid not in floated] + group
+        pairs, floaters = _pair_bracket(group, has_played, max_steps)
+        paired.append((group, pairs))
+
+    return [pair for group, pairs in paired for pair in pairs]
+
+
+def pair_backtrack(brackets, round_index, has_played, budget=1.0):
+    """Pair the players with a depth first search bounded by a time budget.
+
+    The players are paired in the standings order, backtracking on the
+    previous choices on dead ends, then the search goes on to reduce the
+    score gaps of the pairs until the budget is spent. The best pairing found
+    is returned, so the latency stays bounded even with big fields.
+
+    Parameters
+    ----------
+    brackets : list(tuple(float, list(Player)))
+        The participants grouped by score (best first)
+    round_index : int
+        The index of the round to pair
+    has_played : function
+        Return True if the two given players already played together
+    budget : float(1.0)
+        The number of seconds the search can last
+
+    Returns
+    -------
+    The pairs of players uid (best boards first), as a Pairs list
+    holding the cost of the pairing (see search_pairing)
+    """
+
+    players = _flatten(brackets)
+    if round_index == 0:
+        return Pairs(pair_halves(players), 0)
+
+    scores = [score for score, bracket in brackets for player in bracket]
+    pairs, cost = search_pairing(players, scores, has_played, budget)
+    logging.debug(f"PAIR_BACKTRACK: {len(pairs)} pairs, cost {cost}")
+
+    return Pairs([(players[i].uid, players[j].uid) for i, j in pairs], cost)
+
+
+def search_pairing(players, scores, has_played, budget=1.0):
+    """Search the pairing with the smallest cost within the given time budget.
+
+    The cost of a pairing is the sum of the squared score gaps of its pairs
+    (in half points), plus UNPAIRED_COST for each player left unpaired,
+    so a complete pairing within the score brackets costs 0.
+
+    The search is iterative (one stack frame per pair), and the sets of remaining
+    players already explored are memoized with the lowest cost they could still be
+    paired for, so they are never searched again when they can't improve the best
+    pairing. When the budget is spent before any complete pairing is found
+    (including while the compatibility of the players is computed), the deepest
+    partial pairing is completed with the remaining compatible players.
+
+    Parameters
+    ----------
+    players : list(Player)
+        The participants sorted by score (best first)
+    scores : list(float)
+        The score of each participant (same order)
+    has_played : function
+        Return True if the two given players already played together
+    budget : float(1.0)
+        The number of seconds the search can last
+
+    Returns
+    -------
+    A tuple with the list of (i, j) pairs of players indexes and the cost of the pairing
+    """
+
+    deadline = time.monotonic() + budget
+    num_players = len(players)
+    gaps = [round(x * 2) for x in scores]
+
+    # compatible[i] is the bitmask of the players i can be paired with
+    compatible = [0] * num_players
+    for i, player1 in enumerate(players):
+        if time.monotonic() > deadline:
+            return _complete_pairing([], players, gaps, has_played)
+
+        for j in range(i + 1, num_players):
+            if has_played(player1, players[j]) is not True:
+                compatible[i] |= 1 << j
+                compatible[j] |= 1 << i
+
+    def is_dead_end(remaining):
+        mask = remaining
+        while mask:
+            low = mask & -mask
+            if compatible[low.bit_length() - 1] & remaining == 0:
+                return True
+            mask ^= low
+        return False
+
+    bounds = {}  # remaining players bitmask -> lowest cost to pair them
+    best_pairs = None
+    best_cost = None
+    deepest = []
+    steps = 0
+
+    # each frame is [remaining, cost, player index, other players, candidates left]
+    stack = []
+    pairs = []
+    node = ((1 << num_players) - 1, 0)  # the next (remaining, cost) to explore
+    while node is not None:
+        remaining, cost = node
+        node = None
+
+        if remaining == 0:
+            best_pairs, best_cost = list(pairs), cost
+        else:
+            if len(pairs) > len(deepest):
+                deepest = list(pairs)
+
+            steps += 1
+            if steps & 15 == 0 and time.monotonic() > deadline:
+                break
+
+            bound = bounds.get(remaining, 0)
+            if bound == float("inf"):  # these players can't be paired together
+                pass
+            elif best_cost is not None and cost + bound >= best_cost:
+                pass
+            elif is_dead_end(remaining):
+                bounds[remaining] = float("inf")
+            else:
+                low = remaining & -remaining
+                i = low.bit_length() - 1
+                rest = remaining ^ low
+                stack.append([remaining, cost, i, rest, compatible[i] & rest])
+
+        # go on with the next candidate of the deepest frame
+        while stack and node is None:
+            frame = stack[-1]
+            if len(pairs) == len(stack):  # back from the previous candidate
+                pairs.pop()
+            if best_cost == 0:
+                stack.clear()
+                break
+
+            remaining, cost, i, rest, candidates = frame
+            if candidates:
+                other = candidates & -candidates
+                j = other.bit_length() - 1
+                gap = (gaps[i] - gaps[j]) ** 2
+                # the next players have bigger score gaps
+                if best_cost is None or cost + gap < best_cost:
+                    frame[4] = candidates ^ other
+                    pairs.append((i, j))
+                    node = (rest ^ other, cost + gap)
+                    continue
+
+            # every way to pair the remaining players was tried
+            stack.pop()
+            if best_cost is None:
+                bounds[remaining] = float("inf")
+            else:
+                bounds[remaining] = max(bounds.get(remaining, 0), best_cost - cost)
+
+    if best_pairs is not None:
+        return best_pairs, best_cost
+
+    return _complete_pairing(deepest, players, gaps, has_played)
+
+
+def pair_halves(players):
+    """Pair the first half of the players with the second half (first round).
+
+    Parameters
+    ----------
+    players : list(Player)
+        The participants sorted by score (best first)
+    """
+
+    half = len(players) // 2
+    return [(p1.uid, p2.uid) for p1, p2 in zip(players[:half], players[half:])]
+
+
+PAIRINGS = {
+    "greedy": pair_greedy,
+    "blossom": pair_blossom,
+    "dutch": pair_dutch,
+    "backtrack": pair_backtrack,
+}
+
+
+def get_pairing(name):
+    """Return the pairing engine matching the given name.
+
+    Parameters
+    ----------
+    name : str
+        One of the PAIRINGS keys
+    """
+
+    try:
+        return PAIRINGS[name]
+    except KeyError:
+        raise ValueError(f"Unknown pairing engine '{name}'")
+
+
+class Pairs(list):
+    """The pairs returned by a pairing engine, with the cost of the pairing (see search_pairing).
+
+    Attributes
+    ----------
+    cost : int
+        The sum of the squared score gaps of the pairs (in half points),
+        plus UNPAIRED_COST for each player left unpaired
+    """
+
+    def __init__(self, pairs, cost):
+        super().__init__(pairs)
+        self.cost = cost
+
+
+def _flatten(brackets):
+    """ Return the players of the given brackets as one list (best first). """
+
+    return [player for score, bracket in brackets for player in bracket]
+
+
+def _complete_pairing(pairs, players, gaps, has_played):
+    """Complete the given partial pairing with the remaining compatible players (best effort).
+
+    Returns the pairs of players indexes and the cost of the pairing (see search_pairing).
+    """
+
+    pairs = list(pairs)
+    drafted = {x for pair in pairs for x in pair}
+    for i, player1 in enumerate(players):
+        if i in drafted:
+            continue
+        for j in range(i + 1, len(players)):
+            if j not in drafted and has_played(player1, players[j]) is not True:
+                pairs.append((i, j))
+                drafted.update((i, j))
+                break
+
+    cost = sum((gaps[i] - gaps[j]) ** 2 for i, j in pairs)
+    cost += (len(players) - len(drafted)) * UNPAIRED_COST
+    return pairs, cost
+
+
+def _weighted_edges(players, scores, has_played, width):
+    """Return the (i, j, weight) edges linking each player to the `width` next ones.
+
+    The weight decreases with the score difference first (squared, so two small
+    differences are prefered to a big one), then with the rating difference.
+    """
+
+    candidates = []
+    for i, player1 in enumerate(players):
+        for j in range(i + 1, min(i + 1 + width, len(players))):
+            player2 = players[j]
+            if has_played(player1, player2) is not True:
+                candidates.append((i, j))
+
+    if len(candidates) == 0:
+        return []
+
+    def gaps(i, j):
+        score_gap = round(abs(scores[i] - scores[j]) * 2)
+        elo_gap = abs(players[i].elo - players[j].elo)
+        return score_gap, elo_gap
+
+    max_elo_gap = max(gaps(i, j)[1] for i, j in candidates)
+    score_unit = (max_elo_gap + 1) * (len(players) // 2 + 1)  # above any sum of elo gaps
+
+    penalties = []
+    for i, j in candidates:
+        score_gap, elo_gap = gaps(i, j)
+        penalties.append(score_gap * score_gap * score_unit + elo_gap)
+
+    top = max(penalties) + 1
+    return [(i, j, top - penalty) for (i, j), penalty in zip(candidates, penalties)]
+
+
+def _pair_bracket(group, has_played, max_steps):
+    """Pair the top half of the group with its bottom half (see pair_dutch).
+
+    Returns the pairs and the players left unpaired (floating down).
+    When no swap of the bottom half avoids the rematches within max_steps,
+    the group is paired with a maximum cardinality matching instead.
+    """
+
+    half = len(group) // 2
+    top, bottom = group[:half], group[half:]
+
+    matched = _match_halves(top, bottom, has_played, max_steps)
+    if matched is not None:
+        pairs = [(p1.uid, p2.uid) for p1, p2 in zip(top, matched)]
+        drafted = {x.uid for x in matched}
+        return pairs, [x for x in bottom if x.uid not in drafted]
+
+    pairs = pair_blossom([(0, group)], 1, has_played, width=len(group))
+    drafted = {uid for pair in pairs for uid in pair}
+    return pairs, [x for x in group if x.uid not in drafted]
+
+
+def _match_halves(top, bottom, has_played, max_steps):
+    """Return the bottom players matched with each top player (in order), or None.
+
+    The bottom players are tried in rating order for each top player,
+    backtracking on the previous choices when a top player can't be matched.
+    """
+
+    matched = []
+    used = [False] * len(bottom)
+    choices = [0]  # the next bottom index to try for each matched top player
+    steps = 0
+
+    while len(matched) < len(top):
+        steps += 1
+        if steps > max_steps:
+            return None
+
+        i = len(matched)
+        start = choices[i]
+        for j in range(start, len(bottom)):
+            if not used[j] and has_played(top[i], bottom[j]) is not True:
+                used[j] = True
+                matched.append(j)
+                choices[i] = j + 1
+                choices.append(0)
+                break
+        else:  # backtrack
+            if i == 0:
+                return None
+            choices.pop()
+            used[matched.pop()] = False
+
+    return [bottom[j] for j in matched]
+
+
+def max_weight_matching(edges, num_vertices, maxcardinality=False):
+    """Compute a maximum weight matching of a general graph (Edmonds' blossom algorithm).
+
+    This is the O(n³) primal-dual implementation described by Z. Galil,
+    "Efficient algorithms for finding maximum matching in graphs" (1986),
+    using integer computations only when the weights are integers.
+
+    Parameters
+    ----------
+    edges : list(tuple(int, int, int))
+        The (i, j, weight) edges of the graph, with i != j
+    num_vertices : int
+        The number of vertices of the graph (0 to num_vertices - 1)
+    maxcardinality : bool(False)
+        Only consider the matchings with the maximum number of edges
+
+    Returns
+    -------
+    A list where the index i holds the vertex matched with i (or -1)
+    """
+
+    nvertex = num_vertices
+    nedge = len(edges)
+    if nedge == 0:
+        return [-1] * nvertex
+
+    maxweight = max(0, max(wt for _, _, wt in edges))
+
+    # endpoint[p] is the vertex to which the endpoint p is attached (edge k = p // 2)
+    endpoint = [edges[p // 2][p % 2] for p in range(2 * nedge)]
+
+    # neighbend[v] is the list of remote endpoints of the edges attached to v
+    neighbend = [[] for _ in range(nvertex)]
+    for k, (i, j, wt) in enumerate(edges):
+        neighbend[i].append(2 * k + 1)
+        neighbend[j].append(2 * k)
+
+    # mate[v] is the remote endpoint of the matched edge of v (or -1)
+    mate = nvertex * [-1]
+
+    # label[b] is 0 (free), 1 (S-vertex/blossom) or 2 (T-vertex/blossom)
+    label = (2 * nvertex) * [0]
+    labelend = (2 * nvertex) * [-1]
+
+    inblossom = list(range(nvertex))
+    blossomparent = (2 * nvertex) * [-1]
+    blossomchilds = (2 * nvertex) * [None]
+    blossombase = list(range(nvertex)) + nvertex * [-1]
+    blossomendps = (2 * nvertex) * [None]
+    bestedge = (2 * nvertex) * [-1]
+    blossombestedges = (2 * nvertex) * [None]
+    unusedblossoms = list(range(nvertex, 2 * nvertex))
+
+    dualvar = nvertex * [maxweight] + nvertex * [0]
+    allowedge = nedge * [False]
+    queue = []
+
+    weights = [2 * wt for _, _, wt in edges]
+
+    def slack(k):
+        return dualvar[endpoint[2 * k]] + dualvar[endpoint[2 * k + 1]] - weights[k]
+
+    def blossom_leaves(b):
+        if b < nvertex:
+            yield b
+        else:
+            for t in blossomchilds[b]:
+                if t < nvertex:
+                    yield t
+                else:
+                    yield from blossom_leaves(t)
+
+    def assign_label(w, t, p):
+        b = inblossom[w]
+        label[w] = label[b] = t
+        labelend[w] = labelend[b] = p
+        bestedge[w] = bestedge[b] = -1
+        if t == 1:
+            queue.extend(blossom_leaves(b))
+        elif t == 2:
+            base = blossombase[b]
+            assign_label(endpoint[mate[base]], 1, mate[base] ^ 1)
+
+    def scan_blossom(v, w):
+        # Trace back from v and w to find a new blossom base (or -1 for an augmenting path)
+        path = []
+        base = -1
+        while v != -1 or w != -1:
+            b = inblossom[v]
+            if label[b] & 4:
+                base = blossombase[b]
+                break
+            path.append(b)
+            label[b] = 5
+            if labelend[b] == -1:
+                v = -1
+            else:
+                v = endpoint[labelend[b]]
+                b = inblossom[v]
+                v = endpoint[labelend[b]]
+            if w != -1:
+                v, w = w, v
+        for b in path:
+            label[b] = 1
+        return base
+
+    def add_blossom(base, k):
+        v, w, wt = edges[k]
+        bb = inblossom[base]
+        bv = inblossom[v]
+        bw = inblossom[w]
+
+        b = unusedblossoms.pop()
+        blossombase[b] = base
+        blossomparent[b] = -1
+        blossomparent[bb] = b
+        blossomchilds[b] = path = []
+        blossomendps[b] = endps = []
+
+        while bv != bb:
+            blossomparent[bv] = b
+            path.append(bv)
+            endps.append(labelend[bv])
+            v = endpoint[labelend[bv]]
+            bv = inblossom[v]
+        path.append(bb)
+        path.reverse()
+        endps.reverse()
+        endps.append(2 * k)
+        while bw != bb:
+            blossomparent[bw] = b
+            path.append(bw)
+            endps.append(labelend[bw] ^ 1)
+            w = endpoint[labelend[bw]]
+            bw = inblossom[w]
+
+        label[b] = 1
+        labelend[b] = labelend[bb]
+        dualvar[b] = 0
+
+        for v in blossom_leaves(b):
+            if label[inblossom[v]] == 2:
+                queue.append(v)
+            inblossom[v] = b
+
+        bestedgeto = (2 * nvertex) * [-1]
+        for bv in path:
+            if blossombestedges[bv] is None:
+                nblists = [[p // 2 for p in neighbend[v]] for v in blossom_leaves(bv)]
+            else:
+                nblists = [blossombestedges[bv]]
+            for nblist in nblists:
+                for k in nblist:
+                    i, j, wt = edges[k]
+                    if inblossom[j] == b:
+                        i, j = j, i
+                    bj = inblossom[j]
+                    if (
+                        bj != b
+                        and label[bj] == 1
+                        and (bestedgeto[bj] == -1 or slack(k) < slack(bestedgeto[bj]))
+                    ):
+                        bestedgeto[bj] = k
+            blossombestedges[bv] = None
+            bestedge[bv] = -1
+
+        blossombestedges[b] = [k for k in bestedgeto if k != -1]
+        bestedge[b] = -1
+        for k in blossombestedges[b]:
+            if bestedge[b] == -1 or slack(k) < slack(bestedge[b]):
+                bestedge[b] = k
+
+    def expand_blossom(b, endstage):
+        for s in blossomchilds[b]:
+            blossomparent[s] = -1
+            if s < nvertex:
+                inblossom[s] = s
+            elif endstage and dualvar[s] == 0:
+                expand_blossom(s, endstage)
+            else:
+                for v in blossom_leaves(s):
+                    inblossom[v] = s
+
+        if (not endstage) and label[b] == 2:
+            # relabel the sub-blossoms on the even path through the expanded T-blossom
+            entrychild = inblossom[endpoint[labelend[b] ^ 1]]
+            j = blossomchilds[b].index(entrychild)
+            if j & 1:
+                j -= len(blossomchilds[b])
+                jstep = 1
+                endptrick = 0
+            else:
+                jstep = -1
+                endptrick = 1
+
+            p = labelend[b]
+            while j != 0:
+                label[endpoint[p ^ 1]] = 0
+                label[endpoint[blossomendps[b][j - endptrick] ^ endptrick ^ 1]] = 0
+                assign_label(endpoint[p ^ 1], 2, p)
+                allowedge[blossomendps[b][j - endptrick] // 2] = True
+                j += jstep
+                p = blossomendps[b][j - endptrick] ^ endptrick
+                allowedge[p // 2] = True
+                j += jstep
+
+            bv = blossomchilds[b][j]
+            label[endpoint[p ^ 1]] = label[bv] = 2
+            labelend[endpoint[p ^ 1]] = labelend[bv] = p
+            bestedge[bv] = -1
+            j += jstep
+
+            while blossomchilds[b][j] != entrychild:
+                bv = blossomchilds[b][j]
+                if label[bv] == 1:
+                    j += jstep
+                    continue
+                for v in blossom_leaves(bv):
+                    if label[v] != 0:
+                        break
+                if label[v] != 0:
+                    label[v] = 0
+                    label[endpoint[mate[blossombase[bv]]]] = 0
+                    assign_label(v, 2, labelend[v])
+                j += jstep
+
+        label[b] = labelend[b] = -1
+        blossomchilds[b] = blossomendps[b] = None
+        blossombase[b] = -1
+        blossombestedges[b] = None
+        bestedge[b] = -1
+        unusedblossoms.append(b)
+
+    def augment_blossom(b, v):
+        t = v
+        while blossomparent[t] != b:
+            t = blossomparent[t]
+        if t >= nvertex:
+            augment_blossom(t, v)
+
+        i = j = blossomchilds[b].index(t)
+        if i & 1:
+            j -= len(blossomchilds[b])
+            jstep = 1
+            endptrick = 0
+        else:
+            jstep = -1
+            endptrick = 1
+
+        while j != 0:
+            j += jstep
+            t = blossomchilds[b][j]
+            p = blossomendps[b][j - endptrick] ^ endptrick
+            if t >= nvertex:
+                augment_blossom(t, endpoint[p])
+            j += jstep
+            t = blossomchilds[b][j]
+            if t >= nvertex:
+                augment_blossom(t, endpoint[p ^ 1])
+            mate[endpoint[p]] = p ^ 1
+            mate[endpoint[p ^ 1]] = p
+
+        blossomchilds[b] = blossomchilds[b][i:] + blossomchilds[b][:i]
+        blossomendps[b] = blossomendps[b][i:] + blossomendps[b][:i]
+        blossombase[b] = blossombase[blossomchilds[b][0]]
+
+    def augment_matching(k):
+        v, w, wt = edges[k]
+        for s, p in ((v, 2 * k + 1), (w, 2 * k)):
+            while True:
+                bs = inblossom[s]
+                if bs >= nvertex:
+                    augment_blossom(bs, s)
+                mate[s] = p
+                if labelend[bs] == -1:
+                    break
+                t = endpoint[labelend[bs]]
+                bt = inblossom[t]
+                s = endpoint[labelend[bt]]
+                j = endpoint[labelend[bt] ^ 1]
+                if bt >= nvertex:
+                    augment_blossom(bt, j)
+                mate[j] = labelend[bt]
+                p = labelend[bt] ^ 1
+
+    # Each stage augments the matching by one edge (or ends the search)
+    for _ in range(nvertex):
+        label[:] = (2 * nvertex) * [0]
+        bestedge[:] = (2 * nvertex) * [-1]
+        blossombestedges[nvertex:] = nvertex * [None]
+        allowedge[:] = nedge * [False]
+        queue[:] = []
+
+        for v in range(nvertex):
+            if mate[v] == -1 and label[inblossom[v]] == 0:
+                assign_label(v, 1, -1)
+
+        augmented = False
+        while True:
+            while queue and not augmented:
+                v = queue.pop()
+
+                for p in neighbend[v]:
+                    k = p // 2
+                    w = endpoint[p]
+                    if inblossom[v] == inblossom[w]:
+                        continue
+                    if not allowedge[k]:
+                        kslack = dualvar[v] + dualvar[w] - weights[k]  # slack(k) inlined
+                        if kslack <= 0:
+                            allowedge[k] = True
+
+                    if allowedge[k]:
+                        if label[inblossom[w]] == 0:
+                            assign_label(w, 2, p ^ 1)
+                        elif label[inblossom[w]] == 1:
+                            base = scan_blossom(v, w)
+                            if base >= 0:
+                                add_blossom(base, k)
+                            else:
+                                augment_matching(k)
+                                augmented = True
+                                break
+                        elif label[w] == 0:
+                            label[w] = 2
+                            labelend[w] = p ^ 1
+                    elif label[inblossom[w]] == 1:
+                        b = inblossom[v]
+                        if bestedge[b] == -1 or kslack < slack(bestedge[b]):
+                            bestedge[b] = k
+                    elif label[w] == 0:
+                        if bestedge[w] == -1 or kslack < slack(bestedge[w]):
+                            bestedge[w] = k
+
+            if augmented:
+                break
+
+            # No augmenting path yet: update the dual variables
+            deltatype = -1
+            delta = deltaedge = deltablossom = None
+
+            if not maxcardinality:
+                deltatype = 1
+                delta = min(dualvar[:nvertex])
+
+            for v in range(nvertex):
+                if label[inblossom[v]] == 0 and bestedge[v] != -1:
+                    d = slack(bestedge[v])
+                    if deltatype == -1 or d < delta:
+                        delta = d
+                        deltatype = 2
+                        deltaedge = bestedge[v]
+
+            for b in range(2 * nvertex):
+                if blossomparent[b] == -1 and label[b] == 1 and bestedge[b] != -1:
+                    kslack = slack(bestedge[b])
+                    d = kslack // 2 if isinstance(kslack, int) else kslack / 2
+                    if deltatype == -1 or d < delta:
+                        delta = d
+                        deltatype = 3
+                        deltaedge = bestedge[b]
+
+            for b in range(nvertex, 2 * nvertex):
+                if (
+                    blossombase[b] >= 0
+                    and blossomparent[b] == -1
+                    and label[b] == 2
+                    and (deltatype == -1 or dualvar[b] < delta)
+                ):
+                    delta = dualvar[b]
+                    deltatype = 4
+                    deltablossom = b
+
+            if deltatype == -1:  # no further improvement possible (maxcardinality)
+                deltatype = 1
+                delta = max(0, min(dualvar[:nvertex]))
+
+            for v in range(nvertex):
+                if label[inblossom[v]] == 1:
+                    dualvar[v] -= delta
+                elif label[inblossom[v]] == 2:
+                    dualvar[v] += delta
+            for b in range(nvertex, 2 * nvertex):
+                if blossombase[b] >= 0 and blossomparent[b] == -1:
+                    if label[b] == 1:
+                        dualvar[b] += delta
+                    elif label[b] == 2:
+                        dualvar[b] -= delta
+
+            if deltatype == 1:
+                break
+            elif deltatype == 2:
+                allowedge[deltaedge] = True
+                i, j, wt = edges[deltaedge]
+                if label[inblossom[i]] == 0:
+                    i, j = j, i
+                queue.append(i)
+            elif deltatype == 3:
+                allowedge[deltaedge] = True
+                i, j, wt = edges[deltaedge]
+                queue.append(i)
+            elif deltatype == 4:
+                expand_blossom(deltablossom, False)
+
+        if not augmented:
+            break
+
+        # Expand the S-blossoms with a null dual variable at the end of the stage
+        for b in range(nvertex, 2 * nvertex):
+            if (
+                blossomparent[b] == -1
+                and blossombase[b] >= 0
+                and label[b] == 1
+                and dualvar[b] == 0
+            ):
+                expand_blossom(b, True)
+
+    return [endpoint[p] if p >= 0 else -1 for p in mate]
@@ -7,10 +7,13 @@
 import datetime
 import re
 import math
+import sys
 import uuid
 
 from operator import attrgetter
 
+from model.rows import LazyRows
+
 
 class Player:
     """This class handles the chess players.
@@ -28,18 +31,25 @@ class Player:
     score : int
         Total points earned by the player
     played_actors : set(int)
-        Opponent's id the player has already played
+        Opponent's id the player has already played (in any tournament,
+        the pairings rely on Tournament.has_played), a shared empty frozenset until the first one
     uid : str
         A unique universal identifier to share with other classes
+    dirty : bool
+        True when the instance changed since it was last saved or loaded
+    version : int
+        Incremented whenever one of its attributes is set (the rendered rows are cached until then)
 
     Getters & Setters
     -----------------
     birthdate(self)
-        Return the _birthdate datetime.datetime as a str
+        Return the _birth_ordinal as a str
     birthdate(self, v)
-        Convert various date inputs to a datetime.datetime object stored in _birthdate.
+        Convert various date inputs to a date ordinal (int) stored in _birth_ordinal.
+    _birthdate(self)
+        Return the _birth_ordinal as a datetime.datetime
     age(self)
-        Return the age based on the _birthdate
+        Return the age based on the _birth_ordinal
     sex(self)
         Return _sex
     sex(self, v)
@@ -71,6 +81,8 @@ class Player:
 
     Static & Class Methods
     ----------------------
+    from_serialized(cls, rows)
+        Return the players of the given trusted rows (serialize), without running the setters
     get_fields(cls)
         Return the fields requiered to input or edit any player instance
     get_sort_key(sortby)
@@ -86,6 +98,21 @@ class Player:
         Return a sorted tuples containing the available players in the whole app
     """
 
+    # no instance __dict__: a federation import holds about 100k players in memory
+    __slots__ = (
+        "family_name",
+        "first_name",
+        "_birth_ordinal",
+        "_sex",
+        "_elo",
+        "score",
+        "played_actors",
+        "uid",
+        "dirty",
+        "version",
+        "_lines",
+    )
+
     labels = {
         "family_name": "Nom de famille",
         "first_name": "Prénom",
@@ -113,31 +140,44 @@ class Player:
         self.sex = sex
         self.elo = elo
         self.score = score
-        self.played_actors = set()
+        self.played_actors = NO_OPPONENT
         self.uid = uid if uid is not None else self._gen_UID()
 
+    def __setattr__(self, name, value):
+        """ Flag the instance as modified whenever one of its attributes is set. """
+
+        if name != "dirty":
+            super().__setattr__("dirty", True)
+            super().__setattr__("version", getattr(self, "version", -1) + 1)
+            super().__setattr__("_lines", None)  # the cached one_line rows
+            if name in INTERNED_FIELDS and type(value) is str:
+                value = sys.intern(value)
+        super().__setattr__(name, value)
+
     # === GETTERS & SETTERS ===
 
     @property
     def birthdate(self):
-        return self._birthdate.strftime("%d/%m/%Y")
+        return datetime.date.fromordinal(self._birth_ordinal).strftime("%d/%m/%Y")
 
     @birthdate.setter
     def birthdate(self, v):
         try:
-            s = re.search(
-                "^([0-9]{1,2})[-/. ]([0-9]{1,2})[-/. ]([0-9]{4})$", v
-            ).groups()
-            self._birthdate = datetime.datetime(int(s[2]), int(s[1]), int(s[0]))
+            s = BIRTHDATE_PATTERN.search(v).groups()
+            self._birth_ordinal = datetime.date(int(s[2]), int(s[1]), int(s[0])).toordinal()
         except Exception:
             raise SyntaxError("D/M/YYYY format requested")
 
+    @property
+    def _birthdate(self):
+        """ Return the birthdate as a datetime.datetime (at midnight) """
+        return datetime.datetime.fromordinal(self._birth_ordinal)
+
     @property
     def age(self):
         """ Return the current age of the actor in years """
-        now = datetime.datetime.now()
-        delta = now - self._birthdate
-        return math.floor(delta.days / 365.2425)
+        days = datetime.date.today().toordinal() - self._birth_ordinal
+        return math.floor(days / 365.2425)
 
     @property
     def sex(self):
@@ -188,6 +228,8 @@ class Player:
             The uid attribute of the opponent Player's instance met
         """
 
+        if self.played_actors is NO_OPPONENT:
+            self.played_actors = set()
         self.played_actors.add(player_id)
 
     def has_played(self, player_id):
@@ -211,6 +253,9 @@ class Player:
     ):
         """Return a full resume of the actor in one line.
 
+        The rows are cached by requested columns (and by day when the age is shown)
+        until one of the attributes is set again.
+
         Parameters
         ----------
         ljustv : int(20)
@@ -227,6 +272,19 @@ class Player:
             Should the line include exta attributes ?
         """
 
+        key = (ljustv, age, sex, elo, score, extra)
+        if age:
+            key += (datetime.date.today().toordinal(),)
+
+        lines = self._lines
+        if lines is None:
+            lines = {}
+            super().__setattr__("_lines", lines)
+        elif key in lines:
+            return lines[key]
+        elif len(lines) >= MAX_CACHED_LINES:
+            lines.clear()
+
         retv = []
         retv.append(self.get_fullname().ljust(ljustv)[:ljustv])
         if age:
@@ -240,7 +298,8 @@ class Player:
         if extra:
             retv.append(extra)
 
-        return "|".join(retv)
+        lines[key] = "|".join(retv)
+        return lines[key]
 
     def serialize(self):
         """ Return a JSON representation of the Player instance """
@@ -283,6 +342,55 @@ class Player:
 
     # === STATIC & CLASS METHODS ===
 
+    @classmethod
+    def from_serialized(cls, rows):
+        """Return the players of the given rows (serialize), without running the setters.
+
+        This is the bulk path used to load the storage, whose rows were written by serialize:
+        the values are not validated, and each distinct birthdate is only parsed once.
+        The returned players are not flagged as modified.
+        The forms must keep creating the players with the constructor (validation).
+
+        Parameters
+        ----------
+        rows : list(dict)
+            The serialized players
+
+        Returns
+        -------
+        A list of Player instances
+        """
+
+        ordinals = {}  # birthdate str -> date ordinal
+        new = object.__new__
+        setslot = object.__setattr__
+        intern = sys.intern
+
+        players = []
+        for row in rows:
+            birthdate = row["birthdate"]
+            ordinal = ordinals.get(birthdate)
+            if ordinal is None:
+                day, month, year = BIRTHDATE_PATTERN.search(birthdate).groups()
+                ordinal = datetime.date(int(year), int(month), int(day)).toordinal()
+                ordinals[birthdate] = ordinal
+
+            player = new(cls)
+            setslot(player, "family_name", intern(row["family_name"]))
+            setslot(player, "first_name", intern(row["first_name"]))
+            setslot(player, "_birth_ordinal", ordinal)
+            setslot(player, "_sex", intern(row["sex"]))
+            setslot(player, "_elo", row["elo"])
+            setslot(player, "score", row.get("score", 0))
+            setslot(player, "played_actors", NO_OPPONENT)
+            setslot(player, "uid", row["uid"])
+            setslot(player, "dirty", False)
+            setslot(player, "version", 0)
+            setslot(player, "_lines", None)
+            players.append(player)
+
+        return players
+
     @classmethod
     def get_fields(cls):
         """ Return the fields requiered to input or edit any player instance. """
@@ -370,6 +478,12 @@ class Player:
     def multisort(container, seqsort):
         """Sort a given container based on the given order sequence (get_sort_key).
 
+        The container is sorted once per field, from the last one to the first one
+        (the sort is stable). Each field is read from the stored attribute (no property
+        call) and the age is computed from a single current date. A single sort on one
+        tuple key per player is slower (see benchmarks/bench_sort.py): the tuples are
+        compared field by field, while each pass compares values of a single type.
+
         Parameters
         ---------
         container : any container
@@ -378,8 +492,14 @@ class Player:
             A sequence of sorting actions to apply to the container
         """
 
-        for key, reverse in reversed(seqsort):
-            container.sort(key=attrgetter(key), reverse=reverse)
+        today = datetime.date.today().toordinal()
+
+        def age(player):
+            return math.floor((today - player._birth_ordinal) / 365.2425)
+
+        for name, reverse in reversed(seqsort):
+            key = age if name == "age" else attrgetter(SORT_FIELDS.get(name, name))
+            container.sort(key=key, reverse=reverse)
         return container
 
     # --- Generate list for Curses views ---
@@ -389,6 +509,8 @@ class Player:
         """Return tuples containing the available players and the
         appropriate controller methods to call in order to 'open' them.
 
+        The rows are rendered when they are displayed (see LazyRows).
+
         Parameters
         ----------
         sortby : str
@@ -397,14 +519,16 @@ class Player:
             the world instance containing all tournament's and player's instances.
         """
 
-        actors = Player.multisort(world.get_actors(), Player.get_sort_key(sortby))
+        tournament = world.get_active_tournament()
+        if sortby == "score" and tournament is not None:  # kept sorted by the tournament
+            actors = tournament.standings()
+        else:
+            actors = Player.multisort(world.get_actors(), Player.get_sort_key(sortby))
 
         if len(actors) > 0:
-            retv = [
-                (f" {actor.one_line()} ", "open_input_actor_edit", actor)
-                for actor in actors
-            ]
-            return tuple(retv)
+            return LazyRows(
+                actors, lambda actor: (f" {actor.one_line()} ", "open_input_actor_edit", actor)
+            )
         else:
             return (("Aucun acteur", "go_back"),)
 
@@ -412,6 +536,8 @@ class Player:
     def list_actors(tournament, world, sortby):
         """Return sorted tuples containing the available players in the provided tournament.
 
+        The rows are rendered when they are displayed (see LazyRows).
+
         Parameters
         ----------
         tournament: Tournament
@@ -422,13 +548,15 @@ class Player:
             A string indicating the sorting sequence to use
         """
 
-        actors = Player.multisort(
-            world.get_actors(tournament), Player.get_sort_key(sortby)
-        )
+        if sortby == "score":  # the standings are kept sorted by the tournament
+            actors = tournament.standings()
+        else:
+            actors = Player.multisort(
+                world.get_actors(tournament), Player.get_sort_key(sortby)
+            )
 
         if len(actors) > 0:
-            retv = [(f" {actor.one_line()} ", None) for actor in actors]
-            return tuple(retv)
+            return LazyRows(actors, lambda actor: (f" {actor.one_line()} ", None))
         else:
             return (("Aucun acteur", "go_back"),)
 
@@ -436,6 +564,8 @@ class Player:
     def list_all_actors(world, sortby):
         """Return a sorted tuples containing the available players in the whole app.
 
+        The rows are rendered when they are displayed (see LazyRows).
+
         Parameters
         ----------
         world : World
@@ -447,7 +577,22 @@ class Player:
         actors = Player.multisort(world.get_all_actors(), Player.get_sort_key(sortby))
 
         if len(actors) > 0:
-            retv = [(f" {actor.one_line()} ", None) for actor in actors]
-            return tuple(retv)
+            return LazyRows(actors, lambda actor: (f" {actor.one_line()} ", None))
         else:
             return (("Aucun acteur", "go_back"),)
+
+
+# the accepted birthdate formats (D/M/YYYY with - / . or space separators)
+BIRTHDATE_PATTERN = re.compile("^([0-9]{1,2})[-/. ]([0-9]{1,2})[-/. ]([0-9]{4})$")
+
+# the played_actors of the players without opponent (replaced by a set on the first one)
+NO_OPPONENT = frozenset()
+
+# the text attributes shared by many players (interned)
+INTERNED_FIELDS = {"family_name", "first_name", "_sex"}
+
+# the maximum number of one_line rows cached by player (one per columns combination)
+MAX_CACHED_LINES = 16
+
+# the attributes storing the value of the sorted properties (read without the property call)
+SORT_FIELDS = {"elo": "_elo", "sex": "_sex"}
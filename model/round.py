@@ -6,8 +6,11 @@
 """
 
 import datetime
+import itertools
 
+from model.pairing import get_pairing
 from model.player import Player
+from model.rows import LazyRows
 
 
 class Round:
@@ -26,6 +29,10 @@ class Round:
         The current round number (used to determine the rules to pairs players)
     world : Wold
         The world instance where the original players instances can be found
+    dirty : bool
+        True when the instance changed since it was last saved or loaded
+    _rows : dict(int, tuple(tuple, str))
+        The cached list_games row of each game (by index), with the versions it was rendered from
 
     Getters & Setters
     -----------------
@@ -42,7 +49,7 @@ class Round:
     --------------
     close()
         Close the round by adding the current time to close_time
-    gen_games(players_id)
+    gen_games(players_id, pairing="greedy", brackets=None, has_played=None)
         Generate the games from the given player's list
     one_line(ljustv=10)
         Return a complete presentation of the round in one line
@@ -51,8 +58,8 @@ class Round:
 
     Static & Class Methods
     ----------------------
-    _get_games(players_id)
-        Actually the pairing process takes place in here not in gen_games()
+    _get_games(players_id, pairing="greedy", brackets=None, has_played=None)
+        Pair the players with the given pairing engine
     _get_time()
         Return the current date as a datetime.datetime
 
@@ -75,6 +82,9 @@ class Round:
         games=None,
         start_time=None,
         close_time=None,
+        pairing="greedy",
+        brackets=None,
+        has_played=None,
     ):
         self.name = name
         self.start_time = start_time if start_time is not None else self._get_time()
@@ -82,9 +92,17 @@ class Round:
         self.games = games if games is not None else []
         self.round_index = round_index
         self.world = world
+        self._rows = {}
 
         if start_time is None:
-            self.gen_games(players_id)
+            self.gen_games(players_id, pairing, brackets, has_played)
+
+    def __setattr__(self, name, value):
+        """ Flag the instance as modified whenever one of its attributes is set. """
+
+        if name != "dirty":
+            super().__setattr__("dirty", True)
+        super().__setattr__(name, value)
 
     # === GETTERS & SETTERS ===
 
@@ -121,10 +139,22 @@ class Round:
 
         self.close_time = self._get_time()
 
-    def gen_games(self, players_id):
-        """" Generate the games from the given player's list. """
+    def gen_games(self, players_id, pairing="greedy", brackets=None, has_played=None):
+        """Generate the games from the given player's list.
 
-        paired_players = self._get_games(players_id)
+        Parameters
+        ----------
+        players_id : list(str)
+            The list of the uid attribute of the participants
+        pairing : str("greedy")
+            The name of the pairing engine to use (see model.pairing)
+        brackets : list(tuple(float, list(Player)))
+            The participants grouped by score (see Tournament.score_brackets)
+        has_played : function
+            Check if two players already met (see Tournament.has_played)
+        """
+
+        paired_players = self._get_games(players_id, pairing, brackets, has_played)
 
         for p1, p2 in paired_players:
             self.games.append(([p1, 0], [p2, 0]))
@@ -156,49 +186,44 @@ class Round:
             "start_time": self.start_time,
             "close_time": self.close_time,
             # "games": [str(type(x)) for x in self.games],
-            "games": self.games,
+            "games": [[list(x[0]), list(x[1])] for x in self.games],
             "round_index": self.round_index,
         }
 
     # === PRIVATE METHODS ===
 
-    def _get_games(self, players_id):
-        """Actually the pairing process takes place in here not in gen_games().
+    def _get_games(self, players_id, pairing="greedy", brackets=None, has_played=None):
+        """Pair the players with the given pairing engine.
 
         Parameters
         ----------
         players_id : list(str)
             The list of the uid attribute of the participants
+        pairing : str("greedy")
+            The name of the pairing engine to use (see model.pairing)
+        brackets : list(tuple(float, list(Player)))
+            The participants grouped by score (built from the players' score if None)
+        has_played : function
+            Check if two players already met (based on the players' history if None)
         """
 
-        sorted_players = Player.multisort(
-            self.world.get_actors(), Player.get_sort_key("score")
-        )
-
-        pairs = []
-        if self.round_index == 0:
-            half = len(players_id) // 2
-            part1 = [p.uid for p in sorted_players[:half]]
-            part2 = [p.uid for p in sorted_players[half:]]
-            for pair in zip(part1, part2):
-                pairs.append(pair)
-        else:
-            drafted = []
-            for i, player1 in enumerate(sorted_players):
-                for player2 in sorted_players[i:]:
-
-                    if (
-                        player1.uid == player2.uid
-                        or player1.uid in drafted
-                        or player2.uid in drafted
-                    ):
-                        continue
-
-                    if player1.has_played(player2.uid) is not True:
-                        pairs.append((player1.uid, player2.uid))
-                        drafted.extend([player1.uid, player2.uid])
-                        break
-        return pairs
+        if brackets is None:
+            sorted_players = Player.multisort(
+                self.world.get_actors(), Player.get_sort_key("score")
+            )
+            brackets = [
+                (score, list(players))
+                for score, players in itertools.groupby(
+                    sorted_players, key=lambda x: x.score
+                )
+            ]
+
+        if has_played is None:
+
+            def has_played(player1, player2):
+                return player1.has_played(player2.uid)
+
+        return get_pairing(pairing)(brackets, self.round_index, has_played)
 
     def _get_time(self):
         """ Return the current date as a datetime.datetime. """
@@ -251,6 +276,8 @@ class Round:
     def list_games(tournament, world):
         """Return tuples containing the provided tournament Round/games.
 
+        The game rows are rendered when they are displayed (see LazyRows).
+
         Parameters
         ----------
         tournament: Tournament
@@ -262,29 +289,38 @@ class Round:
         rounds = tournament.rounds
         if len(rounds) > 0:
 
-            retv = []
+            items = []  # the title rows, or the (round, game index) of the game rows
             for r in rounds:
-
-                retv.append(("", None))
-                retv.append((f" {r.name} ", None))
-
-                for i, game in enumerate(r.games):
-
-                    player1 = world.get_actor(game[0][0])
-                    player2 = world.get_actor(game[1][0])
-
-                    score1 = game[0][1]
-                    score2 = game[1][1]
-
-                    retv.append(
-                        (
-                            f"({player1.one_line(age=False, sex=False, score=False, extra=f'PTS:{score1:3}')}) vs "
-                            + f"({player2.one_line(age=False, sex=False, score=False, extra=f'PTS:{score2:3}')})",
-                            None,
-                        )
+                items.append(("", None))
+                items.append((f" {r.name} ", None))
+                items.extend((r, i) for i in range(len(r.games)))
+
+            def render(item):
+                r, i = item
+                if type(r) is str:
+                    return item
+
+                game = r.games[i]
+                player1 = world.get_actor(game[0][0])
+                player2 = world.get_actor(game[1][0])
+
+                score1 = game[0][1]
+                score2 = game[1][1]
+
+                # the row is only rendered again when a player or a score changed
+                key = (player1, player1.version, score1, player2, player2.version, score2)
+                cached = r._rows.get(i)
+                if cached is None or cached[0] != key:
+                    cached = (
+                        key,
+                        f"({player1.one_line(age=False, sex=False, score=False, extra=f'PTS:{score1:3}')}) vs "
+                        + f"({player2.one_line(age=False, sex=False, score=False, extra=f'PTS:{score2:3}')})",
                     )
+                    r._rows[i] = cached
 
-            return tuple(retv)
+                return (cached[1], None)
+
+            return LazyRows(items, render)
         else:
             return (("Le tournoi n'est pas commencé", "go_back"),)
 
@@ -0,0 +1,53 @@
+#! /usr/bin/env python3
+# coding: utf-8
+
+""" This module handles the rows of the long listings (rendered on access) """
+
+
+class LazyRows:
+    """This class is a read-only sequence of rows, rendered when they are read.
+
+    The curses views only read the rows visible in their window,
+    so the listings of thousands of players only format one screen of rows.
+
+    Attributes
+    ----------
+    items : list
+        The source items, one per row
+    render : function
+        Return the row of the given item (a tuple('label', 'action'[, param]))
+
+    Public Methods
+    --------------
+    map(func)
+        Return the rows transformed by the given function (rendered on access too)
+    """
+
+    def __init__(self, items, render):
+        self.items = items
+        self.render = render
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.render(x) for x in self.items[index]]
+        return self.render(self.items[index])
+
+    def __iter__(self):
+        return map(self.render, self.items)
+
+    # === PUBLIC METHODS ===
+
+    def map(self, func):
+        """Return the rows transformed by the given function (rendered on access too).
+
+        Parameters
+        ----------
+        func : function
+            The function applied on each row
+        """
+
+        render = self.render
+        return LazyRows(self.items, lambda x: func(render(x)))
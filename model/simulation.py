@@ -0,0 +1,272 @@
+#! /usr/bin/env python3
+# coding: utf-8
+
+""" This module predicts the final standings of a tournament (Monte Carlo simulations)
+
+The remaining games of a tournament are played many times with random results
+based on the ELO ratings (the same model as utils.get_fake_score_from_elo),
+and each round is paired with the pairing engine of the tournament (the engines
+bounded by a time budget are replaced by a fast one, see SIM_PAIRINGS).
+
+The results of the games are drawn in batches with NumPy when it is installed
+(the random module is used otherwise), and the simulations are spread over
+a pool of processes.
+"""
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import os
+import random
+
+from model.pairing import get_pairing
+
+try:
+    import numpy
+except ImportError:  # the results are drawn with the random module
+    numpy = None
+
+ELO_NOISE = 500  # maximum random bonus added to the ELO of each player in a game
+SIM_PAIRINGS = {"backtrack": "dutch"}  # engines spending their time budget on every round
+
+
+class SimPlayer:
+    """This class stands for a player in the simulations (lighter than Player).
+
+    Attributes
+    ----------
+    uid : str
+        The uid of the player
+    elo : int
+        The ELO rating of the player
+    seat : int
+        The index of the player in the simulation state
+    """
+
+    __slots__ = ("uid", "elo", "seat")
+
+    def __init__(self, uid, elo, seat):
+        self.uid = uid
+        self.elo = elo
+        self.seat = seat
+
+
+def simulate(tournament, num_simulations=1000, processes=None, seed=None, pairing=None):
+    """Play the remaining games of the tournament many times and return the rank distributions.
+
+    The unfinished games of the current round are played, then the remaining rounds
+    are paired and played. The final standings are sorted by score, then by ELO.
+
+    Parameters
+    ----------
+    tournament : Tournament
+        The tournament to simulate (left untouched)
+    num_simulations : int(1000)
+        The number of simulated continuations
+    processes : int(None)
+        The number of worker processes (the number of CPUs if None, no pool if 1)
+    seed : int(None)
+        The seed of the random draws (for reproducible predictions)
+    pairing : str(None)
+        The name of the pairing engine to use (the tournament's one if None),
+        replaced by its SIM_PAIRINGS counterpart if any
+
+    Returns
+    -------
+    A dictionary with, for each player uid, the probability of each final
+    rank ('ranks', best first), the 'mean_score' and the probability to end
+    on the same score as another player ('tied', so a tiebreak is needed)
+    """
+
+    state = get_state(tournament)
+    pairing = pairing if pairing is not None else tournament.pairing
+    pairing = SIM_PAIRINGS.get(pairing, pairing)
+    processes = processes if processes is not None else os.cpu_count() or 1
+    processes = max(1, min(processes, num_simulations))
+
+    generator = random.Random(seed)
+    chunks = []
+    for i in range(processes):
+        size = num_simulations // processes + (i < num_simulations % processes)
+        chunks.append((state, pairing, size, generator.getrandbits(32)))
+
+    if processes == 1:
+        results = [_simulate_chunk(*chunks[0])]
+    else:
+        with ProcessPoolExecutor(processes) as executor:
+            results = list(executor.map(_simulate_chunk, *zip(*chunks)))
+
+    num_players = len(state["players"])
+    ranks = [[0] * num_players for _ in range(num_players)]
+    scores = [0] * num_players
+    ties = [0] * num_players
+    for chunk_ranks, chunk_scores, chunk_ties in results:
+        for seat in range(num_players):
+            ranks[seat] = [x + y for x, y in zip(ranks[seat], chunk_ranks[seat])]
+            scores[seat] += chunk_scores[seat]
+            ties[seat] += chunk_ties[seat]
+
+    return {
+        uid: {
+            "ranks": [x / num_simulations for x in ranks[seat]],
+            "mean_score": scores[seat] / num_simulations,
+            "tied": ties[seat] / num_simulations,
+        }
+        for seat, (uid, elo) in enumerate(state["players"])
+    }
+
+
+def prize_probabilities(distributions, places=3):
+    """Return the probability of each player to finish in the given number of first places.
+
+    Parameters
+    ----------
+    distributions : dict
+        The rank distributions returned by simulate()
+    places : int(3)
+        The number of awarded places
+    """
+
+    return {uid: sum(x["ranks"][:places]) for uid, x in distributions.items()}
+
+
+def get_state(tournament):
+    """Return the current state of the tournament as plain data (sent to the worker processes).
+
+    Parameters
+    ----------
+    tournament : Tournament
+        The tournament to simulate
+    """
+
+    world = tournament._world
+    seats = {uid: seat for seat, uid in enumerate(tournament.players)}
+
+    played = []
+    pending = []
+    for r in tournament.rounds:
+        for (player1, score1), (player2, score2) in r.games:
+            played.append((seats[player1], seats[player2]))
+            if score1 + score2 == 0:  # no result yet
+                pending.append((seats[player1], seats[player2]))
+
+    return {
+        "players": [(uid, world.get_actor(uid).elo) for uid in tournament.players],
+        "scores": [tournament.get_score(uid) for uid in tournament.players],
+        "played": played,
+        "pending": pending,
+        "round_index": len(tournament.rounds),
+        "num_rounds": max(0, tournament.num_rounds - len(tournament.rounds)),
+    }
+
+
+def _simulate_chunk(state, pairing, num_simulations, seed):
+    """Run some simulations (in a worker process) and return the summed rank counts, scores and ties.
+
+    The results of each round are drawn for all the simulations at once.
+    """
+
+    players = [SimPlayer(uid, int(elo), seat) for seat, (uid, elo) in enumerate(state["players"])]
+    elos = [x.elo for x in players]
+    seats = {x.uid: x.seat for x in players}
+    engine = get_pairing(pairing)
+    num_players = len(players)
+    num_games = num_players // 2
+
+    if numpy is not None:
+        rng = numpy.random.default_rng(seed)
+        elos_array = numpy.array(elos)
+    else:
+        rng = random.Random(seed)
+
+    ranks = [[0] * num_players for _ in range(num_players)]
+    total_scores = [0] * num_players
+    ties = [0] * num_players
+
+    # the games already played, as (seat1 * num_players + seat2) keys in both orders
+    played = {i * num_players + j for i, j in state["played"]}
+    played.update(j * num_players + i for i, j in state["played"])
+    simulations = [
+        {"scores": list(state["scores"]), "played": set(played)}
+        for _ in range(num_simulations)
+    ]
+
+    for round_offset in range(-1, state["num_rounds"]):
+        noise = _draw_noise(rng, num_simulations, num_games)
+
+        for simulation, sim_noise in zip(simulations, noise):
+            scores = simulation["scores"]
+            played = simulation["played"]
+
+            if round_offset == -1:  # unfinished games of the current round
+                pairs = state["pending"]
+            else:
+                brackets = _brackets(players, scores, elos)
+                pairs = [
+                    (seats[uid1], seats[uid2])
+                    for uid1, uid2 in engine(
+                        brackets,
+                        state["round_index"] + round_offset,
+                        lambda p1, p2: p1.seat * num_players + p2.seat in played,
+                    )
+                ]
+                played.update(i * num_players + j for i, j in pairs)
+                played.update(j * num_players + i for i, j in pairs)
+
+            if len(pairs) == 0:
+                continue
+
+            if numpy is not None:
+                index1, index2 = numpy.array(pairs).T
+                rating1 = elos_array[index1] + sim_noise[: len(pairs), 0]
+                rating2 = elos_array[index2] + sim_noise[: len(pairs), 1]
+                results = ((rating1 > rating2) + (rating1 == rating2) * 0.5).tolist()
+            else:
+                results = [
+                    1 if r1 > r2 else 0.5 if r1 == r2 else 0
+                    for r1, r2 in (
+                        (elos[i] + n1, elos[j] + n2)
+                        for (i, j), (n1, n2) in zip(pairs, sim_noise)
+                    )
+                ]
+
+            for (i, j), result in zip(pairs, results):
+                scores[i] += result
+                scores[j] += 1 - result
+
+    for simulation in simulations:
+        scores = simulation["scores"]
+        standings = sorted(range(num_players), key=lambda x: (-scores[x], -elos[x]))
+        counts = Counter(scores)
+        for rank, seat in enumerate(standings):
+            ranks[seat][rank] += 1
+            total_scores[seat] += scores[seat]
+            if counts[scores[seat]] > 1:
+                ties[seat] += 1
+
+    return ranks, total_scores, ties
+
+
+def _draw_noise(rng, num_simulations, num_games):
+    """ Return the random ELO bonus of both players of each game, for each simulation. """
+
+    if numpy is not None:
+        return rng.integers(0, ELO_NOISE + 1, size=(num_simulations, num_games, 2))
+
+    bonus = range(ELO_NOISE + 1)
+    draws = []
+    for _ in range(num_simulations):
+        values = rng.choices(bonus, k=2 * num_games)
+        draws.append(list(zip(values[::2], values[1::2])))
+
+    return draws
+
+
+def _brackets(players, scores, elos):
+    """ Return the players grouped by score (best first, sorted by ELO in each bracket). """
+
+    standings = sorted(players, key=lambda x: (-scores[x.seat], -elos[x.seat]))
+    return [
+        (score, list(bracket))
+        for score, bracket in itertools.groupby(standings, key=lambda x: scores[x.seat])
+    ]
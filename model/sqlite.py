@@ -0,0 +1,388 @@
+#! /usr/bin/env python3
+# coding: utf-8
+
+""" The purpose of this module is to handle the SQLite IO """
+
+import logging
+import os
+import sqlite3
+
+from model.storage import StorageIO
+from model.world import World
+
+
+# The score columns have no declared type so 1 and 0.5 keep their int / float type
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tournaments (
+    uid TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    place TEXT,
+    start_date TEXT,
+    end_date TEXT,
+    num_rounds INTEGER,
+    game_type TEXT,
+    description TEXT,
+    status TEXT,
+    pairing TEXT NOT NULL DEFAULT 'greedy'
+);
+CREATE TABLE IF NOT EXISTS tournament_players (
+    tournament_uid TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    player_uid TEXT NOT NULL,
+    PRIMARY KEY (tournament_uid, position)
+);
+CREATE TABLE IF NOT EXISTS rounds (
+    tournament_uid TEXT NOT NULL,
+    round_index INTEGER NOT NULL,
+    name TEXT,
+    start_time TEXT,
+    close_time TEXT,
+    PRIMARY KEY (tournament_uid, round_index)
+);
+CREATE TABLE IF NOT EXISTS games (
+    tournament_uid TEXT NOT NULL,
+    round_index INTEGER NOT NULL,
+    game_index INTEGER NOT NULL,
+    player1 TEXT NOT NULL,
+    score1,
+    player2 TEXT NOT NULL,
+    score2,
+    PRIMARY KEY (tournament_uid, round_index, game_index)
+);
+CREATE TABLE IF NOT EXISTS players (
+    uid TEXT PRIMARY KEY,
+    family_name TEXT,
+    first_name TEXT,
+    birthdate TEXT,
+    sex TEXT,
+    elo INTEGER,
+    score
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value
+);
+CREATE INDEX IF NOT EXISTS tournaments_name ON tournaments (name);
+CREATE INDEX IF NOT EXISTS tournament_players_uid
+    ON tournament_players (player_uid);
+"""
+
+
+class SqliteIO(StorageIO):
+    """This class provide various methods to save & load the app data in a SQLite file.
+
+    It offers the same methods as TinyDbIO and exchanges the same serialized
+    dictionaries, but the tournaments are split in the tournaments,
+    tournament_players, rounds and games tables, so a tournament can be written
+    without rewriting the whole file. The journal, save_changes() and load_all()
+    methods are inherited from StorageIO.
+
+    Attributes
+    ----------
+    path : str
+        The path of the SQLite file
+    journal_path : str
+        The path of the journal file written alongside the SQLite file
+
+    Class Methods
+    -------------
+    open_file()
+        Open the SQLite file (and create the tables if needed)
+    close_file()
+        Close the SQLite file
+    save_all()
+        Save the tournaments and players' data from the World instance
+    write_changes(docs)
+        Write the serialized tournaments and players returned by _serialize_changes()
+    write_tournaments(serialized_data)
+        Replace all the tournaments with the provided serialized ones
+    write_players(serialized_players)
+        Replace all the players with the provided serialized ones
+    upsert_tournaments(serialized_data)
+        Update or insert the provided serialized tournaments using their uid
+    upsert_players(serialized_players)
+        Update or insert the provided serialized players using their uid
+    load_tournaments()
+        Return the serialized tournaments
+    load_players()
+        Return the serialized players
+    write_journal_seq(seq)
+        Write the sequence number of the last journal record saved in the file
+    load_journal_seq()
+        Return the sequence number of the last journal record saved in the file
+    """
+
+    path = "tournament.db"
+    journal_path = "tournament.db.journal"
+
+    @classmethod
+    def open_file(cls):
+        """ Open the SQLite file (and create the tables if needed). """
+
+        cls.db = sqlite3.connect(cls.path)
+        cls.db.execute("PRAGMA journal_mode=WAL")
+        cls.db.execute("PRAGMA synchronous=NORMAL")
+        cls.db.executescript(SCHEMA)
+        cls._migrate()
+
+    @classmethod
+    def close_file(cls):
+        """ Close the SQLite file. """
+
+        cls.db.close()
+
+    @classmethod
+    def save_all(cls):
+        """ Save the tournaments and players' data from the World instance. """
+
+        cls.open_file()
+
+        with cls.db:  # one transaction
+            cls.write_tournaments([x.serialize() for x in World.tournaments])
+            cls.write_players([x.serialize() for x in World.get_all_actors()])
+            cls.write_journal_seq(cls._journal_seq())
+        cls.close_file()
+
+        cls._mark_clean(World.tournaments, World.get_all_actors())
+        cls._truncate_journal()
+
+    @classmethod
+    def write_changes(cls, docs):
+        """Write the serialized tournaments and players returned by _serialize_changes().
+
+        Parameters
+        ----------
+        docs : dict
+            The serialized 'tournaments' and 'players' to update or insert
+            (and the 'journal_seq' of the last journal record they contain)
+        """
+
+        cls.open_file()
+
+        with cls.db:  # one transaction
+            cls.upsert_tournaments(docs["tournaments"])
+            cls.upsert_players(docs["players"])
+            cls.write_journal_seq(docs.get("journal_seq"))
+        cls.close_file()
+
+    # === Save ===
+
+    @classmethod
+    def write_tournaments(cls, serialized_data):
+        """ Replace all the tournaments with the provided serialized ones. """
+
+        logging.debug(f"WRITE_TOURNAMENTS: {len(serialized_data)}")
+
+        for table in ("tournaments", "tournament_players", "rounds", "games"):
+            cls.db.execute(f"DELETE FROM {table}")
+        cls.upsert_tournaments(serialized_data)
+
+    @classmethod
+    def write_players(cls, serialized_players):
+        """ Replace all the players with the provided serialized ones. """
+
+        logging.debug(f"WRITE_ALL_PLAYERS: {len(serialized_players)}")
+
+        cls.db.execute("DELETE FROM players")
+        cls.upsert_players(serialized_players)
+
+    @classmethod
+    def upsert_tournaments(cls, serialized_data):
+        """ Update or insert the provided serialized tournaments using their uid. """
+
+        logging.debug(f"UPSERT_TOURNAMENTS: {len(serialized_data)}")
+
+        for data in serialized_data:
+            uid = data["uid"]
+
+            cls.db.execute(
+                "INSERT INTO tournaments VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (uid) DO UPDATE SET name = excluded.name, "
+                "place = excluded.place, start_date = excluded.start_date, "
+                "end_date = excluded.end_date, num_rounds = excluded.num_rounds, "
+                "game_type = excluded.game_type, "
+                "description = excluded.description, status = excluded.status, "
+                "pairing = excluded.pairing",
+                (
+                    uid,
+                    data["name"],
+                    data["place"],
+                    data["start_date"],
+                    data["end_date"],
+                    data["num_rounds"],
+                    data["game_type"],
+                    data["description"],
+                    data["status"]["__enum__"],
+                    data.get("pairing", "greedy"),
+                ),
+            )
+
+            for table in ("tournament_players", "rounds", "games"):
+                cls.db.execute(f"DELETE FROM {table} WHERE tournament_uid = ?", (uid,))
+
+            cls.db.executemany(
+                "INSERT INTO tournament_players VALUES (?, ?, ?)",
+                [(uid, i, x) for i, x in enumerate(data["players"])],
+            )
+            cls.db.executemany(
+                "INSERT INTO rounds VALUES (?, ?, ?, ?, ?)",
+                [
+                    (uid, x["round_index"], x["name"], x["start_time"], x["close_time"])
+                    for x in data["rounds"]
+                ],
+            )
+            cls.db.executemany(
+                "INSERT INTO games VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (uid, x["round_index"], i, g[0][0], g[0][1], g[1][0], g[1][1])
+                    for x in data["rounds"]
+                    for i, g in enumerate(x["games"])
+                ],
+            )
+
+    @classmethod
+    def upsert_players(cls, serialized_players):
+        """ Update or insert the provided serialized players using their uid. """
+
+        logging.debug(f"UPSERT_PLAYERS: {len(serialized_players)}")
+
+        cls.db.executemany(
+            "INSERT INTO players VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (uid) DO UPDATE SET family_name = excluded.family_name, "
+            "first_name = excluded.first_name, birthdate = excluded.birthdate, "
+            "sex = excluded.sex, elo = excluded.elo, score = excluded.score",
+            [
+                (
+                    x["uid"],
+                    x["family_name"],
+                    x["first_name"],
+                    x["birthdate"],
+                    x["sex"],
+                    x["elo"],
+                    x["score"],
+                )
+                for x in serialized_players
+            ],
+        )
+
+    @classmethod
+    def write_journal_seq(cls, seq):
+        """Write the sequence number of the last journal record saved in the file.
+
+        Parameters
+        ----------
+        seq : int
+            The sequence number (nothing is written if None)
+        """
+
+        if seq is None:
+            return
+
+        cls.db.execute(
+            "INSERT INTO meta VALUES ('journal_seq', ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (seq,),
+        )
+
+    # === Load ===
+
+    @classmethod
+    def load_tournaments(cls):
+        """ Return the serialized tournaments (same format as Tournament.serialize). """
+
+        tournaments = {}
+        for row in cls.db.execute("SELECT * FROM tournaments ORDER BY rowid"):
+            tournaments[row[0]] = {
+                "uid": row[0],
+                "name": row[1],
+                "place": row[2],
+                "start_date": row[3],
+                "end_date": row[4],
+                "num_rounds": row[5],
+                "rounds": [],
+                "players": [],
+                "game_type": row[6],
+                "description": row[7],
+                "status": {"__enum__": row[8]},
+                "pairing": row[9],
+            }
+
+        for uid, player_uid in cls.db.execute(
+            "SELECT tournament_uid, player_uid FROM tournament_players "
+            "ORDER BY tournament_uid, position"
+        ):
+            tournaments[uid]["players"].append(player_uid)
+
+        rounds = {}
+        for uid, round_index, name, start_time, close_time in cls.db.execute(
+            "SELECT * FROM rounds ORDER BY tournament_uid, round_index"
+        ):
+            rounds[(uid, round_index)] = {
+                "name": name,
+                "start_time": start_time,
+                "close_time": close_time,
+                "games": [],
+                "round_index": round_index,
+            }
+            tournaments[uid]["rounds"].append(rounds[(uid, round_index)])
+
+        for uid, round_index, i, player1, score1, player2, score2 in cls.db.execute(
+            "SELECT * FROM games ORDER BY tournament_uid, round_index, game_index"
+        ):
+            rounds[(uid, round_index)]["games"].append(
+                [[player1, score1], [player2, score2]]
+            )
+
+        return list(tournaments.values())
+
+    @classmethod
+    def load_players(cls):
+        """ Return the serialized players (same format as Player.serialize). """
+
+        return [
+            {
+                "uid": row[0],
+                "family_name": row[1],
+                "first_name": row[2],
+                "birthdate": row[3],
+                "sex": row[4],
+                "elo": row[5],
+                "score": row[6],
+            }
+            for row in cls.db.execute("SELECT * FROM players ORDER BY rowid")
+        ]
+
+    @classmethod
+    def load_journal_seq(cls):
+        """ Return the sequence number of the last journal record saved in the file. """
+
+        if not os.path.exists(cls.path):
+            return 0
+
+        cls.open_file()
+        row = cls.db.execute("SELECT value FROM meta WHERE key = 'journal_seq'").fetchone()
+        cls.close_file()
+
+        return row[0] if row is not None else 0
+
+    # === Private ===
+
+    @classmethod
+    def _migrate(cls):
+        """ Add the columns missing from the files created by older versions. """
+
+        columns = [row[1] for row in cls.db.execute("PRAGMA table_info(tournaments)")]
+        if "pairing" not in columns:
+            cls.db.execute(
+                "ALTER TABLE tournaments ADD COLUMN pairing TEXT NOT NULL DEFAULT 'greedy'"
+            )
+            cls.db.commit()
+
+    @classmethod
+    def _serialize_changes(cls, tournaments, actors):
+        """ Return the serialized tournaments and players to write with write_changes(). """
+
+        return {
+            "tournaments": [x.serialize() for x in tournaments],
+            "players": [x.serialize() for x in actors],
+        }
@@ -0,0 +1,191 @@
+#! /usr/bin/env python3
+# coding: utf-8
+
+""" This module handles the tiebreaks used to rank the players of a tournament """
+
+
+class Tiebreaks:
+    """This class keeps the running tiebreak totals of the players of a tournament.
+
+    The totals are updated on each pairing and result (see Tournament.add_round
+    and Tournament.set_results), so the standings only cost one sort:
+    a result updates the two players, then the Buchholz and Sonneborn-Berger
+    totals of their opponents (one per round played), without scanning the games.
+
+    Attributes
+    ----------
+    scores : dict(str, float)
+        The score of each player (by uid)
+    buchholz : dict(str, float)
+        The sum of the scores of the opponents of each player
+    sonneborn_berger : dict(str, float)
+        The sum of the scores of the opponents of each player, weighted by his results against them
+    progressive : dict(str, float)
+        The sum of the cumulative scores of each player after each round
+
+    Public Methods
+    --------------
+    add_player(player_id)
+        Register a new player with null totals
+    start_round(round_index, pairs)
+        Register the pairs of a new round
+    set_result(round_index, player1_id, player2_id, score1, score2)
+        Set (or correct) the result of a game of the given round
+    get(player_id)
+        Return the score and tiebreaks of the given player (in ranking order)
+
+    Class Methods
+    -------------
+    from_rounds(players_id, rounds)
+        Build the totals from the games of the given rounds (one pass)
+    """
+
+    def __init__(self, players_id=()):
+        self.scores = {}
+        self.buchholz = {}
+        self.sonneborn_berger = {}
+        self.progressive = {}
+        self._history = {}  # uid -> {round_index: [opponent uid, result]}
+        self._num_rounds = 0
+
+        for player_id in players_id:
+            self.add_player(player_id)
+
+    # === PUBLIC METHODS ===
+
+    def add_player(self, player_id):
+        """Register a new player with null totals.
+
+        Parameters
+        ----------
+        player_id : str
+            the uid of the player
+        """
+
+        if player_id in self.scores:
+            return
+
+        self.scores[player_id] = 0
+        self.buchholz[player_id] = 0
+        self.sonneborn_berger[player_id] = 0
+        self.progressive[player_id] = 0
+        self._history[player_id] = {}
+
+    def start_round(self, round_index, pairs):
+        """Register the pairs of a new round.
+
+        Parameters
+        ----------
+        round_index : int
+            the index of the new round
+        pairs : list(tuple(str, str))
+            the uid of the players of each game
+        """
+
+        # each previous result counts once more in the progressive score
+        for player_id, score in self.scores.items():
+            self.progressive[player_id] += score
+        self._num_rounds = round_index + 1
+
+        for player1, player2 in pairs:
+            self._history[player1][round_index] = [player2, 0]
+            self._history[player2][round_index] = [player1, 0]
+            self.buchholz[player1] += self.scores[player2]
+            self.buchholz[player2] += self.scores[player1]
+
+    def set_result(self, round_index, player1_id, player2_id, score1, score2):
+        """Set (or correct) the result of a game of the given round.
+
+        Parameters
+        ----------
+        round_index : int
+            the index of the round of the game
+        player1_id : str
+            the uid of the first player
+        player2_id : str
+            the uid of the second player
+        score1 : float
+            the new score of the first player
+        score2 : float
+            the new score of the second player
+
+        Returns
+        -------
+        The set of the uid of the players whose totals changed
+        """
+
+        game1 = self._history[player1_id][round_index]
+        game2 = self._history[player2_id][round_index]
+        delta1 = score1 - game1[1]
+        delta2 = score2 - game2[1]
+
+        # the new results are weighted by the current scores of the opponents
+        self.sonneborn_berger[player1_id] += delta1 * self.scores[player2_id]
+        self.sonneborn_berger[player2_id] += delta2 * self.scores[player1_id]
+        game1[1] = score1
+        game2[1] = score2
+
+        changed = {player1_id, player2_id}
+        changed.update(self._add_score(player1_id, delta1, round_index))
+        changed.update(self._add_score(player2_id, delta2, round_index))
+
+        return changed
+
+    def get(self, player_id):
+        """Return the score and tiebreaks of the given player (in ranking order).
+
+        Parameters
+        ----------
+        player_id : str
+            the uid of the player
+        """
+
+        return (
+            self.scores[player_id],
+            self.buchholz[player_id],
+            self.sonneborn_berger[player_id],
+            self.progressive[player_id],
+        )
+
+    # === PRIVATE METHODS ===
+
+    def _add_score(self, player_id, delta, round_index):
+        """Add the given delta to the player's score (scored in the given round) and update the totals.
+
+        Returns the uid of the opponents whose totals changed.
+        """
+
+        if delta == 0:
+            return ()
+
+        self.scores[player_id] += delta
+        self.progressive[player_id] += delta * (self._num_rounds - round_index)
+
+        history = self._history
+        for r, (opponent_id, result) in history[player_id].items():
+            self.buchholz[opponent_id] += delta
+            self.sonneborn_berger[opponent_id] += history[opponent_id][r][1] * delta
+
+        return [x[0] for x in history[player_id].values()]
+
+    # === STATIC & CLASS METHODS ===
+
+    @classmethod
+    def from_rounds(cls, players_id, rounds):
+        """Build the totals from the games of the given rounds (one pass).
+
+        Parameters
+        ----------
+        players_id : list(str)
+            the uid of the participants
+        rounds : list(Round)
+            the rounds of the tournament
+        """
+
+        tiebreaks = cls(players_id)
+        for round_index, r in enumerate(rounds):
+            tiebreaks.start_round(round_index, [(x[0][0], x[1][0]) for x in r.games])
+            for (player1, score1), (player2, score2) in r.games:
+                tiebreaks.set_result(round_index, player1, player2, score1, score2)
+
+        return tiebreaks
@@ -0,0 +1,264 @@
+#! /usr/bin/env python3
+# coding: utf-8
+
+""" This module handles what is shared by the storage backends """
+
+from model.journal import Journal
+from model.world import World
+
+
+class StorageIO:
+    """This class provides the methods shared by the storage backends.
+
+    The backends (TinyDbIO, TinyShardsIO, SqliteIO) implement the file specific methods:
+    open_file(), close_file(), save_all(), write_changes(docs),
+    load_tournaments(), load_players(), write_journal_seq(seq), load_journal_seq()
+    and _serialize_changes(tournaments, actors).
+
+    The data file also stores the sequence number of the last journal record
+    it contains, so the journal records written before a save are never replayed
+    twice (when the app stops before the journal is truncated).
+
+    Attributes
+    ----------
+    path : str
+        The path of the data file
+    journal_path : str
+        The path of the journal file written alongside the data file
+
+    Class Methods
+    -------------
+    save_changes()
+        Save only the tournaments and players modified since the last save or load
+    snapshot_changes()
+        Serialize the tournaments and players modified since the last save or load
+    write_snapshot(snapshot)
+        Write a snapshot returned by snapshot_changes() (can be called from another thread)
+    restore_snapshot(snapshot)
+        Flag the content of a snapshot that couldn't be written as modified again
+    load_all()
+        Return the tournaments and players dictionaries from the file
+    open_journal()
+        Start recording the World mutations in the journal
+    close_journal(discard=False)
+        Stop recording the World mutations (and optionally drop the records)
+    load_journal()
+        Return the records of the journal (mutations not saved yet)
+
+    Private Methods
+    ---------------
+    _journal_seq()
+        Return the sequence number of the last journal record (or None without journal)
+    _collect_changes()
+        Return the tournaments and actors modified since the last save or load
+    _mark_clean(tournaments, actors)
+        Flag the provided tournaments and actors as saved
+    _truncate_journal(offset=None)
+        Drop the journal records once they are part of the saved snapshot
+    """
+
+    path = None
+    journal_path = None
+
+    # === Save ===
+
+    @classmethod
+    def save_changes(cls):
+        """ Save only the tournaments and players modified since the last save or load. """
+
+        snapshot = cls.snapshot_changes()
+        try:
+            cls.write_snapshot(snapshot)
+        except Exception:
+            cls.restore_snapshot(snapshot)
+            raise
+
+        cls._truncate_journal()
+
+    @classmethod
+    def snapshot_changes(cls):
+        """Serialize the tournaments and players modified since the last save or load.
+
+        They are flagged as saved right away, so the returned snapshot can be
+        written later while the app keeps modifying them.
+
+        Returns
+        -------
+        A dictionary with the modified 'tournaments' and 'actors' instances,
+        the backend specific serialized 'docs' (with the 'journal_seq' of the
+        last record they contain) and the 'journal_offset' (size of the journal
+        once the snapshot was taken)
+        """
+
+        tournaments, actors = cls._collect_changes()
+        snapshot = {
+            "tournaments": tournaments,
+            "actors": actors,
+            "docs": cls._serialize_changes(tournaments, actors),
+            "journal_offset": World.journal.size() if World.journal is not None else 0,
+        }
+        snapshot["docs"]["journal_seq"] = cls._journal_seq()
+        cls._mark_clean(tournaments, actors)
+
+        return snapshot
+
+    @classmethod
+    def write_snapshot(cls, snapshot):
+        """Write a snapshot returned by snapshot_changes().
+
+        Only the serialized docs are used, so it can be called from another thread.
+
+        Parameters
+        ----------
+        snapshot : dict
+            The snapshot to write
+        """
+
+        cls.write_changes(snapshot["docs"])
+
+    @classmethod
+    def restore_snapshot(cls, snapshot):
+        """Flag the content of a snapshot that couldn't be written as modified again.
+
+        Parameters
+        ----------
+        snapshot : dict
+            The snapshot that couldn't be written
+        """
+
+        for tournament in snapshot["tournaments"]:
+            tournament.mark_dirty()
+        for actor in snapshot["actors"]:
+            actor.dirty = True
+
+    # === Load ===
+
+    @classmethod
+    def load_all(cls):
+        """ Return the tournaments and players dictionaries from the file. """
+
+        cls.open_file()
+
+        tournaments = cls.load_tournaments()
+        players = cls.load_players()
+
+        cls.close_file()
+
+        return tournaments, players
+
+    # === Journal ===
+
+    @classmethod
+    def open_journal(cls):
+        """Start recording the World mutations in the journal.
+
+        The journal is folded into the data file (save_changes) once it gets too big.
+        """
+
+        if World.journal is None:
+            World.journal = Journal(
+                cls.journal_path, compact=cls.save_changes, seq=cls.load_journal_seq()
+            )
+
+    @classmethod
+    def close_journal(cls, discard=False):
+        """Stop recording the World mutations.
+
+        Parameters
+        ----------
+        discard : bool(False)
+            Drop the records (the unsaved mutations won't be replayed)
+        """
+
+        if World.journal is None:
+            return
+
+        if discard:
+            World.journal.truncate()
+        World.journal.close()
+        World.journal = None
+
+    @classmethod
+    def load_journal(cls):
+        """Return the records of the journal (mutations not saved yet).
+
+        The records already part of the data file are skipped
+        (the records of older journals have no sequence number and are all kept).
+        """
+
+        saved = cls.load_journal_seq()
+
+        return [
+            x for x in Journal.read_file(cls.journal_path) if x.get("seq", saved + 1) > saved
+        ]
+
+    # === Private ===
+
+    @classmethod
+    def _journal_seq(cls):
+        """ Return the sequence number of the last journal record (or None without journal). """
+
+        if World.journal is None:
+            return None
+        return World.journal.seq
+
+    @classmethod
+    def _collect_changes(cls):
+        """ Return the tournaments and actors modified since the last save or load. """
+
+        tournaments = [x for x in World.tournaments if x.is_dirty()]
+        actors = [x for x in World.get_all_actors() if x.dirty]
+
+        return tournaments, actors
+
+    @classmethod
+    def _mark_clean(cls, tournaments, actors):
+        """ Flag the provided tournaments and actors as saved. """
+
+        for tournament in tournaments:
+            tournament.mark_clean()
+        for actor in actors:
+            actor.dirty = False
+
+    @classmethod
+    def _truncate_journal(cls, offset=None):
+        """Drop the journal records once they are part of the saved snapshot.
+
+        Parameters
+        ----------
+        offset : int(None)
+            Only drop the records written before this size (see snapshot_changes)
+        """
+
+        if World.journal is not None:
+            World.journal.truncate(offset)
+
+
+def get_backend(name):
+    """Return the storage backend class matching the given name.
+
+    The backends are imported on demand, so TinyDB isn't required to use SQLite.
+
+    Parameters
+    ----------
+    name : str
+        Either 'tinydb', 'shards' (one TinyDB file per tournament) or 'sqlite'
+    """
+
+    if name == "tinydb":
+        from model.tiny import TinyDbIO
+
+        return TinyDbIO
+    elif name == "shards":
+        from model.tiny import TinyShardsIO
+
+        return TinyShardsIO
+    elif name == "sqlite":
+        from model.sqlite import SqliteIO
+
+        return SqliteIO
+
+    raise ValueError(f"Unknown storage backend '{name}'")
+
+
+BACKENDS = ("tinydb", "shards", "sqlite")
@@ -3,42 +3,85 @@
 
 """ The purpose of this module is to handle the TinyDB IO """
 
-import json
 import logging
+import os
+import uuid
 
-from tinydb import TinyDB
+from tinydb import TinyDB, Query
+from tinydb.middlewares import CachingMiddleware
+from tinydb.storages import JSONStorage
 
+from model.storage import StorageIO
+from model.tournament import Status
 from model.world import World
 
 
-class TinyDbIO:
+class TinyDbIO(StorageIO):
     """This class provide various methods to save & load the app data.
 
+    The journal, save_changes() and load_all() methods are inherited from StorageIO.
+
+    Attributes
+    ----------
+    path : str
+        The path of the TinyDB file
+    journal_path : str
+        The path of the journal file written alongside the TinyDB file
+
     Class Methods
     -------------
-    open_file()
+    open_file(cached=False)
         Open / Reload the tournament.json file
+    close_file()
+        Flush the pending writes and close the tournament.json file
     save_all()
         Save the tournaments and players' data from the World instance
+    write_changes(docs)
+        Write the serialized tournaments and players returned by _serialize_changes()
     write_tournaments(, serialized_data)
         Write the provided serialized data in the tournaments_table
     write_players(, serialized_players)
         Write the provided serialized data in the players_table
-    load_all()
-        Return the tournaments and players dictionaries from the file
+    upsert_tournaments(serialized_data)
+        Update or insert the provided serialized tournaments using their uid
+    upsert_players(serialized_players)
+        Update or insert the provided serialized players using their uid
     load_tournaments()
         Return the serialized content of the tournaments_table
     load_players()
         Return the serialized content of the players_table
+    write_journal_seq(seq)
+        Write the sequence number of the last journal record saved in the file
+    load_journal_seq()
+        Return the sequence number of the last journal record saved in the file
     """
 
+    path = "tournament.json"
+    journal_path = "tournament.journal"
+
     @classmethod
-    def open_file(cls):
-        """ Open / Reload the tournament.json file. """
+    def open_file(cls, cached=False):
+        """Open / Reload the tournament.json file.
+
+        Parameters
+        ----------
+        cached : bool(False)
+            Keep the writes in memory until close_file() is called
+        """
 
-        cls.db = TinyDB("tournament.json")
+        if cached:
+            cls.db = TinyDB(cls.path, storage=CachingMiddleware(JSONStorage))
+        else:
+            cls.db = TinyDB(cls.path)
         cls.tournaments_table = cls.db.table("tournaments")
         cls.players_table = cls.db.table("players")
+        cls.meta_table = cls.db.table("meta")
+
+    @classmethod
+    def close_file(cls):
+        """ Flush the pending writes and close the tournament.json file. """
+
+        cls.db.close()
 
     @classmethod
     def save_all(cls):
@@ -50,13 +93,39 @@ class TinyDbIO:
         d_players = []
 
         for i, _tournament in enumerate(World.tournaments):
-            d_tournaments.append(json.loads(json.dumps(_tournament.serialize())))
+            d_tournaments.append(_tournament.serialize())
 
         for i, _actor in enumerate(World.get_all_actors()):
-            d_players.append(json.loads(json.dumps(_actor.serialize())))
+            d_players.append(_actor.serialize())
 
         cls.write_tournaments(d_tournaments)
         cls.write_players(d_players)
+        cls.write_journal_seq(cls._journal_seq())
+        cls.close_file()
+
+        cls._mark_clean(World.tournaments, World.get_all_actors())
+        cls._truncate_journal()
+
+    @classmethod
+    def write_changes(cls, docs):
+        """Write the serialized tournaments and players returned by _serialize_changes().
+
+        The tournaments saved before they had an uid are given one first
+        (they are kept, even if they were never loaded).
+
+        Parameters
+        ----------
+        docs : dict
+            The serialized 'tournaments' and 'players' to update or insert
+            (and the 'journal_seq' of the last journal record they contain)
+        """
+
+        cls.open_file(cached=True)
+        cls._assign_uids(cls.tournaments_table)
+        cls.upsert_tournaments(docs["tournaments"])
+        cls.upsert_players(docs["players"])
+        cls.write_journal_seq(docs.get("journal_seq"))
+        cls.close_file()
 
     # === Save ===
 
@@ -78,23 +147,49 @@ class TinyDbIO:
         cls.players_table.truncate()  # clear the table
         cls.players_table.insert_multiple(serialized_players)
 
-    # === Load ===
+    @classmethod
+    def upsert_tournaments(cls, serialized_data):
+        """ Update or insert the provided serialized tournaments using their uid. """
+
+        logging.debug(f"UPSERT_TOURNAMENTS: {len(serialized_data)}")
+
+        cls._upsert(cls.tournaments_table, serialized_data)
 
     @classmethod
-    def load_all(cls):
-        """ Return the tournaments and players dictionaries from the file. """
+    def upsert_players(cls, serialized_players):
+        """ Update or insert the provided serialized players using their uid. """
 
-        cls.open_file()
+        logging.debug(f"UPSERT_PLAYERS: {len(serialized_players)}")
+
+        cls._upsert(cls.players_table, serialized_players)
+
+    @classmethod
+    def write_journal_seq(cls, seq):
+        """Write the sequence number of the last journal record saved in the file.
+
+        Parameters
+        ----------
+        seq : int
+            The sequence number (nothing is written if None)
+        """
 
-        tournaments = cls.load_tournaments()
-        players = cls.load_players()
+        if seq is None:
+            return
 
-        return tournaments, players
+        cls.meta_table.truncate()
+        cls.meta_table.insert({"journal_seq": seq})
+
+    # === Load ===
 
     @classmethod
     def load_tournaments(cls):
-        """ Return the serialized content of the tournaments_table. """
+        """Return the serialized content of the tournaments_table.
 
+        The tournaments saved before they had an uid are given one first,
+        so they are updated (not duplicated) when they are saved again.
+        """
+
+        cls._assign_uids(cls.tournaments_table)
         return cls.tournaments_table.all()
 
     @classmethod
@@ -102,3 +197,298 @@ class TinyDbIO:
         """ Return the serialized content of the players_table. """
 
         return cls.players_table.all()
+
+    @classmethod
+    def load_journal_seq(cls):
+        """ Return the sequence number of the last journal record saved in the file. """
+
+        if not os.path.exists(cls.path):
+            return 0
+
+        cls.open_file()
+        rows = cls.meta_table.all()
+        cls.close_file()
+
+        return rows[0]["journal_seq"] if rows else 0
+
+    # === Private ===
+
+    @classmethod
+    def _serialize_changes(cls, tournaments, actors):
+        """ Return the serialized tournaments and players to write with write_changes(). """
+
+        return {
+            "tournaments": [x.serialize() for x in tournaments],
+            "players": [x.serialize() for x in actors],
+        }
+
+    @classmethod
+    def _assign_uids(cls, table):
+        """Give an uid to the documents of the given table saved without one.
+
+        Parameters
+        ----------
+        table : tinydb.table.Table
+            The table to update
+        """
+
+        for doc in table.search(~Query().uid.exists()):
+            table.update({"uid": uuid.uuid1().hex}, doc_ids=[doc.doc_id])
+
+    @classmethod
+    def _upsert(cls, table, serialized_data):
+        """Update or insert the provided documents using their uid.
+
+        Parameters
+        ----------
+        table : tinydb.table.Table
+            The table to update
+        serialized_data : list(dict)
+            The serialized documents (they must all have an uid key)
+        """
+
+        if len(serialized_data) == 0:
+            return
+
+        doc_ids = {doc.get("uid"): doc.doc_id for doc in table.all()}
+
+        new_docs = []
+        for doc in serialized_data:
+            doc_id = doc_ids.get(doc["uid"])
+            if doc_id is None:
+                new_docs.append(doc)
+            else:
+                table.update(doc, doc_ids=[doc_id])
+
+        table.insert_multiple(new_docs)
+
+
+class TinyShardsIO(TinyDbIO):
+    """This class saves & loads the app data in one TinyDB file per tournament.
+
+    The index file stores the players and the tournaments without their rounds
+    (so the tournaments catalog can be loaded alone), and the rounds of each
+    tournament are stored in their own shard file, read when the tournament is
+    opened and written only when one of its rounds changed.
+    The shards of the closed tournaments are no longer rewritten once their last
+    rounds are saved.
+
+    Attributes
+    ----------
+    path : str
+        The path of the index file (the shards are stored in the same folder)
+    journal_path : str
+        The path of the journal file written alongside the index file
+
+    Class Methods
+    -------------
+    open_file(cached=False)
+        Open / Reload the index file (and create the folder if needed)
+    save_all()
+        Save the tournaments and players' data from the World instance
+    write_changes(docs)
+        Write the serialized tournaments, rounds and players returned by _serialize_changes()
+    serialize_shard(tournament)
+        Return the serialized rounds of the given tournament for its shard file
+    write_shard(uid, rounds)
+        Write the serialized rounds of a tournament in its shard file
+    load_tournaments()
+        Return the serialized tournaments (their rounds are read on demand)
+    load_shard(uid)
+        Return the serialized rounds stored in the shard file of the given tournament
+    """
+
+    path = os.path.join("tournaments", "index.json")
+    journal_path = os.path.join("tournaments", "index.journal")
+
+    @classmethod
+    def open_file(cls, cached=False):
+        """Open / Reload the index file (and create the folder if needed).
+
+        Parameters
+        ----------
+        cached : bool(False)
+            Keep the writes in memory until close_file() is called
+        """
+
+        os.makedirs(os.path.dirname(cls.path) or ".", exist_ok=True)
+        super().open_file(cached)
+
+    @classmethod
+    def save_all(cls):
+        """ Save the tournaments and players' data from the World instance. """
+
+        # the shards are written first, the index file then records the journal seq
+        for tournament in World.tournaments:
+            rounds = cls.serialize_shard(tournament)
+            if rounds is not None:
+                cls.write_shard(tournament.uid, rounds)
+
+        cls.open_file(cached=True)
+        cls.write_tournaments([cls._serialize_header(x) for x in World.tournaments])
+        cls.write_players([x.serialize() for x in World.get_all_actors()])
+        cls.write_journal_seq(cls._journal_seq())
+        cls.close_file()
+
+        cls._mark_clean(World.tournaments, World.get_all_actors())
+        cls._truncate_journal()
+
+    @classmethod
+    def write_changes(cls, docs):
+        """Write the serialized tournaments, rounds and players returned by _serialize_changes().
+
+        Parameters
+        ----------
+        docs : dict
+            The serialized 'tournaments' headers and 'players' to update or insert,
+            the serialized rounds of the 'shards' to rewrite (by tournament uid)
+            and the 'journal_seq' of the last journal record they contain
+        """
+
+        # the shards are written first, the index file then records the journal seq
+        for uid, rounds in docs["shards"].items():
+            cls.write_shard(uid, rounds)
+
+        cls.open_file(cached=True)
+        cls.upsert_tournaments(docs["tournaments"])
+        cls.upsert_players(docs["players"])
+        cls.write_journal_seq(docs.get("journal_seq"))
+        cls.close_file()
+
+    @classmethod
+    def serialize_shard(cls, tournament):
+        """Return the serialized rounds of the given tournament for its shard file.
+
+        Returns None for the closed tournaments already saved with their last rounds
+        (never rewritten).
+
+        Parameters
+        ----------
+        tournament : Tournament
+            The tournament instance to serialize
+        """
+
+        if (
+            tournament.status == Status.CLOSED
+            and not tournament.has_dirty_rounds()
+            and os.path.exists(cls._shard_path(tournament.uid))
+        ):
+            return None
+
+        return tournament.serialize()["rounds"]
+
+    @classmethod
+    def write_shard(cls, uid, rounds):
+        """Write the serialized rounds of a tournament in its shard file.
+
+        Parameters
+        ----------
+        uid : str
+            The uid of the tournament
+        rounds : list(dict)
+            The serialized rounds (see serialize_shard)
+        """
+
+        path = cls._shard_path(uid)
+        logging.debug(f"WRITE_SHARD: {path}")
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        db = TinyDB(path, storage=CachingMiddleware(JSONStorage))
+        table = db.table("rounds")
+        table.truncate()
+        table.insert_multiple(rounds)
+        db.close()
+
+    @classmethod
+    def load_tournaments(cls):
+        """ Return the serialized tournaments (their rounds are read on demand). """
+
+        tournaments = []
+        for doc in cls.tournaments_table.all():
+            data = dict(doc)
+            num_played_rounds = data.pop("num_played_rounds")
+            data["rounds"] = ShardRounds(data["uid"], num_played_rounds, cls.load_shard)
+            tournaments.append(data)
+
+        return tournaments
+
+    @classmethod
+    def load_shard(cls, uid):
+        """Return the serialized rounds stored in the shard file of the given tournament.
+
+        Parameters
+        ----------
+        uid : str
+            The uid of the tournament
+        """
+
+        path = cls._shard_path(uid)
+        if not os.path.exists(path):
+            return []
+
+        db = TinyDB(path)
+        rounds = [dict(x) for x in db.table("rounds").all()]
+        db.close()
+
+        return rounds
+
+    # === Private ===
+
+    @classmethod
+    def _shard_path(cls, uid):
+        """ Return the path of the shard file of the given tournament uid. """
+
+        return os.path.join(os.path.dirname(cls.path), f"{uid}.json")
+
+    @classmethod
+    def _serialize_changes(cls, tournaments, actors):
+        """ Return the serialized headers, shards and players to write with write_changes(). """
+
+        shards = {}
+        for tournament in tournaments:
+            if tournament.has_dirty_rounds():
+                rounds = cls.serialize_shard(tournament)
+                if rounds is not None:
+                    shards[tournament.uid] = rounds
+
+        return {
+            "tournaments": [cls._serialize_header(x) for x in tournaments],
+            "players": [x.serialize() for x in actors],
+            "shards": shards,
+        }
+
+    @classmethod
+    def _serialize_header(cls, tournament):
+        """ Return the serialized tournament without its rounds (but with their number). """
+
+        data = tournament.serialize(rounds=False)
+        data["num_played_rounds"] = tournament.num_played_rounds()
+        return data
+
+
+class ShardRounds:
+    """This class stands for the serialized rounds of a tournament until they are needed.
+
+    It gives the number of rounds without reading the shard file,
+    and reads it once the rounds are iterated (see Tournament._hydrate).
+
+    Attributes
+    ----------
+    uid : str
+        The uid of the tournament
+    length : int
+        The number of rounds stored in the shard file
+    loader : function
+        The function used to read the shard file (TinyShardsIO.load_shard)
+    """
+
+    def __init__(self, uid, length, loader):
+        self.uid = uid
+        self.length = length
+        self.loader = loader
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        return iter(self.loader(self.uid))
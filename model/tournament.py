@@ -3,13 +3,15 @@
 
 """ This module handles the tournaments """
 
+import bisect
 import datetime
 from enum import Enum
-from operator import attrgetter
 import json
-import logging
+import uuid
 
+from model.player import Player
 from model.round import Round
+from model.standings import Tiebreaks
 
 
 class Status(Enum):
@@ -39,6 +41,7 @@ class Tournament:
         The number of rounds in the tournament (defaut is 4)
     rounds : list(Round)
         The registered round instances of the tournament
+        (built from the loaded data the first time they are needed)
     players : list(int)
         The registered player instances id of the tournament
     game_type : str
@@ -47,8 +50,14 @@ class Tournament:
         The tournament director's notes
     status : Status
         The current tournament status
+    pairing : str
+        The name of the pairing engine used to generate the games (see model.pairing)
     world : Wold
         The world instance where the original players instances can be found
+    uid : str
+        A unique universal identifier used as a stable storage key
+    dirty : bool
+        True when the instance changed since it was last saved or loaded
 
     Getters & Setters
     -----------------
@@ -56,26 +65,82 @@ class Tournament:
         Return num_rounds as int for comparisons
     num_rounds(v)
         Set num_rounds to int (because Curses return str from input fields)
+    rounds()
+        Return the Round instances (hydrated from the loaded data on first access)
+    rounds(v)
+        Set the Round instances
 
     Public Methods
     --------------
     start_round()
         Start a new round
+    add_round(new_round)
+        Register a started round and update the indexes
     set_results(game_index, score1, score2)
         Set the given results in the appropriate game and players instances
 
     add_player(player_id)
         Register the given player_id as a participant of the tournament
+    get_score(player_id)
+        Return the score of the given player in this tournament
+    score_brackets()
+        Return the participants grouped by score in this tournament
+    has_played(player1_id, player2_id)
+        Check if the two given players already met in this tournament
+    get_tiebreaks(player_id)
+        Return the score and tiebreaks of the given player in this tournament
+    standings()
+        Return the participants ranked by score then tiebreaks
+    update_infos(data)
+        Update the tournament informations with the provided serialized ones
+    set_status(status)
+        Change the status of the tournament (recorded in the journal)
 
     current_round()
         Return the current round instance
-    serialize()
+    num_played_rounds()
+        Return the number of started rounds without hydrating them
+    is_hydrated()
+        Check if the Round instances are built
+    catalog()
+        Return the lightweight informations used to list the tournaments
+    one_line()
+        Return a presentation of the tournament in one line (catalog based)
+    is_dirty()
+        Check if the tournament or one of its rounds changed since the last save
+    has_dirty_rounds()
+        Check if one of the rounds changed since the last save
+    mark_clean()
+        Flag the tournament and its rounds as saved
+    mark_dirty()
+        Flag the tournament and its rounds as modified
+    serialize(rounds=True)
         Serialize the content of this class for TinyDB exports
 
     Private Methods
     ---------------
+    _gen_UID()
+        Generate a unique universal identifier
     _reload_data()
-        Reshape exported ENUMS and exorted list of objects when the class is feed with JSON data
+        Reshape exported ENUMS when the class is feed with JSON data
+    _hydrate()
+        Build the Round instances from the loaded data
+    _build_score_index()
+        Build the scores and score brackets of the players from the games of the rounds
+    _update_score(player_id, value)
+        Add the given value to the player's score and move him to his new bracket
+    _build_tiebreaks()
+        Build the running tiebreaks of the players from the games of the rounds
+    _build_standings()
+        Sort the standing keys of the players
+    _standing_key(player_id)
+        Return the key ranking the given player in the standings
+    _reposition(players_id)
+        Move the given players to their new place in the standings
+    _build_opponent_matrix()
+        Build the opponent matrix of the players from the games of the rounds
+    _set_opponents(player1_id, player2_id)
+        Flag the two given players as opponents in the opponent matrix
     _has_right_players_num()
         Check if the tournament has the right number of players to start the tournament
 
@@ -93,6 +158,8 @@ class Tournament:
     select_tournament_load(world)
         Return tuples containing the available tournaments
         and the appropriate controller methods to call in order to 'open' them
+    list_tournaments(world)
+        Return tuples presenting the available tournaments (without loading their rounds)
     select_tournament_report(world, route)
         Return tuples containing the available tournaments
         and the appropriate controller methods to call to get the right report
@@ -116,11 +183,16 @@ class Tournament:
         "unstarted": "Pas commencé",
         "format_date": "[Jour/Mois/Année]",
         "format_gtype": "[Bullet, Blitz, Coup rapide]",
+        "pairing": "Appariement",
+        "format_pairing": "[Greedy, Blossom, Dutch, Backtrack]",
         "final_note": "[remarques générales du directeur du tournoi]",
         "input_score1": "Utilisez < ou > pour indiquer le gagnant",
         "input_score2": "         = en cas d'égalité",
         "games": "Matchs de ce round",
         "classement": "Classement",
+        "buchholz": "BH",
+        "sonneborn_berger": "SB",
+        "progressive": "PR",
     }
 
     def __init__(
@@ -136,22 +208,46 @@ class Tournament:
         rounds=None,
         players=None,
         status=Status.UNINITIALIZED,
+        pairing="greedy",
+        uid=None,
     ):
         self.name = name
         self.place = place
         self.start_date = start_date
         self.end_date = end_date
         self.num_rounds = num_rounds
-        self.rounds = rounds if rounds is not None else []
+        self.rounds = [] if rounds is None or len(rounds) == 0 else None
+        self._rounds_data = rounds
+        self._scores = None  # score index, built when the rounds are paired
         self.players = players if players is not None else []
+        self._seats = {x: i for i, x in enumerate(self.players)}  # uid -> seat number
+        self._opponents = None  # opponent matrix, built when the rounds are paired
+        self._tiebreaks = None  # running tiebreaks, built when the standings are needed
+        self._standings = None  # sorted standing keys (see _standing_key)
         self.game_type = game_type
         self.description = description
         self.status = status
+        self.pairing = pairing
         self._world = world
+        self.uid = uid if uid is not None else self._gen_UID()
 
         if self.status != Status.UNINITIALIZED:
             self._reload_data()
 
+    def __setattr__(self, name, value):
+        """Flag the instance as modified whenever one of its attributes is set.
+
+        The World version is only incremented by the public attributes
+        (not by the private caches built when the tournament is displayed).
+        """
+
+        if name != "dirty":
+            super().__setattr__("dirty", True)
+            world = self.__dict__.get("_world")
+            if world is not None and not name.startswith("_"):
+                world.version += 1
+        super().__setattr__(name, value)
+
     # --- GETTERS & SETTERS ---
 
     @property
@@ -162,6 +258,16 @@ class Tournament:
     def num_rounds(self, v):
         self._num_rounds = int(v)
 
+    @property
+    def rounds(self):
+        if self._rounds is None:
+            self._hydrate()
+        return self._rounds
+
+    @rounds.setter
+    def rounds(self, v):
+        self._rounds = v
+
     # === PUBLIC METHODS ===
 
     def start_round(self):
@@ -195,14 +301,47 @@ class Tournament:
             self.current_round().close()
 
         if len(self.rounds) >= self._num_rounds:
-            self.status = Status.CLOSING
+            self.set_status(Status.CLOSING)
             raise IsComplete()
 
+        previous_round = self.current_round()
         round_index = len(self.rounds)
         new_round = Round(
-            self._world, f"Round {round_index+1}", round_index, self.players
+            self._world,
+            f"Round {round_index+1}",
+            round_index,
+            self.players,
+            pairing=self.pairing,
+            brackets=self.score_brackets(),
+            has_played=lambda player1, player2: self.has_played(player1.uid, player2.uid),
+        )
+        self.add_round(new_round)
+
+        self._world.record(
+            "round",
+            t=self.uid,
+            data=new_round.serialize(),
+            closed=previous_round.close_time if previous_round is not None else None,
         )
+
+    def add_round(self, new_round):
+        """Register a started round and update the indexes (when pairing or replaying it).
+
+        Parameters
+        ----------
+        new_round : Round
+            the round instance to register
+        """
+
         self.rounds.append(new_round)
+        self.dirty = True
+
+        pairs = [(x[0][0], x[1][0]) for x in new_round.games]
+        for player1, player2 in pairs:
+            self._set_opponents(player1, player2)
+        if self._tiebreaks is not None:
+            self._tiebreaks.start_round(len(self.rounds) - 1, pairs)
+        self._standings = None  # every progressive score changed
 
     def set_results(self, game_index, score1, score2):
         """Set the game result to the appropriate game and players instances.
@@ -220,9 +359,19 @@ class Tournament:
         if score1 + score2 != 1:
             raise ValueError("La somme des deux scores doit être de 1")
 
-        game = self.current_round().games[game_index]  # persistent order
+        current_round = self.current_round()
+        game = current_round.games[game_index]  # persistent order
+        if self._tiebreaks is not None:
+            changed = self._tiebreaks.set_result(
+                len(self.rounds) - 1, game[0][0], game[1][0], score1, score2
+            )
+            if self._standings is not None:
+                self._reposition(changed)
+        self._update_score(game[0][0], score1 - game[0][1])
+        self._update_score(game[1][0], score2 - game[1][1])
         game[0][1] = score1
         game[1][1] = score2
+        current_round.dirty = True
 
         player1 = self._world.get_actor(game[0][0])
         player1.add_to_score(score1)
@@ -232,6 +381,8 @@ class Tournament:
         player2.add_to_score(score2)
         player2.set_played(game[0][0])
 
+        self._world.record("result", t=self.uid, g=game_index, s=[score1, score2])
+
     # --- players ---
 
     def add_player(self, player_id):
@@ -247,6 +398,135 @@ class Tournament:
             raise TypeError("str UID required")
 
         self.players.append(player_id)
+        self.dirty = True
+        self._update_score(player_id, 0)
+        if self._tiebreaks is not None:
+            self._tiebreaks.add_player(player_id)
+        self._standings = None
+
+        if player_id not in self._seats:
+            self._seats[player_id] = len(self._seats)
+            if self._opponents is not None and len(self._seats) > self._capacity:
+                self._opponents = None  # rebuilt with more seats when needed
+
+    def get_score(self, player_id):
+        """Return the score of the given player in this tournament.
+
+        Parameters
+        ----------
+        player_id : str
+            the uid of the player
+        """
+
+        if self._scores is None:
+            self._build_score_index()
+
+        return self._scores[player_id]
+
+    def score_brackets(self):
+        """Return the participants grouped by score in this tournament.
+
+        Returns
+        -------
+        A list of (score, players) tuples, the best score first,
+        and the players of each bracket sorted by rating
+        """
+
+        if self._scores is None:
+            self._build_score_index()
+
+        seqsort = Player.get_sort_key("score")[1:]  # the score is the same in a bracket
+        return [
+            (score, Player.multisort([self._world.get_actor(x) for x in uids], seqsort))
+            for score, uids in sorted(self._brackets.items(), reverse=True)
+            if len(uids) > 0
+        ]
+
+    def has_played(self, player1_id, player2_id):
+        """Check if the two given players already met in this tournament.
+
+        Parameters
+        ----------
+        player1_id : str
+            the uid of the first player
+        player2_id : str
+            the uid of the second player
+        """
+
+        if self._opponents is None:
+            self._build_opponent_matrix()
+
+        bit = self._seats[player1_id] * self._capacity + self._seats[player2_id]
+        return self._opponents[bit >> 3] & (1 << (bit & 7)) != 0
+
+    def get_tiebreaks(self, player_id):
+        """Return the score and tiebreaks of the given player in this tournament.
+
+        Parameters
+        ----------
+        player_id : str
+            the uid of the player
+
+        Returns
+        -------
+        A (score, buchholz, sonneborn_berger, progressive) tuple
+        """
+
+        if self._tiebreaks is None:
+            self._build_tiebreaks()
+
+        return self._tiebreaks.get(player_id)
+
+    def standings(self):
+        """Return the participants ranked by score, then by Buchholz, Sonneborn-Berger,
+        progressive score and rating.
+
+        The standings are kept sorted when the results are set, so they are not sorted again.
+        """
+
+        if self._standings is None:
+            self._build_standings()
+
+        get_actor = self._world.get_actor
+        return [get_actor(key[-1]) for key in self._standings]
+
+    def update_infos(self, data):
+        """Update the tournament informations with the provided serialized ones.
+
+        The rounds and players are left untouched.
+
+        Parameters
+        ----------
+        data : dict
+            A serialized tournament (see serialize)
+        """
+
+        self.name = data["name"]
+        self.place = data["place"]
+        self.start_date = data["start_date"]
+        self.end_date = data["end_date"]
+        self.num_rounds = data["num_rounds"]
+        self.game_type = data["game_type"]
+        self.description = data["description"]
+        self.status = as_enum(data["status"])
+        self.pairing = data.get("pairing", "greedy")
+
+    def set_status(self, status):
+        """Change the status of the tournament (recorded in the journal).
+
+        Nothing is recorded if the tournament already has this status.
+
+        Parameters
+        ----------
+        status : Status
+            The new status of the tournament
+        """
+
+        if self.status == status:
+            return
+
+        self.status = status
+        self._world.record("status", t=self.uid, s={"__enum__": str(status)})
 
     # --- utils ---
 
@@ -258,36 +538,255 @@ class Tournament:
         else:
             return self.rounds[-1]
 
-    def serialize(self):
-        """ Serialize the content of the tournement instance for TinyDB exports. """
+    def num_played_rounds(self):
+        """ Return the number of started rounds without hydrating them. """
+
+        if self._rounds is None:
+            return len(self._rounds_data)
+        return len(self._rounds)
+
+    def is_hydrated(self):
+        """ Return True if the Round instances are built. """
+
+        return self._rounds is not None
+
+    def catalog(self):
+        """ Return the lightweight informations used to list the tournaments. """
+
+        return {
+            "uid": self.uid,
+            "name": self.name,
+            "place": self.place,
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+            "status": self.status,
+            "num_players": len(self.players),
+            "num_rounds": self.num_rounds,
+            "num_played_rounds": self.num_played_rounds(),
+        }
+
+    def one_line(self, ljustv=20):
+        """Return a presentation of the tournament in one line (catalog based).
+
+        Parameters
+        ----------
+        ljustv : int(20)
+            The minimum of space taken by the tournament name (ensure alignement)
+        """
+
+        infos = self.catalog()
+
+        return (
+            f"{infos['name'].ljust(ljustv)[:ljustv]} | "
+            + f"{infos['place'].ljust(ljustv)[:ljustv]} | "
+            + f"du {infos['start_date']} au {infos['end_date']} | "
+            + f"{infos['num_players']:3} joueurs | "
+            + f"{infos['num_played_rounds']}/{infos['num_rounds']} tours"
+        )
+
+    def is_dirty(self):
+        """ Return True if the tournament or one of its rounds changed since the last save. """
+
+        return self.dirty or self.has_dirty_rounds()
+
+    def has_dirty_rounds(self):
+        """ Return True if one of the rounds changed since the last save. """
+
+        return any(x.dirty for x in self._rounds or [])
+
+    def mark_clean(self):
+        """ Flag the tournament and its rounds as saved (or freshly loaded). """
+
+        for x in self._rounds or []:
+            x.dirty = False
+        self.dirty = False
+
+    def mark_dirty(self):
+        """ Flag the tournament and its rounds as modified (when a save failed). """
+
+        for x in self._rounds or []:
+            x.dirty = True
+        self.dirty = True
+
+    def serialize(self, rounds=True):
+        """Serialize the content of the tournement instance for TinyDB exports.
+
+        The returned structure is made of JSON native types only (the Status
+        is converted the same way EnumEncoder does), so it can be written as is.
+
+        Parameters
+        ----------
+        rounds : bool(True)
+            Should the serialized rounds be included ?
+        """
 
         data = {
-            # "id": self.uid,
+            "uid": self.uid,
             "name": self.name,
             "place": self.place,
             "start_date": self.start_date,
             "end_date": self.end_date,
             "num_rounds": self.num_rounds,
-            "rounds": [json.loads(json.dumps(x.serialize())) for x in self.rounds],
-            "players": self.players,
+            "players": list(self.players),
             "game_type": self.game_type,
             "description": self.description,
-            "status": self.status,
+            "status": {"__enum__": str(self.status)},
+            "pairing": self.pairing,
         }
 
-        return json.loads(json.dumps(data, cls=EnumEncoder))
+        if rounds:
+            if self._rounds is None:
+                data["rounds"] = list(self._rounds_data)
+            else:
+                data["rounds"] = [x.serialize() for x in self._rounds]
+
+        return data
 
     # === PRIVATE METHODS ===
 
+    def _gen_UID(self):
+        """ Generate a unique universal identifier. """
+
+        return uuid.uuid1().hex
+
     def _reload_data(self):
-        """ Reshape exported ENUMS and exorted list of objects when the class is feed with JSON data. """
+        """Reshape exported ENUMS when the class is feed with JSON data.
+
+        The Round instances are only built when needed (see _hydrate).
+        """
 
-        self.rounds = [
-            Round(self._world, **x, players_id=self.players) for x in self.rounds
-        ]
         name, member = self.status["__enum__"].split(".")
         self.status = getattr(PUBLIC_ENUMS[name], member)
 
+    def _hydrate(self):
+        """ Build the Round instances from the loaded data (leaving the dirty flags as is). """
+
+        dirty = self.dirty
+
+        rounds = [
+            Round(self._world, **x, players_id=self.players) for x in self._rounds_data
+        ]
+        for x in rounds:
+            x.dirty = False
+
+        self._rounds = rounds
+        self._rounds_data = None
+        self.dirty = dirty
+
+    def _build_score_index(self):
+        """ Build the scores and score brackets of the players from the games of the rounds. """
+
+        dirty = self.dirty
+
+        scores = {x: 0 for x in self.players}
+        for r in self.rounds:
+            for (player1, score1), (player2, score2) in r.games:
+                scores[player1] += score1
+                scores[player2] += score2
+
+        brackets = {}
+        for player_id in self.players:
+            brackets.setdefault(scores[player_id], []).append(player_id)
+
+        self._scores = scores
+        self._brackets = brackets
+        self.dirty = dirty
+
+    def _build_tiebreaks(self):
+        """ Build the running tiebreaks of the players from the games of the rounds. """
+
+        dirty = self.dirty
+        self._tiebreaks = Tiebreaks.from_rounds(self.players, self.rounds)
+        self.dirty = dirty
+
+    def _build_standings(self):
+        """ Sort the standing keys of the players (see _standing_key). """
+
+        if self._tiebreaks is None:
+            self._build_tiebreaks()
+
+        dirty = self.dirty
+        self._standing_keys = {x: self._standing_key(x) for x in self.players}
+        self._standings = sorted(self._standing_keys.values())
+        self.dirty = dirty
+
+    def _standing_key(self, player_id):
+        """Return the key ranking the given player in the standings (the best first).
+
+        It is made of the opposite of the score, tiebreaks and rating, then of the uid
+        (so every key is unique and can be found with bisect).
+        """
+
+        score, buchholz, sonneborn_berger, progressive = self._tiebreaks.get(player_id)
+        elo = self._world.get_actor(player_id).elo
+        return (-score, -buchholz, -sonneborn_berger, -progressive, -elo, player_id)
+
+    def _reposition(self, players_id):
+        """Move the given players to their new place in the standings.
+
+        Parameters
+        ----------
+        players_id : iterable(str)
+            the uid of the players whose score or tiebreaks changed
+        """
+
+        for player_id in players_id:
+            old = self._standing_keys[player_id]
+            del self._standings[bisect.bisect_left(self._standings, old)]
+            new = self._standing_key(player_id)
+            bisect.insort(self._standings, new)
+            self._standing_keys[player_id] = new
+
+    def _update_score(self, player_id, value):
+        """Add the given value to the player's score and move him to his new bracket.
+
+        Nothing is done until the score index is built (see _build_score_index).
+        """
+
+        if self._scores is None:
+            return
+
+        old = self._scores.get(player_id)
+        if old is not None:
+            if value == 0:
+                return
+            self._brackets[old].remove(player_id)
+
+        new = (old or 0) + value
+        self._scores[player_id] = new
+        self._brackets.setdefault(new, []).append(player_id)
+
+    def _build_opponent_matrix(self):
+        """Build the opponent matrix of the players from the games of the rounds.
+
+        The matrix is a bitset of capacity x capacity bits, where the bit
+        (seat1 * capacity + seat2) is set when the two players met.
+        """
+
+        dirty = self.dirty
+
+        self._capacity = max(8, 1 << (len(self._seats) - 1).bit_length())
+        self._opponents = bytearray(self._capacity * self._capacity // 8)
+        for r in self.rounds:
+            for (player1, _), (player2, _) in r.games:
+                self._set_opponents(player1, player2)
+
+        self.dirty = dirty
+
+    def _set_opponents(self, player1_id, player2_id):
+        """Flag the two given players as opponents in the opponent matrix.
+
+        Nothing is done until the matrix is built (see _build_opponent_matrix).
+        """
+
+        if self._opponents is None:
+            return
+
+        seat1 = self._seats[player1_id]
+        seat2 = self._seats[player2_id]
+        for bit in (seat1 * self._capacity + seat2, seat2 * self._capacity + seat1):
+            self._opponents[bit >> 3] |= 1 << (bit & 7)
+
     def _has_right_players_num(self):
         """ Return True if the number of players is greater than 0 and multiple of 2 """
 
@@ -306,6 +805,7 @@ class Tournament:
             "dates": f"{self.labels['dates']}: du {self.start_date} au {self.end_date}",
             "num_rounds": f"{self.labels['num_rounds']}: {self.num_rounds}",
             "game_type": f"{self.labels['gtype']}: {self.game_type}",
+            "pairing": f"{self.labels['pairing']}: {self.pairing.capitalize()}",
             "desc": f"{self.labels['desc']}: {self.description}",
             "space": "",
             "num_players": f"{self.labels['num_players']}: {len(self.players)}",
@@ -340,14 +840,14 @@ class Tournament:
             infos["classement"] = f"{self.labels['classement']}:"
             infos["space3"] = ""
 
-            for i, player in enumerate(
-                sorted(
-                    self._world.get_actors(self),
-                    key=attrgetter("score", "elo"),
-                    reverse=True,
+            for i, player in enumerate(self.standings()):
+                score, buchholz, sonneborn_berger, progressive = self.get_tiebreaks(player.uid)
+                infos[f"result{i}"] = (
+                    f"{player.one_line()} | "
+                    + f"{self.labels['buchholz']}:{buchholz:5g} "
+                    + f"{self.labels['sonneborn_berger']}:{sonneborn_berger:6g} "
+                    + f"{self.labels['progressive']}:{progressive:5g}"
                 )
-            ):
-                infos[f"result{i}"] = player.one_line()
 
         return infos
 
@@ -400,6 +900,13 @@ class Tournament:
                 "test": "Validation.is_valid_gtype(value)",
                 "errormsg": "Vous devez saisir l'une de ces options Bullet, Blitz, Coups rapides",
             },
+            {
+                "name": "pairing",
+                "label": cls.labels["pairing"] + " " + cls.labels["format_pairing"],
+                "placeholder": "Greedy",
+                "test": "Validation.is_valid_pairing(value)",
+                "errormsg": "Vous devez saisir l'une de ces options Greedy, Blossom, Dutch, Backtrack",
+            },
             {
                 "name": "description",
                 "label": cls.labels["desc"],
@@ -474,14 +981,29 @@ class Tournament:
         """
 
         tournaments = world.tournaments
-        for t in tournaments:
-            logging.debug(t.serialize())
         if len(tournaments) > 0:
             retv = [(f"{t.name}", "open_tournament_current", t) for t in tournaments]
             return tuple(retv)
         else:
             return (("Aucun tournoi", "go_back"),)
 
+    @staticmethod
+    def list_tournaments(world):
+        """Return tuples presenting the available tournaments (without loading their rounds).
+
+        Parameters
+        ----------
+        world : World
+            the world instance containing all tournament's and player's instances
+        """
+
+        tournaments = world.tournaments
+        if len(tournaments) > 0:
+            retv = [(f" {t.one_line()} ", None) for t in tournaments]
+            return tuple(retv)
+        else:
+            return (("Aucun tournoi", "go_back"),)
+
     @staticmethod
     def select_tournament_report(world, route):
         """Return tuples containing the available tournaments and
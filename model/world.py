@@ -6,7 +6,8 @@
 import logging
 
 from model.player import Player
-from model.tournament import Tournament
+from model.round import Round
+from model.tournament import Tournament, Status, as_enum
 
 
 class World:
@@ -20,21 +21,35 @@ class World:
 
     actors : dict('UID', Player)
         The list of all actors
+    members : dict('UID', list(Player))
+        The ordered actors instances of each tournament (by tournament UID)
     tournaments : list(Tournament)
         The list of all tournaments
     active_tournament : Tournament
         The currently active tournament instance
+    journal : Journal
+        The journal recording the mutations since the last save (or None)
+    listeners : list(function)
+        The functions called with the name of each recorded mutation
+    version : int
+        Incremented on each recorded mutation, load or change of a tournament attribute
 
     Public Methods
     --------------
-    load(tournaments, actors)
+    load(tournaments, actors, records=None)
         Replace the class attributes with the provided ones
+    replay(records)
+        Apply the given journal records on top of the current content
+    record(op, **data)
+        Append a mutation record to the journal (if any) and notify the listeners
     add_tournament(name, place, start_date, end_date, gtype, desc="", rounds=4)
         Register a new tournament instance
     set_active_tournament(tournament)
         Set the currently active tournament instance
     get_active_tournament()
         Get the currently active tournament instance or None
+    get_tournament(uid)
+        Get a tournament instance by providing it's UID
 
     add_actor(actor, tournament=None)
         Register a new actor to the provided Tournament instance (or the currently active)
@@ -44,22 +59,33 @@ class World:
         Get all the actors instances of the provided Tournament instance (or the currently active)
     get_all_actors()
         Get all the actors instances
+
+    Private Methods
+    ---------------
+    _index_members(tournament)
+        Build the ordered list of the actors instances of the given tournament
     """
 
     actors = {}
+    members = {}
     tournaments = []
     active_tournament = None
+    journal = None
+    listeners = []
+    version = 0
 
     @classmethod
     def clear(cls):
         """ Remove the current content of the class. """
 
         cls.actors = {}
+        cls.members = {}
         cls.tournaments = []
         cls.active_tournament = None
+        cls.version += 1
 
     @classmethod
-    def load(cls, tournaments, actors):
+    def load(cls, tournaments, actors, records=None):
         """Replace the class attributes with the provided ones.
 
         Parameters
@@ -67,19 +93,69 @@ class World:
         tournaments : list(dict)
             list of tournaments arguments dictionaries
         actors : list(dict)
-            list of players arguments dictionaries
+            list of serialized players (trusted rows, see Player.from_serialized)
+        records : list(dict)
+            optional list of journal records to replay on top of the snapshot
         """
 
         cls.clear()
 
-        for actor in actors:
-            cls.actors[actor["uid"]] = Player(**actor)
+        for new_actor in Player.from_serialized(actors):
+            cls.actors[new_actor.uid] = new_actor
 
         for tournament in tournaments:
             # tournament = json.loads(tournament, object_hook=as_enum)
             new_tournament = Tournament(cls, **tournament)
+            if "uid" in tournament:  # older files must be saved again with an uid
+                new_tournament.mark_clean()
             cls.tournaments.append(new_tournament)
             cls.set_active_tournament(new_tournament)
+            cls._index_members(new_tournament)
+
+        if records:
+            cls.replay(records)
+
+    @classmethod
+    def replay(cls, records):
+        """Apply the given journal records on top of the current content.
+
+        The replayed mutations are not recorded again in the journal.
+
+        Parameters
+        ----------
+        records : list(dict)
+            list of journal records (see Journal.append)
+        """
+
+        journal, cls.journal = cls.journal, None
+        try:
+            for record in records:
+                cls._replay_record(record)
+        finally:
+            cls.journal = journal
+
+    @classmethod
+    def record(cls, op, **data):
+        """Append a mutation record to the journal (if any) and notify the listeners.
+
+        The replayed mutations are neither recorded nor notified.
+        The version is incremented either way.
+
+        Parameters
+        ----------
+        op : str
+            The name of the recorded mutation
+        **data : *
+            The JSON compatible values required to replay the mutation
+        """
+
+        cls.version += 1
+
+        if cls.journal is not None:
+            cls.journal.append(op, **data)
+
+            for listener in cls.listeners:
+                listener(op)
 
     # --- Tournament ---
 
@@ -97,6 +173,7 @@ class World:
             raise TypeError("Tournament instance expected")
 
         cls.tournaments.append(tournament)
+        cls.record("tournament", data=tournament.serialize(rounds=False))
 
         return tournament
 
@@ -126,6 +203,20 @@ class World:
 
         return cls.active_tournament
 
+    @classmethod
+    def get_tournament(cls, uid):
+        """Get a tournament instance by providing it's UID
+
+        Parameters
+        ----------
+        uid : str
+            the requested Tournament's instance UID
+        """
+
+        for tournament in cls.tournaments:
+            if tournament.uid == uid:
+                return tournament
+
     # --- Actors ---
 
     @classmethod
@@ -155,6 +246,10 @@ class World:
 
         cls.actors[actor.uid] = actor
         tournament.add_player(actor.uid)
+        members = cls.members.get(tournament.uid)
+        if members is not None:
+            members.append(actor)
+        cls.record("actor", t=tournament.uid, data=actor.serialize())
 
         return id(actor)
 
@@ -193,9 +288,11 @@ class World:
         if tournament is None:
             raise NoActiveTournamentError()
 
-        actors_id = tournament.players
+        members = cls.members.get(tournament.uid)
+        if members is None or len(members) != len(tournament.players):
+            members = cls._index_members(tournament)
 
-        return [v for k, v in cls.actors.items() if k in actors_id]
+        return list(members)
 
     @classmethod
     def get_all_actors(cls):
@@ -203,6 +300,70 @@ class World:
 
         return [v for k, v in cls.actors.items()]
 
+    @classmethod
+    def _index_members(cls, tournament):
+        """Build the ordered list of the actors instances of the given tournament.
+
+        Parameters
+        ----------
+        tournament : Tournament
+            The tournament instance to index
+        """
+
+        members = [cls.actors[x] for x in tournament.players if x in cls.actors]
+        cls.members[tournament.uid] = members
+
+        return members
+
+    # --- Journal ---
+
+    @classmethod
+    def _replay_record(cls, record):
+        """Apply one journal record.
+
+        Parameters
+        ----------
+        record : dict
+            the journal record to apply
+        """
+
+        op = record["op"]
+
+        if op == "tournament":
+            tournament = cls.get_tournament(record["data"]["uid"])
+            if tournament is None:
+                cls.add_tournament(Tournament(cls, **record["data"]))
+            else:
+                tournament.update_infos(record["data"])
+
+        elif op == "actor":
+            actor = Player(**record["data"])
+            if record["t"] is None:  # edited actor
+                cls.actors[actor.uid] = actor
+                cls.members = {}  # the tournaments may hold the replaced instance
+            else:
+                cls.add_actor(actor, cls.get_tournament(record["t"]))
+
+        elif op == "round":
+            tournament = cls.get_tournament(record["t"])
+            if tournament.current_round() is not None:
+                tournament.current_round().close_time = record["closed"]
+            tournament.add_round(
+                Round(cls, **record["data"], players_id=tournament.players)
+            )
+            tournament.status = Status.PLAYING
+
+        elif op == "result":
+            tournament = cls.get_tournament(record["t"])
+            tournament.set_results(record["g"], *record["s"])
+
+        elif op == "status":
+            tournament = cls.get_tournament(record["t"])
+            tournament.status = as_enum(record["s"])
+
+        else:
+            logging.warning(f"JOURNAL: unknown record {record}")
+
 
 class NoActiveTournamentError(Exception):
     pass
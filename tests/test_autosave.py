@@ -0,0 +1,225 @@
+#! /usr/bin/env python3
+# coding: utf-8
+
+"""
+The purpose of this module is to test the AutoSave class
+"""
+
+import threading
+
+from tinydb import TinyDB
+
+from controller.autosave import AutoSave
+from model.world import World
+from model.round import Round
+from model.player import Player
+from model.tournament import Tournament, Status
+from model.tiny import TinyDbIO
+
+
+class TestAutoSave:
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    def setup_method(self):
+        World.clear()
+
+        self.T1 = Tournament(
+            World, "Test1", "TestAre1", "01.01.2020", "02.01.2020", "bullet", ""
+        )
+        World.add_tournament(self.T1)
+        World.set_active_tournament(self.T1)
+
+        for i, elo in enumerate([1380, 2120, 1612, 999, 1720, 2000, 230, 3000]):
+            World.add_actor(Player(f"P{i+1}", "p", "1.1.1979", "M", elo), self.T1)
+
+    def teardown_method(self):
+        self.autosave.close()
+        TinyDbIO.close_journal()
+
+    def _start(self, tmp_path, monkeypatch, delay=0):
+        monkeypatch.setattr(TinyDbIO, "path", str(tmp_path / "tournament.json"))
+        monkeypatch.setattr(TinyDbIO, "journal_path", str(tmp_path / "journal"))
+        TinyDbIO.save_all()
+        TinyDbIO.open_journal()
+        self.autosave = AutoSave(TinyDbIO, delay=delay)
+
+    def _num_rounds(self):
+        db = TinyDB(TinyDbIO.path)
+        rounds = db.table("tournaments").all()[0]["rounds"]
+        db.close()
+        return len(rounds)
+
+    def test_notify_on_record(self, tmp_path, monkeypatch):
+        self._start(tmp_path, monkeypatch, delay=60)
+        assert self.autosave.status() == ""
+
+        World.add_actor(Player("P9", "p", "1.1.1979", "M", 1500), self.T1)
+
+        self.autosave.tick()  # the delay isn't over yet
+        assert self.autosave.queue_depth() == 0
+        assert self.autosave.status().startswith("Sauvegarde en attente")
+
+    def test_burst_coalesced(self, tmp_path, monkeypatch):
+        self._start(tmp_path, monkeypatch)
+        written = []
+        monkeypatch.setattr(TinyDbIO, "write_changes", lambda docs: written.append(docs))
+
+        self.T1.status = Status.INITIALIZED
+        self.T1.start_round()
+        for i in range(4):
+            self.T1.set_results(i, *Round.convert_score_symbol("="))
+
+        self.autosave.tick()
+        self.autosave.flush()
+
+        assert len(written) == 1
+        assert self.autosave.queue_depth() == 0
+        assert self.autosave.last_saved is not None
+        assert self.T1.is_dirty() is False
+
+    def test_flush_writes_and_truncates_journal(self, tmp_path, monkeypatch):
+        self._start(tmp_path, monkeypatch, delay=60)
+
+        self.T1.status = Status.INITIALIZED
+        self.T1.start_round()
+        assert len(TinyDbIO.load_journal()) == 1
+
+        self.autosave.flush()
+
+        assert self._num_rounds() == 1
+        assert len(TinyDbIO.load_journal()) == 0
+
+    def test_join_from_another_thread(self, tmp_path, monkeypatch):
+        self._start(tmp_path, monkeypatch, delay=60)
+
+        self.T1.status = Status.INITIALIZED
+        self.T1.start_round()
+        self.autosave.flush(wait=False)
+
+        worker = threading.Thread(target=self.autosave.join)
+        worker.start()
+        worker.join()
+        assert self._num_rounds() == 1
+        assert self.autosave.queue_depth() == 1  # processed by the next tick
+
+        self.autosave.tick()
+        assert self.autosave.queue_depth() == 0
+        assert len(TinyDbIO.load_journal()) == 0
+
+    def test_failed_write_restores_dirty(self, tmp_path, monkeypatch):
+        self._start(tmp_path, monkeypatch, delay=60)
+
+        def fail(docs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(TinyDbIO, "write_changes", fail)
+
+        self.T1.status = Status.INITIALIZED
+        self.T1.start_round()
+        self.autosave.flush()
+
+        assert self.autosave.error == "disk full"
+        assert self.T1.is_dirty() is True
+        assert len(TinyDbIO.load_journal()) == 1
+
+    def test_crash_before_journal_truncated(self, tmp_path, monkeypatch):
+        self._start(tmp_path, monkeypatch, delay=60)
+
+        self.T1.status = Status.INITIALIZED
+        self.T1.start_round()
+        self.T1.set_results(0, *Round.convert_score_symbol("<"))
+
+        # the worker wrote the snapshot, but the app stopped before the next tick
+        TinyDbIO.write_snapshot(TinyDbIO.snapshot_changes())
+        self.T1.set_results(1, *Round.convert_score_symbol("="))
+        expected = self.T1.serialize()
+        scores = {x.uid: x.score for x in World.get_all_actors()}
+
+        World.load(*TinyDbIO.load_all(), TinyDbIO.load_journal())
+        tournament = World.get_tournament(self.T1.uid)
+
+        assert len(TinyDbIO.load_journal()) == 1  # only the record after the snapshot
+        assert tournament.players == expected["players"]
+        assert tournament.serialize()["rounds"] == expected["rounds"]
+        assert {x.uid: x.score for x in World.get_all_actors()} == scores
+
+    def test_failed_write_restores_next_snapshots(self, tmp_path, monkeypatch):
+        self._start(tmp_path, monkeypatch, delay=60)
+        write_changes = TinyDbIO.write_changes
+        written = []
+
+        def fail_once(docs):
+            if not written:
+                written.append(None)
+                raise OSError("disk full")
+            written.append(docs["journal_seq"])
+            write_changes(docs)
+
+        monkeypatch.setattr(TinyDbIO, "write_changes", fail_once)
+
+        self.T1.status = Status.INITIALIZED
+        self.T1.start_round()
+        self.autosave.flush(wait=False)  # fails
+        World.add_actor(Player("P9", "p", "1.1.1979", "M", 1500), self.T1)
+        self.autosave.flush(wait=False)  # taken before the failure was restored
+        self.autosave.join()
+
+        assert written == [None]  # the second snapshot wasn't written
+        assert TinyDbIO.load_journal_seq() == 0
+
+        self.autosave.tick()
+        assert self.T1.is_dirty() is True
+        self.autosave.flush()
+
+        assert self.autosave.error is None
+        assert written == [None, 2]
+        assert len(TinyDbIO.load_journal()) == 0
+        assert self._num_rounds() == 1
+
+    def test_close_discard(self, tmp_path, monkeypatch):
+        self._start(tmp_path, monkeypatch, delay=60)
+        write_changes = TinyDbIO.write_changes
+        started = threading.Event()
+        release = threading.Event()
+        written = []
+
+        def slow_write(docs):
+            started.set()
+            release.wait()
+            written.append(docs)
+            write_changes(docs)
+
+        monkeypatch.setattr(TinyDbIO, "write_changes", slow_write)
+
+        self.T1.status = Status.INITIALIZED
+        self.T1.start_round()
+        self.autosave.flush(wait=False)  # being written
+        started.wait()
+        World.add_actor(Player("P9", "p", "1.1.1979", "M", 1500), self.T1)
+        self.autosave.flush(wait=False)  # pending
+
+        threading.Timer(0.1, release.set).start()
+        self.autosave.close(discard=True)
+
+        assert len(written) == 1
+        assert self.autosave.queue_depth() == 0
+        assert self._num_rounds() == 1
+
+    def test_close_failed_write_keeps_journal(self, tmp_path, monkeypatch):
+        self._start(tmp_path, monkeypatch, delay=60)
+
+        def fail(docs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(TinyDbIO, "write_changes", fail)
+
+        self.T1.status = Status.INITIALIZED
+        self.T1.start_round()
+        self.autosave.flush(wait=False)
+        self.autosave.close()
+
+        # the app quits without dropping the journal (see Controller._quit)
+        assert self.autosave.error == "disk full"
+        assert len(TinyDbIO.load_journal()) == 1
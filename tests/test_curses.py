@@ -0,0 +1,159 @@
+#! /usr/bin/env python3
+# coding: utf-8
+
+"""
+The purpose of this module is to test the terminal output of the CurseView class
+
+The view runs in a child process attached to a pseudo-terminal,
+so the harness can count the bytes written to the terminal after each keystroke.
+"""
+
+import os
+import select
+import sys
+
+import pytest
+
+pty = pytest.importorskip("pty")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# a minimal controller loop: select lists in the main and menu windows,
+# the arrows move the selection of the focused window and @ swaps the focus
+DRIVER = """
+import curses
+import os
+from model.rows import LazyRows
+from view.curses import CurseView
+
+view = CurseView()
+lists = {
+    view.main: LazyRows(
+        range(int(os.environ["NUM_ROWS"])), lambda i: f" Joueur {i:03} | ELO:{1000 + i:4} "
+    ),
+    view.menu: [" Ajouter un joueur ", " Commencer le tournoi ", " << RETOUR "],
+}
+rows = {view.main: 0, view.menu: 0}
+
+view.display_text(view.head, "Tournoi")
+view.display_select(view.main, lists[view.main], 0)
+view.display_select(view.menu, lists[view.menu], 0)
+
+while True:
+    key = view.screen.getch()
+    if key == ord("q"):
+        break
+    elif key == ord("@"):
+        view.swap_focus()
+        continue
+
+    screen = view.focus
+    page = view.page_size(screen)
+    if key == curses.KEY_DOWN:
+        rows[screen] = (rows[screen] + 1) % len(lists[screen])
+    elif key == curses.KEY_UP:
+        rows[screen] = (rows[screen] - 1) % len(lists[screen])
+    elif key == curses.KEY_NPAGE:
+        rows[screen] = min(len(lists[screen]) - 1, rows[screen] + page)
+    elif key == curses.KEY_END:
+        rows[screen] = len(lists[screen]) - 1
+    view.display_select(screen, lists[screen], rows[screen])
+
+view.close()
+"""
+
+KEY_DOWN = b"\x1bOB"  # xterm in keypad mode
+KEY_UP = b"\x1bOA"
+KEY_NPAGE = b"\x1b[6~"
+KEY_END = b"\x1bOF"
+
+
+class TerminalHarness:
+    """This class runs the driver in a pseudo-terminal and counts the bytes it writes.
+
+    Public Methods
+    --------------
+    read()
+        Return the number of bytes written until the terminal is quiet (kept in output)
+    press(key)
+        Send the given keystroke and return the number of bytes written in response
+    close()
+        Quit the driver and wait for the child process
+    """
+
+    QUIET = 0.2  # seconds without output before a frame is considered complete
+
+    def __init__(self, lines=40, columns=120, num_rows=20):
+        self.output = b""
+        self.pid, self.fd = pty.fork()
+        if self.pid == 0:  # child
+            env = dict(os.environ, TERM="xterm", LINES=str(lines), COLUMNS=str(columns))
+            env["NUM_ROWS"] = str(num_rows)
+            env["PYTHONPATH"] = ROOT
+            os.chdir(ROOT)
+            os.execve(sys.executable, [sys.executable, "-c", DRIVER], env)
+
+        self.initial = self.read()
+
+    def read(self):
+        self.output = b""
+        while select.select([self.fd], [], [], self.QUIET)[0]:
+            try:
+                data = os.read(self.fd, 65536)
+            except OSError:  # the child exited
+                break
+            if not data:
+                break
+            self.output += data
+        return len(self.output)
+
+    def press(self, key):
+        os.write(self.fd, key)
+        return self.read()
+
+    def close(self):
+        os.write(self.fd, b"q")
+        self.read()
+        os.waitpid(self.pid, 0)
+        os.close(self.fd)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="requires a pseudo-terminal")
+class TestCurseView:
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    def setup_method(self):
+        self.terminal = TerminalHarness()
+
+    def teardown_method(self):
+        self.terminal.close()
+
+    def test_initial_frame(self):
+        assert self.terminal.initial > 0
+
+    def test_arrow_repaints_selected_rows(self):
+        sizes = [self.terminal.press(key) for key in (KEY_DOWN, KEY_DOWN, KEY_UP)]
+
+        # only the previously and newly highlighted rows are sent (a few escape sequences)
+        assert all(0 < x < 200 for x in sizes)
+
+    def test_arrow_in_main_window(self):
+        self.terminal.press(b"@")
+        sizes = [self.terminal.press(key) for key in (KEY_DOWN, KEY_DOWN, KEY_UP)]
+
+        assert all(0 < x < 200 for x in sizes)
+
+    def test_scroll_long_list(self):
+        self.terminal.close()
+        self.terminal = TerminalHarness(num_rows=100000)
+        assert b"Joueur 000" in self.terminal.output
+        assert b"Joueur 030" not in self.terminal.output  # past the window
+
+        self.terminal.press(b"@")
+        self.terminal.press(KEY_NPAGE)
+        assert b"Joueur 026" in self.terminal.output  # one page down
+
+        self.terminal.press(KEY_END)
+        assert b"Joueur 99999" in self.terminal.output
@@ -0,0 +1,77 @@
+#! /usr/bin/env python3
+# coding: utf-8
+
+"""
+The purpose of this module is to test the Dispatcher class
+"""
+
+import pytest
+
+from controller.dispatch import Dispatcher, UnknownAction, InvalidTest
+from controller.main import Controller
+from view.menu import Menu
+from model.player import Player
+from model.tournament import Tournament
+
+
+class Target:
+    def go_back(self):
+        return "back"
+
+
+class TestDispatcher:
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    def setup_method(self):
+        self.dispatcher = Dispatcher(Target())
+
+    # --- action ---
+
+    def test_action_bound(self):
+        assert self.dispatcher.action("go_back")() == "back"
+        assert self.dispatcher.action("go_back") is self.dispatcher.action("go_back")
+
+    def test_action_unknown(self):
+        with pytest.raises(UnknownAction):
+            self.dispatcher.action("open_nowhere")
+
+    # --- test ---
+
+    def test_test_compiled_once(self):
+        test = Dispatcher.test("Validation.is_valid_date(value)")
+        assert test("1.1.2020") is True
+        assert test("1.1.20") is False
+        assert Dispatcher.test("Validation.is_valid_date(value)") is test
+
+    def test_test_invalid(self):
+        with pytest.raises(InvalidTest):
+            Dispatcher.test("value !=")
+
+    def test_test_unknown_name(self):
+        with pytest.raises(InvalidTest):
+            Dispatcher.test("Validation.is_valid_nonexistent(value)")
+        with pytest.raises(InvalidTest):
+            Dispatcher.test("is_valid_date(value)")
+        assert "Validation.is_valid_nonexistent(value)" not in Dispatcher.tests
+
+    def test_check_unknown_test(self):
+        fields = [[{"test": "Validation.is_valid_nonexistent(value)"}]]
+        with pytest.raises(InvalidTest):
+            Dispatcher(Controller).check(Menu, fields)
+
+    # --- check ---
+
+    def test_check_controller(self):
+        fields = [Player.get_fields(), Tournament.get_fields(), Tournament.get_fields_final_note()]
+        Dispatcher(Controller).check(Menu, fields)
+
+        for rows in fields:
+            for row in rows:
+                if row.get("test") is not None:
+                    assert row["test"] in Dispatcher.tests
+
+    def test_check_missing_action(self):
+        with pytest.raises(UnknownAction):
+            self.dispatcher.check(Menu, [])
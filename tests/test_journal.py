@@ -0,0 +1,195 @@
+#! /usr/bin/env python3
+# coding: utf-8
+
+"""
+The purpose of this module is to test the Journal class and the World replay
+"""
+
+from model.world import World
+from model.round import Round
+from model.player import Player
+from model.tournament import Tournament, Status
+from model.journal import Journal
+
+
+class TestJournal:
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    def setup_method(self):
+        World.clear()
+
+    def teardown_method(self):
+        if World.journal is not None:
+            World.journal.close()
+        World.journal = None
+
+    def _fill_world(self):
+        T1 = Tournament(
+            World, "Test1", "TestAre1", "01.01.2020", "02.01.2020", "bullet", ""
+        )
+        World.add_tournament(T1)
+        World.set_active_tournament(T1)
+
+        for i, elo in enumerate([1380, 2120, 1612, 999, 1720, 2000, 230, 3000]):
+            World.add_actor(Player(f"P{i+1}", "p", "1.1.1979", "M", elo), T1)
+
+        T1.status = Status.INITIALIZED
+        return T1
+
+    # --- append / read ---
+
+    def test_append_read(self, tmp_path):
+        journal = Journal(str(tmp_path / "journal"))
+        journal.append("result", t="T", g=0, s=[1, 0])
+        journal.append("result", t="T", g=1, s=[0.5, 0.5])
+
+        records = journal.read()
+        assert len(records) == 2
+        assert records[0] == {"op": "result", "t": "T", "g": 0, "s": [1, 0], "seq": 1}
+        assert records[1]["seq"] == 2
+        journal.close()
+
+    def test_read_partial_record(self, tmp_path):
+        path = tmp_path / "journal"
+        journal = Journal(str(path))
+        journal.append("result", t="T", g=0, s=[1, 0])
+        journal.close()
+        with open(path, "a") as f:
+            f.write('{"op":"res')
+
+        assert len(Journal.read_file(str(path))) == 1
+
+    def test_read_missing_file(self, tmp_path):
+        assert Journal.read_file(str(tmp_path / "missing")) == []
+
+    def test_truncate(self, tmp_path):
+        journal = Journal(str(tmp_path / "journal"))
+        journal.append("result", t="T", g=0, s=[1, 0])
+        journal.truncate()
+        assert journal.size() == 0
+        assert journal.read() == []
+        journal.close()
+
+    def test_truncate_offset(self, tmp_path):
+        journal = Journal(str(tmp_path / "journal"))
+        journal.append("result", t="T", g=0, s=[1, 0])
+        offset = journal.size()
+        journal.append("result", t="T", g=1, s=[0, 1])
+        journal.truncate(offset)
+        assert [x["g"] for x in journal.read()] == [1]
+        journal.append("result", t="T", g=2, s=[0, 1])
+        assert [x["g"] for x in journal.read()] == [1, 2]
+        journal.close()
+
+    def test_compaction_threshold(self, tmp_path):
+        calls = []
+        journal = Journal(
+            str(tmp_path / "journal"), threshold=100, compact=lambda: calls.append(1)
+        )
+        journal.append("result", t="T", g=0, s=[1, 0])
+        assert len(calls) == 0
+        for i in range(5):
+            journal.append("result", t="T", g=i, s=[1, 0])
+        assert len(calls) > 0
+        journal.close()
+
+    # --- World replay ---
+
+    def test_world_replay(self, tmp_path):
+        World.journal = Journal(str(tmp_path / "journal"))
+
+        T1 = self._fill_world()
+        snapshot = ([], [])  # nothing saved yet
+
+        T1.start_round()
+        T1.set_results(0, *Round.convert_score_symbol("<"))
+        T1.set_results(1, *Round.convert_score_symbol("="))
+        T1.start_round()
+        T1.set_results(0, *Round.convert_score_symbol(">"))
+
+        expected_tournament = T1.serialize()
+        expected_players = {x.uid: x.serialize() for x in World.get_all_actors()}
+        records = World.journal.read()
+
+        World.journal.close()
+        World.journal = None
+        World.load(*snapshot, records)
+
+        assert len(World.tournaments) == 1
+        replayed = World.tournaments[0].serialize()
+        assert replayed["rounds"] == expected_tournament["rounds"]
+        assert replayed["players"] == expected_tournament["players"]
+        assert {x.uid: x.serialize() for x in World.get_all_actors()} == (
+            expected_players
+        )
+
+    def test_world_replay_on_snapshot(self, tmp_path):
+        T1 = self._fill_world()
+        T1.start_round()
+        snapshot = (
+            [T1.serialize()],
+            [x.serialize() for x in World.get_all_actors()],
+        )
+
+        World.journal = Journal(str(tmp_path / "journal"))
+        T1.set_results(0, *Round.convert_score_symbol("<"))
+        game = T1.current_round().games[0]
+        records = World.journal.read()
+
+        World.journal.close()
+        World.journal = None
+        World.load(*snapshot, records)
+
+        assert len(records) == 1
+        assert World.get_actor(game[0][0]).score == 1
+        assert World.tournaments[0].current_round().games[0][0][1] == 1
+        assert World.tournaments[0].is_dirty() is True
+
+    def test_world_replay_infos(self, tmp_path):
+        World.journal = Journal(str(tmp_path / "journal"))
+        T1 = self._fill_world()
+        T1.start_round()
+        T1.set_results(0, *Round.convert_score_symbol("<"))
+
+        T1.description = "Final note"  # as recorded by the tournament forms
+        World.record("tournament", data=T1.serialize(rounds=False))
+        expected_rounds = T1.serialize()["rounds"]
+        records = World.journal.read()
+
+        World.journal.close()
+        World.journal = None
+        World.load([], [], records)
+
+        assert all("rounds" not in x["data"] for x in records if x["op"] == "tournament")
+        assert World.tournaments[0].description == "Final note"
+        assert World.tournaments[0].serialize()["rounds"] == expected_rounds
+
+    def test_world_replay_status(self, tmp_path):
+        T1 = self._fill_world()
+        snapshot = (
+            [T1.serialize()],
+            [x.serialize() for x in World.get_all_actors()],
+        )
+
+        World.journal = Journal(str(tmp_path / "journal"))
+        T1.set_status(Status.CLOSING)
+        T1.set_status(Status.CLOSING)  # unchanged, not recorded
+        records = World.journal.read()
+
+        World.journal.close()
+        World.journal = None
+        World.load(*snapshot, records)
+
+        assert [x["op"] for x in records] == ["status"]
+        assert World.tournaments[0].status == Status.CLOSING
+
+    def test_world_replay_not_recorded(self, tmp_path):
+        World.journal = Journal(str(tmp_path / "journal"))
+        self._fill_world()
+        records = World.journal.read()
+
+        World.load([], [], records)
+
+        assert len(World.journal.read()) == len(records)
@@ -0,0 +1,137 @@
+#! /usr/bin/env python3
+# coding: utf-8
+
+"""
+The purpose of this module is to test the PageCache class and the navigation decorators
+"""
+
+from controller import main
+from controller.main import cachePage, saveNav
+from controller.pages import PageCache
+from model.world import World
+from model.player import Player
+from model.tournament import Tournament, Status
+
+
+class Page:
+    """ A minimal controller drawing its pages with _set_view. """
+
+    def __init__(self, size=2):
+        self.pages = PageCache(size)
+        self._recording = None
+        self.built = 0
+        self.drawn = []
+
+    def _set_view(self, view, action, **kwargs):
+        if self._recording is not None:
+            self._recording.append(("_set_view", (view, action), kwargs))
+        self.drawn.append((view, kwargs.get("text")))
+
+    @cachePage
+    def open_report(self, sortby=None):
+        self.built += 1
+        self._set_view("main", "print-line", text=f"report {sortby}")
+
+    @cachePage
+    def open_standings(self, tournament):
+        self.built += 1
+        rows = Player.list_actors(tournament, World, "score")
+        self._set_view("main", "list", call=lambda: rows)
+
+
+class TestPageCache:
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    def setup_method(self):
+        World.clear()
+        self.T1 = Tournament(
+            World, "Test1", "TestAre1", "01.01.2020", "02.01.2020", "bullet", ""
+        )
+        World.add_tournament(self.T1)
+        self.page = Page()
+
+    def test_repaint_from_cache(self):
+        self.page.open_report()
+        self.page.open_report()
+
+        assert self.page.built == 1
+        assert self.page.drawn == [("main", "report None")] * 2
+        assert (self.page.pages.hits, self.page.pages.misses) == (1, 1)
+
+    def test_key_by_parameters(self):
+        self.page.open_report(sortby="elo")
+        self.page.open_report(sortby="alpha")
+        self.page.open_report(sortby="elo")
+
+        assert self.page.built == 2
+        assert self.page.drawn[-1] == ("main", "report elo")
+
+    def test_stale_after_mutation(self):
+        self.page.open_report()
+        World.add_actor(Player("P1", "p", "1.1.1979", "M", 1500), self.T1)
+        self.page.open_report()
+
+        assert self.page.built == 2
+
+    def test_stale_after_tournament_change(self):
+        self.page.open_report()
+        self.T1.status = Status.CLOSED
+        self.page.open_report()
+
+        assert self.page.built == 2
+
+    def test_repaint_tournament_page(self):
+        for i, elo in enumerate([1380, 2120, 1612, 999, 1720, 2000, 230, 3000]):
+            World.add_actor(Player(f"P{i+1}", "p", "1.1.1979", "M", elo), self.T1)
+        self.T1.status = Status.INITIALIZED
+        self.T1.start_round()
+        self.T1.set_results(0, 1, 0)
+
+        # the first rendering builds the standings cache of the tournament
+        self.page.open_standings(self.T1)
+        self.page.open_standings(self.T1)
+
+        assert self.page.built == 1
+        assert self.page.pages.hits == 1
+
+    def test_lru_eviction(self):
+        for sortby in ("a", "b", "a", "c", "a", "b"):
+            self.page.open_report(sortby=sortby)
+
+        assert len(self.page.pages) == 2
+        assert self.page.built == 4  # "b" was dropped when "c" was stored
+
+    def test_unhashable_parameters(self):
+        assert PageCache.key(Page.open_report, ([1],), {}, World) is None
+
+    def test_disabled(self):
+        self.page = Page(size=0)
+        self.page.open_report()
+        self.page.open_report()
+
+        assert self.page.built == 2
+
+
+class TestNavHistory:
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    def setup_method(self):
+        self.depth = main.nav_history.maxlen
+        main.nav_history = main.deque(maxlen=3)
+
+    def teardown_method(self):
+        main.nav_history = main.deque(maxlen=self.depth)
+
+    def test_bounded(self):
+        @saveNav
+        def open_page(i):
+            return i
+
+        for i in range(10):
+            open_page(i)
+
+        assert [x[1] for x in main.nav_history] == [(7,), (8,), (9,)]
@@ -0,0 +1,235 @@
+#! /usr/bin/env python3
+# coding: utf-8
+
+"""
+The purpose of this module is to test the pairing engines
+"""
+
+import itertools
+import random
+import time
+
+import pytest
+
+from model.world import World
+from model.round import Round
+from model.player import Player
+from model.tournament import Tournament, Status
+from model.pairing import (
+    get_pairing,
+    max_weight_matching,
+    pair_backtrack,
+    pair_blossom,
+    pair_dutch,
+    pair_greedy,
+    search_pairing,
+    UNPAIRED_COST,
+)
+
+
+def has_played(player1, player2):
+    return player1.has_played(player2.uid)
+
+
+class TestPairing:
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    def setup_method(self):
+        World.clear()
+
+        self.players = [
+            Player(f"P{i+1}", "p", "1.1.1979", "M", elo)
+            for i, elo in enumerate([2000, 1900, 1800, 1700])
+        ]
+
+    def _set_played(self, i, j):
+        self.players[i].set_played(self.players[j].uid)
+        self.players[j].set_played(self.players[i].uid)
+
+    # --- get_pairing ---
+
+    def test_get_pairing(self):
+        assert get_pairing("greedy") is pair_greedy
+        assert get_pairing("blossom") is pair_blossom
+
+    def test_get_pairing_unknown(self):
+        with pytest.raises(ValueError):
+            get_pairing("unknown")
+
+    # --- engines ---
+
+    def test_first_round_halves(self):
+        p = self.players
+        expected = [(p[0].uid, p[2].uid), (p[1].uid, p[3].uid)]
+        assert pair_greedy([(0, p)], 0, has_played) == expected
+        assert pair_blossom([(0, p)], 0, has_played) == expected
+        assert pair_dutch([(0, p)], 0, has_played) == expected
+        assert pair_backtrack([(0, p)], 0, has_played) == expected
+
+    def test_greedy_dead_end(self):
+        self._set_played(0, 3)
+        self._set_played(2, 3)
+        assert len(pair_greedy([(0, self.players)], 1, has_played)) == 1
+
+    def test_blossom_complete(self):
+        self._set_played(0, 3)
+        self._set_played(2, 3)
+        p = self.players
+        expected = [(p[0].uid, p[2].uid), (p[1].uid, p[3].uid)]
+        assert pair_blossom([(0, p)], 1, has_played) == expected
+
+    def test_blossom_prefers_same_score(self):
+        p = self.players
+        brackets = [(1, [p[0], p[2]]), (0, [p[1], p[3]])]
+        expected = [(p[0].uid, p[2].uid), (p[1].uid, p[3].uid)]
+        assert pair_blossom(brackets, 1, has_played) == expected
+
+    def test_blossom_widens_graph(self):
+        self._set_played(0, 1)
+        self._set_played(2, 3)
+        pairs = pair_blossom([(0, self.players)], 1, has_played, width=1)
+        assert len(pairs) == 2
+
+    def test_dutch_halves(self):
+        p = self.players
+        expected = [(p[0].uid, p[2].uid), (p[1].uid, p[3].uid)]
+        assert pair_dutch([(1, p)], 1, has_played) == expected
+
+    def test_dutch_swap_bottom_half(self):
+        self._set_played(0, 2)
+        p = self.players
+        expected = [(p[0].uid, p[3].uid), (p[1].uid, p[2].uid)]
+        assert pair_dutch([(1, p)], 1, has_played) == expected
+
+    def test_dutch_floater(self):
+        p = self.players
+        brackets = [(2, [p[0], p[1], p[2]]), (1, [p[3]])]
+        expected = [(p[0].uid, p[1].uid), (p[2].uid, p[3].uid)]
+        assert pair_dutch(brackets, 1, has_played) == expected
+
+    def test_dutch_collapse_last_bracket(self):
+        self._set_played(2, 3)
+        p = self.players
+        brackets = [(2, [p[0], p[1]]), (1, [p[2], p[3]])]
+        pairs = pair_dutch(brackets, 1, has_played)
+        assert len(pairs) == 2
+        assert (p[2].uid, p[3].uid) not in pairs
+
+    def test_backtrack_dead_end(self):
+        self._set_played(0, 1)
+        self._set_played(2, 3)
+        p = self.players
+        expected = [(p[0].uid, p[2].uid), (p[1].uid, p[3].uid)]
+        assert pair_backtrack([(0, p)], 1, has_played) == expected
+
+    def test_backtrack_prefers_same_score(self):
+        p = self.players
+        brackets = [(1, [p[0], p[2]]), (0, [p[1], p[3]])]
+        expected = [(p[0].uid, p[2].uid), (p[1].uid, p[3].uid)]
+        assert pair_backtrack(brackets, 1, has_played) == expected
+
+    def test_backtrack_cost(self):
+        p = self.players
+        self._set_played(0, 1)
+        brackets = [(1, [p[0], p[1]]), (0, [p[2], p[3]])]
+        pairs = pair_backtrack(brackets, 1, has_played)
+        assert len(pairs) == 2
+        assert pairs.cost == 2 * 2 * 2
+
+    def test_search_pairing_cost(self):
+        p = self.players
+        pairs, cost = search_pairing([p[0], p[2], p[1], p[3]], [1, 1, 0, 0], has_played)
+        assert pairs == [(0, 1), (2, 3)]
+        assert cost == 0
+
+        self._set_played(0, 2)
+        pairs, cost = search_pairing([p[0], p[2], p[1], p[3]], [1, 1, 0, 0], has_played)
+        assert len(pairs) == 2
+        assert cost == 2 * 2 * 2
+
+    def test_search_pairing_best_effort(self):
+        for i in range(3):
+            self._set_played(i, 3)
+        pairs, cost = search_pairing(self.players, [0, 0, 0, 0], has_played, budget=0)
+        assert len(pairs) == 1
+        assert cost == 2 * UNPAIRED_COST
+
+    def test_search_pairing_infeasible_field(self):
+        # two groups of 11 players who only played against the other group:
+        # each group is odd, so no complete pairing exists
+        start = time.monotonic()
+        pairs, cost = search_pairing(
+            list(range(22)), [0] * 22, lambda a, b: a % 2 != b % 2, budget=10
+        )
+
+        assert time.monotonic() - start < 1  # the dead ends are only explored once
+        assert len(pairs) == 10
+        assert cost == 2 * UNPAIRED_COST
+
+    def test_search_pairing_deep_field(self):
+        # more pairs than the recursion limit
+        pairs, cost = search_pairing(list(range(2100)), [0] * 2100, lambda a, b: False, budget=10)
+        assert len(pairs) == 1050
+        assert cost == 0
+
+    def test_search_pairing_budget_big_field(self):
+        players = [Player(f"P{i}", "p", "1.1.1979", "M", 1000 + i) for i in range(2400)]
+
+        # the budget is spent while the compatibility of the players is computed
+        start = time.monotonic()
+        pairs, cost = search_pairing(players, [0] * 2400, has_played, budget=0.05)
+
+        assert time.monotonic() - start < 0.5
+        assert len(pairs) == 1200
+        assert cost == 0
+
+    # --- max_weight_matching ---
+
+    def test_max_weight_matching_brute_force(self):
+        rng = random.Random(0)
+        for trial in range(200):
+            num_vertices = rng.randint(2, 7)
+            edges = [
+                (i, j, rng.randint(1, 9))
+                for i, j in itertools.combinations(range(num_vertices), 2)
+                if rng.random() < 0.6
+            ]
+            mate = max_weight_matching(edges, num_vertices)
+            weights = {(i, j): w for i, j, w in edges}
+            total = sum(weights[(i, j)] for i, j in enumerate(mate) if j > i)
+
+            best = 0
+            for r in range(1, num_vertices // 2 + 1):
+                for combo in itertools.combinations(edges, r):
+                    vertices = [v for e in combo for v in e[:2]]
+                    if len(set(vertices)) == len(vertices):
+                        best = max(best, sum(e[2] for e in combo))
+
+            assert total == best
+
+    # --- tournament ---
+
+    @pytest.mark.parametrize("pairing", ["blossom", "dutch", "backtrack"])
+    def test_tournament_pairing(self, pairing):
+        T1 = Tournament(
+            World, "Test1", "TestAre1", "01.01.2020", "02.01.2020", "bullet", "",
+            pairing=pairing,
+        )
+        World.add_tournament(T1)
+        World.set_active_tournament(T1)
+        for i, elo in enumerate([1380, 2120, 1612, 999, 1720, 2000, 230, 3000]):
+            World.add_actor(Player(f"P{i+1}", "p", "1.1.1979", "M", elo), T1)
+
+        T1.status = Status.INITIALIZED
+        games = set()
+        for r in range(4):
+            T1.start_round()
+            assert len(T1.current_round().games) == 4
+            for i, game in enumerate(T1.current_round().games):
+                games.add(frozenset((game[0][0], game[1][0])))
+                T1.set_results(i, *Round.convert_score_symbol("<"))
+
+        assert len(games) == 16  # no rematch
+        assert T1.serialize()["pairing"] == pairing
@@ -60,6 +60,28 @@ class TestPlayer:
         assert self.P1._birthdate.month == 2
         assert self.P1._birthdate.year == 3000
 
+    def test_birthdate_ordinal(self):
+        self.P1.birthdate = "29.2.2000"
+        assert self.P1._birth_ordinal == datetime.date(2000, 2, 29).toordinal()
+        assert self.P1._birthdate == datetime.datetime(2000, 2, 29)
+        assert self.P1.serialize()["birthdate"] == "29/02/2000"
+
+    # --- compact representation ---
+
+    def test_no_instance_dict(self):
+        assert not hasattr(self.P1, "__dict__")
+        with pytest.raises(AttributeError):
+            self.P1.nickname = "P1"
+
+    def test_interned_names(self):
+        name = "".join(["Name", "1"])
+        assert Player(name, "Nickname1", "1.1.1979", "H", 1000).family_name is self.P1.family_name
+
+    def test_played_actors_shared_until_set(self):
+        assert self.P1.played_actors is self.P2.played_actors
+        self.P1.set_played(self.P2.uid)
+        assert self.P1.has_played(self.P2.uid) and not self.P2.has_played(self.P1.uid)
+
     # --- add_to_score ---
 
     def test_add_to_score(self):
@@ -104,8 +126,79 @@ class TestPlayer:
         assert "1380" in oneline
         assert "H" in oneline
 
+    def test_one_line_cached(self):
+        assert self.P1.one_line() is self.P1.one_line()
+        assert self.P1.one_line(age=False) != self.P1.one_line()
+
+    def test_one_line_invalidated(self):
+        version = self.P1.version
+        self.P1.one_line()
+        self.P1.elo = 1500
+        self.P1.add_to_score(1)
+        assert self.P1.version > version
+        assert "1500" in self.P1.one_line() and "PTS:  1" in self.P1.one_line()
+
+        self.P1.dirty = False  # saved: the row is still valid
+        assert self.P1.one_line() is self.P1.one_line()
+
+    # --- dirty ---
+
+    def test_dirty_new_instance(self):
+        assert self.P1.dirty is True
+
+    def test_dirty_on_change(self):
+        self.P1.dirty = False
+        self.P1.elo = 1500
+        assert self.P1.dirty is True
+
+    def test_dirty_on_score(self):
+        self.P1.dirty = False
+        self.P1.add_to_score(1)
+        assert self.P1.dirty is True
+
+    # --- sort ---
+
+    @pytest.mark.parametrize("sortby", ["alpha", "elo", "score", "age", "sex"])
+    def test_multisort_legacy_order(self, sortby):
+        players = [
+            Player(name, first, birthdate, sex, elo, score=score)
+            for name, first, birthdate, sex, elo, score in [
+                ("B", "a", "1.1.1979", "H", 1500, 1),
+                ("A", "b", "2.3.1990", "F", 1500, 1),
+                ("A", "a", "1.1.1979", "F", 2000, 0.5),
+                ("Ab", "a", "5.6.1979", "H", 1200, 1),
+                ("C", "c", "2.3.1990", "H", 1500, 0),
+            ]
+        ]
+
+        expected = list(players)
+        for key, reverse in reversed(Player.get_sort_key(sortby)):  # previous multi-pass sort
+            expected.sort(key=lambda x: getattr(x, key), reverse=reverse)
+
+        assert Player.multisort(players, Player.get_sort_key(sortby)) == expected
+
+    def test_multisort_mixed_directions(self):
+        names = ["ab", "b", "abc", "ab"]
+        players = [Player(x, "p", "1.1.1979", "H", 1000 - i) for i, x in enumerate(names)]
+        Player.multisort(players, (("family_name", True), ("elo", False)))
+        assert [(x.family_name, x.elo) for x in players] == [
+            ("b", 999),
+            ("abc", 998),
+            ("ab", 997),
+            ("ab", 1000),
+        ]
+
     # --- serialize ---
 
+    def test_from_serialized(self):
+        rows = [self.P1.serialize(), self.P2.serialize(), self.P1.serialize()]
+        players = Player.from_serialized(rows)
+
+        assert [x.serialize() for x in players] == rows
+        assert [x.age for x in players] == [self.P1.age, self.P2.age, self.P1.age]
+        assert not any(x.dirty for x in players)
+        assert players[0].family_name is players[2].family_name
+
     def test_serialize_format(self):
         assert type(self.P1.serialize()) == dict
 
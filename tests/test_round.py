@@ -166,3 +166,20 @@ class TestRound:
         assert (
             len(Round.list_games(self.T1, World)) == 24
         )  # (SPACE + ROUND NAME + GAMES) x 4
+
+    def test_list_games_cached(self):
+        for i in range(3, 7):
+            World.add_actor(Player(f"P{i}", "p", "1.1.1979", "M", 1000 + i), self.T1)
+        for player in (self.P1, self.P2):
+            World.add_actor(player, self.T1)
+        self.T1.status = Status.INITIALIZED
+        self.T1.start_round()
+
+        rows = Round.list_games(self.T1, World)
+        assert Round.list_games(self.T1, World)[2][0] is rows[2][0]
+
+        self.T1.set_results(0, 1, 0)
+        assert "PTS:  1" in Round.list_games(self.T1, World)[2][0]
+
+        World.get_actor(self.T1.current_round().games[0][1][0]).first_name = "q"
+        assert " Q " in Round.list_games(self.T1, World)[2][0]
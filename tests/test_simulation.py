@@ -0,0 +1,87 @@
+#! /usr/bin/env python3
+# coding: utf-8
+
+"""
+The purpose of this module is to test the tournament simulations
+"""
+
+import random
+import time
+
+from model.world import World
+from model.tournament import Status
+from model.simulation import simulate, prize_probabilities, get_state
+
+from utils import gen_fake_tournament, play_fake_round
+
+
+class TestSimulation:
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    def setup_method(self):
+        World.clear()
+        random.seed(0)
+
+        self.T1 = gen_fake_tournament(World, 8, num_rounds=4, played_rounds=2)
+        self.T1.pairing = "dutch"
+
+    def test_get_state(self):
+        self.T1.start_round()
+        self.T1.set_results(0, 1, 0)
+
+        state = get_state(self.T1)
+        assert len(state["played"]) == 12
+        assert len(state["pending"]) == 3
+        assert state["num_rounds"] == 1
+        assert sum(state["scores"]) == 9
+
+    def test_distributions(self):
+        distributions = simulate(self.T1, 50, processes=1, seed=1)
+
+        assert len(distributions) == 8
+        for uid, x in distributions.items():
+            assert abs(sum(x["ranks"]) - 1) < 1e-9
+            assert self.T1.get_score(uid) <= x["mean_score"] <= self.T1.get_score(uid) + 2
+
+        assert abs(sum(prize_probabilities(distributions, places=3).values()) - 3) < 1e-9
+
+    def test_tournament_untouched(self):
+        self.T1.mark_clean()
+        simulate(self.T1, 10, processes=1, seed=1)
+
+        assert len(self.T1.rounds) == 2
+        assert self.T1.is_dirty() is False
+
+    def test_seed_reproducible(self):
+        assert simulate(self.T1, 20, processes=1, seed=3) == simulate(
+            self.T1, 20, processes=1, seed=3
+        )
+
+    def test_finished_tournament(self):
+        play_fake_round(World, self.T1)
+        play_fake_round(World, self.T1)
+        self.T1.status = Status.CLOSING
+
+        distributions = simulate(self.T1, 10, processes=1, seed=1)
+        leader = max(
+            self.T1.players,
+            key=lambda x: (self.T1.get_score(x), World.get_actor(x).elo),
+        )
+        assert distributions[leader]["ranks"][0] == 1
+
+    def test_process_pool(self):
+        distributions = simulate(self.T1, 20, processes=2, seed=1)
+        assert all(abs(sum(x["ranks"]) - 1) < 1e-9 for x in distributions.values())
+
+    def test_budgeted_pairing(self):
+        World.clear()
+        tournament = gen_fake_tournament(World, 64, num_rounds=7, played_rounds=2)
+        tournament.pairing = "backtrack"
+
+        start = time.monotonic()
+        distributions = simulate(tournament, 20, processes=1, seed=1)
+
+        assert time.monotonic() - start < 2  # not one pairing budget per simulated round
+        assert all(abs(sum(x["ranks"]) - 1) < 1e-9 for x in distributions.values())
@@ -0,0 +1,153 @@
+#! /usr/bin/env python3
+# coding: utf-8
+
+"""
+The purpose of this module is to test the SqliteIO class
+"""
+
+import sqlite3
+
+from model.world import World
+from model.round import Round
+from model.player import Player
+from model.tournament import Tournament, Status
+from model.tiny import TinyDbIO
+from model.sqlite import SqliteIO
+from model.storage import get_backend
+
+from CTM_migrate import migrate
+
+
+class TestSqliteIO:
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    def setup_method(self):
+        World.clear()
+
+        self.T1 = Tournament(
+            World, "Test1", "TestAre1", "01.01.2020", "02.01.2020", "bullet", ""
+        )
+        self.T2 = Tournament(
+            World, "Test2", "TestAre1", "01.01.2021", "02.01.2021", "blitz", ""
+        )
+        World.add_tournament(self.T1)
+        World.add_tournament(self.T2)
+        World.set_active_tournament(self.T1)
+
+        for i, elo in enumerate([1380, 2120, 1612, 999, 1720, 2000, 230, 3000]):
+            World.add_actor(Player(f"P{i+1}", "p", "1.1.1979", "M", elo), self.T1)
+
+        self.T1.status = Status.INITIALIZED
+        self.T1.start_round()
+        self.T1.set_results(0, *Round.convert_score_symbol("<"))
+        self.T1.set_results(1, *Round.convert_score_symbol("="))
+
+    def _snapshot(self):
+        return (
+            [x.serialize() for x in World.tournaments],
+            [x.serialize() for x in World.get_all_actors()],
+        )
+
+    # --- save_all / load_all ---
+
+    def test_save_load_all(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(SqliteIO, "path", str(tmp_path / "tournament.db"))
+        expected = self._snapshot()
+
+        SqliteIO.save_all()
+        loaded = SqliteIO.load_all()
+
+        assert loaded == expected
+        assert loaded[1][0]["score"] == expected[1][0]["score"]
+        assert {type(x["score"]) for x in loaded[1]} == {
+            type(x["score"]) for x in expected[1]
+        }
+
+    def test_load_all_world(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(SqliteIO, "path", str(tmp_path / "tournament.db"))
+        expected = self._snapshot()
+        SqliteIO.save_all()
+
+        World.load(*SqliteIO.load_all())
+
+        assert self._snapshot() == expected
+        assert all(x.is_dirty() is False for x in World.tournaments)
+
+    def test_wal_mode(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(SqliteIO, "path", str(tmp_path / "tournament.db"))
+        SqliteIO.save_all()
+
+        db = sqlite3.connect(SqliteIO.path)
+        assert db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        db.close()
+
+    def test_old_schema_migrated(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(SqliteIO, "path", str(tmp_path / "tournament.db"))
+        db = sqlite3.connect(SqliteIO.path)
+        db.execute(
+            "CREATE TABLE tournaments (uid TEXT PRIMARY KEY, name TEXT NOT NULL, "
+            "place TEXT, start_date TEXT, end_date TEXT, num_rounds INTEGER, "
+            "game_type TEXT, description TEXT, status TEXT)"
+        )
+        db.close()
+
+        SqliteIO.save_all()
+
+        assert SqliteIO.load_all()[0][0]["pairing"] == "greedy"
+
+    # --- save_changes ---
+
+    def test_save_changes(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(SqliteIO, "path", str(tmp_path / "tournament.db"))
+        SqliteIO.save_all()
+
+        self.T1.set_results(2, *Round.convert_score_symbol(">"))
+        self.T2.description = "note"
+        World.add_actor(Player("P9", "p", "1.1.1979", "M", 1500), self.T2)
+        expected = self._snapshot()
+
+        SqliteIO.save_changes()
+
+        assert SqliteIO.load_all() == expected
+        assert all(x.is_dirty() is False for x in World.tournaments)
+        assert all(x.dirty is False for x in World.get_all_actors())
+
+    def test_journal_seq_skips_saved_records(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(SqliteIO, "path", str(tmp_path / "tournament.db"))
+        monkeypatch.setattr(SqliteIO, "journal_path", str(tmp_path / "journal"))
+        SqliteIO.save_all()
+        SqliteIO.open_journal()
+
+        self.T1.set_results(2, *Round.convert_score_symbol(">"))
+        SqliteIO.write_snapshot(SqliteIO.snapshot_changes())  # journal not truncated
+        self.T1.set_results(3, *Round.convert_score_symbol("<"))
+        expected = self._snapshot()
+        SqliteIO.close_journal()
+
+        assert SqliteIO.load_journal_seq() == 1
+        assert [x["seq"] for x in SqliteIO.load_journal()] == [2]
+
+        World.load(*SqliteIO.load_all(), SqliteIO.load_journal())
+        assert self._snapshot() == expected
+
+    # --- backends ---
+
+    def test_get_backend(self):
+        assert get_backend("sqlite") is SqliteIO
+        assert get_backend("tinydb") is TinyDbIO
+
+    # --- migration ---
+
+    def test_migrate(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(TinyDbIO, "path", str(tmp_path / "tournament.json"))
+        monkeypatch.setattr(TinyDbIO, "journal_path", TinyDbIO.journal_path)
+        monkeypatch.setattr(SqliteIO, "path", SqliteIO.path)
+        expected = self._snapshot()
+        TinyDbIO.save_all()
+
+        counts = migrate(str(tmp_path / "tournament.json"), str(tmp_path / "t.db"))
+
+        assert counts == (2, 8)
+        assert SqliteIO.load_all() == expected
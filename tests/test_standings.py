@@ -0,0 +1,145 @@
+#! /usr/bin/env python3
+# coding: utf-8
+
+"""
+The purpose of this module is to test the tiebreaks and standings of the tournaments
+"""
+
+import random
+
+from model.world import World
+from model.round import Round
+from model.standings import Tiebreaks
+from model.player import Player
+
+from utils import gen_fake_tournament, get_fake_score
+
+
+def naive_tiebreaks(tournament):
+    """ Compute the tiebreaks of every player by scanning all the games. """
+
+    scores = {x: 0 for x in tournament.players}
+    for r in tournament.rounds:
+        for (player1, score1), (player2, score2) in r.games:
+            scores[player1] += score1
+            scores[player2] += score2
+
+    tiebreaks = {}
+    for uid in tournament.players:
+        buchholz = sonneborn_berger = progressive = cumulated = 0
+        for r in tournament.rounds:
+            for game in r.games:
+                for (player, result), (opponent, _) in (game, game[::-1]):
+                    if player == uid:
+                        buchholz += scores[opponent]
+                        sonneborn_berger += result * scores[opponent]
+                        cumulated += result
+            progressive += cumulated
+        tiebreaks[uid] = (scores[uid], buchholz, sonneborn_berger, progressive)
+
+    return tiebreaks
+
+
+class TestTiebreaks:
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    def setup_method(self):
+        World.clear()
+        random.seed(0)
+
+        self.T1 = gen_fake_tournament(World, 12, num_rounds=5, played_rounds=3)
+
+    def _check(self):
+        expected = naive_tiebreaks(self.T1)
+        for uid in self.T1.players:
+            assert self.T1.get_tiebreaks(uid) == expected[uid]
+
+    def test_built_from_rounds(self):
+        self._check()
+
+    def test_updated_on_results(self):
+        self.T1.get_tiebreaks(self.T1.players[0])  # build the running totals first
+        self.T1.start_round()
+        for i in range(len(self.T1.current_round().games)):
+            self.T1.set_results(i, *get_fake_score())
+        self._check()
+
+    def test_updated_on_corrected_result(self):
+        self.T1.start_round()
+        self.T1.set_results(0, 1, 0)
+        self.T1.get_tiebreaks(self.T1.players[0])
+        self.T1.set_results(0, 0, 1)
+        self.T1.set_results(1, 0.5, 0.5)
+        self._check()
+
+    def test_updated_on_new_player(self):
+        tiebreaks = Tiebreaks(["a", "b"])
+        tiebreaks.start_round(0, [("a", "b")])
+        tiebreaks.set_result(0, "a", "b", 1, 0)
+        tiebreaks.add_player("c")
+
+        assert tiebreaks.get("a") == (1, 0, 0, 1)
+        assert tiebreaks.get("b") == (0, 1, 0, 0)
+        assert tiebreaks.get("c") == (0, 0, 0, 0)
+
+    def test_standings_sorted(self):
+        self.T1.mark_clean()
+        keys = [(self.T1.get_tiebreaks(x.uid), x.elo) for x in self.T1.standings()]
+        assert keys == sorted(keys, reverse=True)
+        assert self.T1.is_dirty() is False
+
+    def test_replayed_round(self):
+        self.T1.get_tiebreaks(self.T1.players[0])
+        new_round = Round(World, "Round 4", 3, self.T1.players)
+        World.replay(
+            [{"op": "round", "t": self.T1.uid, "data": new_round.serialize(), "closed": None}]
+        )
+        self.T1.set_results(0, 1, 0)
+        self._check()
+
+
+class TestStandings:
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    def setup_method(self):
+        World.clear()
+        random.seed(1)
+
+        self.T1 = gen_fake_tournament(World, 16, num_rounds=5, played_rounds=2)
+
+    def _sorted(self):
+        return sorted(
+            self.T1.players,
+            key=lambda x: (self.T1.get_tiebreaks(x), World.get_actor(x).elo, x),
+            reverse=True,
+        )
+
+    def test_kept_sorted_on_results(self):
+        self.T1.start_round()
+        assert [x.uid for x in self.T1.standings()] == self._sorted()
+
+        for i in range(len(self.T1.current_round().games)):
+            self.T1.set_results(i, *get_fake_score())
+            assert [x.uid for x in self.T1.standings()] == self._sorted()
+
+        self.T1.set_results(0, 0.5, 0.5)  # corrected result
+        assert [x.uid for x in self.T1.standings()] == self._sorted()
+
+    def test_not_sorted_again(self, monkeypatch):
+        self.T1.start_round()
+        self.T1.standings()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("sorted again")
+
+        monkeypatch.setattr(self.T1, "_build_standings", fail)
+        self.T1.set_results(0, 1, 0)
+        assert len(self.T1.standings()) == 16
+
+    def test_list_actors_by_score(self):
+        lines = Player.list_actors(self.T1, World, "score")
+        assert [x[0] for x in lines] == [f" {x.one_line()} " for x in self.T1.standings()]
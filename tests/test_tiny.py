@@ -0,0 +1,266 @@
+#! /usr/bin/env python3
+# coding: utf-8
+
+"""
+The purpose of this module is to test the TinyDbIO class
+"""
+
+import os
+
+from tinydb import TinyDB
+
+from model.world import World
+from model.round import Round
+from model.player import Player
+from model.tournament import Tournament, Status
+from model.tiny import TinyDbIO, TinyShardsIO
+
+
+class TestTinyDbIO:
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    def setup_method(self):
+        World.clear()
+
+        self.T1 = Tournament(
+            World, "Test1", "TestAre1", "01.01.2020", "02.01.2020", "bullet", ""
+        )
+        self.T2 = Tournament(
+            World, "Test2", "TestAre1", "01.01.2021", "02.01.2021", "blitz", ""
+        )
+        World.add_tournament(self.T1)
+        World.add_tournament(self.T2)
+        World.set_active_tournament(self.T1)
+
+        for i, elo in enumerate([1380, 2120, 1612, 999, 1720, 2000, 230, 3000]):
+            World.add_actor(Player(f"P{i+1}", "p", "1.1.1979", "M", elo), self.T1)
+
+    def _read(self, path):
+        db = TinyDB(path)
+        tournaments = db.table("tournaments").all()
+        players = db.table("players").all()
+        db.close()
+        return tournaments, players
+
+    # --- save_all ---
+
+    def test_save_all(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(TinyDbIO, "path", str(tmp_path / "tournament.json"))
+
+        TinyDbIO.save_all()
+        tournaments, players = self._read(TinyDbIO.path)
+
+        assert len(tournaments) == 2
+        assert len(players) == 8
+        assert self.T1.is_dirty() is False
+        assert all(x.dirty is False for x in World.get_all_actors())
+
+    # --- save_changes ---
+
+    def test_save_changes_only_dirty(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(TinyDbIO, "path", str(tmp_path / "tournament.json"))
+        TinyDbIO.save_all()
+
+        self.T1.status = Status.INITIALIZED
+        self.T1.start_round()
+        self.T1.set_results(0, *Round.convert_score_symbol("<"))
+
+        dirty_actors = [x for x in World.get_all_actors() if x.dirty]
+        assert len(dirty_actors) == 2
+        assert self.T1.is_dirty() is True
+        assert self.T2.is_dirty() is False
+
+        TinyDbIO.save_changes()
+        tournaments, players = self._read(TinyDbIO.path)
+
+        assert len(tournaments) == 2
+        assert len(players) == 8
+        saved = {x["uid"]: x for x in tournaments}
+        assert len(saved[self.T1.uid]["rounds"]) == 1
+        assert len(saved[self.T2.uid]["rounds"]) == 0
+        assert sorted(x["score"] for x in players) == [0] * 7 + [1]
+        assert self.T1.is_dirty() is False
+        assert all(x.dirty is False for x in World.get_all_actors())
+
+    def test_save_changes_new_documents(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(TinyDbIO, "path", str(tmp_path / "tournament.json"))
+        TinyDbIO.save_all()
+
+        T3 = Tournament(
+            World, "Test3", "TestAre1", "01.01.2022", "02.01.2022", "blitz", ""
+        )
+        World.add_tournament(T3)
+        World.add_actor(Player("P9", "p", "1.1.1979", "M", 1500), T3)
+
+        TinyDbIO.save_changes()
+        tournaments, players = self._read(TinyDbIO.path)
+
+        assert len(tournaments) == 3
+        assert len(players) == 9
+
+    def _write_legacy(self, *tournaments):
+        db = TinyDB(TinyDbIO.path)
+        for tournament in tournaments:
+            legacy = tournament.serialize()
+            del legacy["uid"]
+            db.table("tournaments").insert(legacy)
+        db.close()
+
+    def test_save_changes_legacy_file(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(TinyDbIO, "path", str(tmp_path / "tournament.json"))
+        self._write_legacy(self.T1, self.T2)
+
+        # the legacy tournaments were never loaded, they must be kept
+        World.clear()
+        World.add_tournament(
+            Tournament(World, "Test3", "TestAre1", "01.01.2022", "02.01.2022", "blitz", "")
+        )
+        TinyDbIO.save_changes()
+        tournaments, players = self._read(TinyDbIO.path)
+
+        assert sorted(x["name"] for x in tournaments) == ["Test1", "Test2", "Test3"]
+        assert all("uid" in x for x in tournaments)
+
+    def test_save_changes_loaded_legacy_file(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(TinyDbIO, "path", str(tmp_path / "tournament.json"))
+        self._write_legacy(self.T1, self.T2)
+
+        World.load(*TinyDbIO.load_all())
+        World.tournaments[0].status = Status.INITIALIZED
+        TinyDbIO.save_changes()
+        tournaments, players = self._read(TinyDbIO.path)
+
+        assert sorted(x["name"] for x in tournaments) == ["Test1", "Test2"]
+        assert {x["uid"] for x in tournaments} == {x.uid for x in World.tournaments}
+
+    # --- load_all ---
+
+    def test_load_all_is_clean(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(TinyDbIO, "path", str(tmp_path / "tournament.json"))
+        TinyDbIO.save_all()
+
+        World.load(*TinyDbIO.load_all())
+
+        assert len(World.tournaments) == 2
+        assert len(World.get_all_actors()) == 8
+        assert all(x.is_dirty() is False for x in World.tournaments)
+        assert all(x.dirty is False for x in World.get_all_actors())
+
+    # --- journal ---
+
+    def test_save_changes_truncates_journal(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(TinyDbIO, "path", str(tmp_path / "tournament.json"))
+        monkeypatch.setattr(TinyDbIO, "journal_path", str(tmp_path / "journal"))
+        TinyDbIO.save_all()
+
+        TinyDbIO.open_journal()
+        World.add_actor(Player("P9", "p", "1.1.1979", "M", 1500), self.T2)
+        assert len(TinyDbIO.load_journal()) == 1
+
+        TinyDbIO.save_changes()
+        assert len(TinyDbIO.load_journal()) == 0
+        TinyDbIO.close_journal()
+
+    def test_load_all_with_journal(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(TinyDbIO, "path", str(tmp_path / "tournament.json"))
+        monkeypatch.setattr(TinyDbIO, "journal_path", str(tmp_path / "journal"))
+        TinyDbIO.save_all()
+
+        TinyDbIO.open_journal()
+        World.add_actor(Player("P9", "p", "1.1.1979", "M", 1500), self.T2)
+        TinyDbIO.close_journal()
+
+        World.load(*TinyDbIO.load_all(), TinyDbIO.load_journal())
+
+        assert len(World.get_all_actors()) == 9
+        assert len(World.get_actors(World.get_tournament(self.T2.uid))) == 1
+
+
+class TestTinyShardsIO:
+    setup_method = TestTinyDbIO.setup_method
+    _read = TestTinyDbIO._read
+
+    def _use_tmp(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(TinyShardsIO, "path", str(tmp_path / "index.json"))
+        monkeypatch.setattr(TinyShardsIO, "journal_path", str(tmp_path / "journal"))
+
+    def _play_round(self, tournament):
+        tournament.status = Status.INITIALIZED
+        tournament.start_round()
+        tournament.set_results(0, *Round.convert_score_symbol("<"))
+
+    def test_shards_save_all(self, tmp_path, monkeypatch):
+        self._use_tmp(tmp_path, monkeypatch)
+        self._play_round(self.T1)
+
+        TinyShardsIO.save_all()
+        tournaments, players = self._read(TinyShardsIO.path)
+
+        assert len(tournaments) == 2
+        assert len(players) == 8
+        assert all("rounds" not in x for x in tournaments)
+        assert len(TinyShardsIO.load_shard(self.T1.uid)) == 1
+        assert len(TinyShardsIO.load_shard(self.T2.uid)) == 0
+
+    def test_shards_load_is_lazy(self, tmp_path, monkeypatch):
+        self._use_tmp(tmp_path, monkeypatch)
+        self._play_round(self.T1)
+        TinyShardsIO.save_all()
+
+        World.load(*TinyShardsIO.load_all())
+        tournament = World.get_tournament(self.T1.uid)
+
+        assert tournament.is_hydrated() is False
+        assert tournament.num_played_rounds() == 1
+        assert tournament.is_dirty() is False
+        assert len(tournament.rounds[0].games) == 4
+        assert tournament.is_hydrated() is True
+
+    def test_shards_save_changes_only_dirty(self, tmp_path, monkeypatch):
+        self._use_tmp(tmp_path, monkeypatch)
+        TinyShardsIO.save_all()
+        shard_t2 = TinyShardsIO._shard_path(self.T2.uid)
+        mtime = os.stat(shard_t2).st_mtime_ns
+
+        self._play_round(self.T1)
+        TinyShardsIO.save_changes()
+
+        assert len(TinyShardsIO.load_shard(self.T1.uid)) == 1
+        assert os.stat(shard_t2).st_mtime_ns == mtime
+        assert self.T1.is_dirty() is False
+
+    def test_shards_closed_not_rewritten(self, tmp_path, monkeypatch):
+        self._use_tmp(tmp_path, monkeypatch)
+        self._play_round(self.T1)
+        self.T1.status = Status.CLOSED
+        TinyShardsIO.save_all()
+        mtime = os.stat(TinyShardsIO._shard_path(self.T1.uid)).st_mtime_ns
+
+        self.T1.name = "Renamed"
+        TinyShardsIO.save_changes()
+
+        assert os.stat(TinyShardsIO._shard_path(self.T1.uid)).st_mtime_ns == mtime
+
+    def test_shards_closed_keeps_last_results(self, tmp_path, monkeypatch):
+        self._use_tmp(tmp_path, monkeypatch)
+        self._play_round(self.T1)
+        for i in range(1, 4):
+            self.T1.set_results(i, *Round.convert_score_symbol("="))
+        self.T1.start_round()
+        TinyShardsIO.save_all()
+
+        # the final results and the close land in the same save
+        for i in range(4):
+            self.T1.set_results(i, *Round.convert_score_symbol(">"))
+        self.T1.current_round().close()
+        self.T1.status = Status.CLOSED
+        TinyShardsIO.save_changes()
+
+        World.load(*TinyShardsIO.load_all())
+        tournament = World.get_tournament(self.T1.uid)
+
+        assert tournament.num_played_rounds() == 2
+        assert [x[0][1] for x in tournament.rounds[1].games] == [0.0] * 4
+        assert [x[1][1] for x in tournament.rounds[1].games] == [1.0] * 4
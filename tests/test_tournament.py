@@ -5,6 +5,7 @@
 The purpose of this module is to test the Tournament class
 """
 
+import json
 import pytest
 
 from model.world import World
@@ -15,6 +16,7 @@ from model.tournament import (
     Status,
     IsComplete,
     IsNotReady,
+    EnumEncoder,
 )
 
 
@@ -91,14 +93,17 @@ class TestTournament:
 
         results = self.T1.get_overall_infos()
 
-        assert results["result0"] == self.P8.one_line()
-        assert results["result1"] == self.P2.one_line()
-        assert results["result2"] == self.P6.one_line()
-        assert results["result3"] == self.P5.one_line()
-        assert results["result4"] == self.P7.one_line()
-        assert results["result5"] == self.P1.one_line()
-        assert results["result6"] == self.P4.one_line()
-        assert results["result7"] == self.P3.one_line()
+        # P2 and P8 (3 pts) are split by their Buchholz, as P7 and P5 (2 pts), P1 and P4 (1.5 pts)
+        assert results["result0"].startswith(self.P2.one_line())
+        assert results["result1"].startswith(self.P8.one_line())
+        assert results["result2"].startswith(self.P6.one_line())
+        assert results["result3"].startswith(self.P7.one_line())
+        assert results["result4"].startswith(self.P5.one_line())
+        assert results["result5"].startswith(self.P1.one_line())
+        assert results["result6"].startswith(self.P4.one_line())
+        assert results["result7"].startswith(self.P3.one_line())
+        assert self.T1.get_tiebreaks(self.P2.uid) == (3, 9, 6, 7)
+        assert self.T1.get_tiebreaks(self.P8.uid) == (3, 7.5, 5, 8)
 
         assert self.P8.score == 3
         assert self.P2.score == 3
@@ -188,11 +193,160 @@ class TestTournament:
         self.T1.start_round()
         assert self.T1.rounds[-1] == self.T1.current_round()
 
+    # --- dirty ---
+
+    def test_is_dirty_new_instance(self):
+        assert self.T1.is_dirty() is True
+
+    def test_mark_clean(self):
+        self.T1.status = Status.INITIALIZED
+        self.T1.start_round()
+        self.T1.mark_clean()
+        assert self.T1.is_dirty() is False
+        assert self.T1.current_round().dirty is False
+
+    def test_is_dirty_on_results(self):
+        self.T1.status = Status.INITIALIZED
+        self.T1.start_round()
+        self.T1.mark_clean()
+        self.T1.set_results(0, 1, 0)
+        assert self.T1.dirty is False
+        assert self.T1.current_round().dirty is True
+        assert self.T1.is_dirty() is True
+
+    def test_is_dirty_on_edit(self):
+        self.T1.mark_clean()
+        self.T1.description = "note"
+        assert self.T1.is_dirty() is True
+
     # --- serialize ---
 
     def test_serialize_format(self):
         assert type(self.T1.serialize()) == dict
 
+    def test_serialize_uid(self):
+        assert self.T1.serialize()["uid"] == self.T1.uid
+
+    def test_serialize_json_native(self):
+        self.T1.status = Status.INITIALIZED
+        self.T1.start_round()
+        self.T1.set_results(0, 1, 0)
+
+        data = self.T1.serialize()
+        assert json.loads(json.dumps(data, cls=EnumEncoder)) == data
+        assert data["status"] == {"__enum__": "Status.INITIALIZED"}
+
+    # --- lazy rounds ---
+
+    def _reload_world(self):
+        self.T1.status = Status.INITIALIZED
+        self.T1.start_round()
+        self.T1.set_results(0, 1, 0)
+        data = self.T1.serialize()
+        World.load([data], [x.serialize() for x in World.get_all_actors()])
+        return data, World.tournaments[0]
+
+    def test_load_not_hydrated(self):
+        data, tournament = self._reload_world()
+        assert tournament.is_hydrated() is False
+        assert tournament.serialize() == data
+        assert tournament.is_hydrated() is False
+
+    def test_catalog_not_hydrated(self):
+        data, tournament = self._reload_world()
+        infos = tournament.catalog()
+        assert infos["num_players"] == 8
+        assert infos["num_played_rounds"] == 1
+        assert infos["status"] == Status.INITIALIZED
+        assert "Test1" in tournament.one_line()
+        assert tournament.is_hydrated() is False
+
+    def test_hydrate_on_access(self):
+        data, tournament = self._reload_world()
+        assert tournament.current_round().games[0][0][1] == 1
+        assert tournament.is_hydrated() is True
+        assert tournament.is_dirty() is False
+        assert tournament.serialize() == data
+
+    def test_hydrate_keeps_world_version(self):
+        data, tournament = self._reload_world()
+        version = World.version
+        assert len(tournament.rounds) == 1
+        assert tournament.is_hydrated() is True
+        assert World.version == version
+
+    # --- score index ---
+
+    def test_score_brackets(self):
+        self.T1.status = Status.INITIALIZED
+        self.T1.start_round()
+        self.T1.set_results(0, 1, 0)
+        self.T1.set_results(1, 0.5, 0.5)
+        game = self.T1.current_round().games[0]
+
+        brackets = self.T1.score_brackets()
+        assert [(score, len(players)) for score, players in brackets] == [
+            (1, 1),
+            (0.5, 2),
+            (0, 5),
+        ]
+        assert brackets[0][1][0].uid == game[0][0]
+        assert self.T1.get_score(game[0][0]) == 1
+
+    def test_score_brackets_sorted_by_elo(self):
+        players = self.T1.score_brackets()[0][1]
+        assert [x.elo for x in players] == sorted([x.elo for x in players], reverse=True)
+
+    def test_score_index_rebuilt_on_load(self):
+        data, tournament = self._reload_world()
+        game = tournament.current_round().games[0]
+        assert tournament.get_score(game[0][0]) == 1
+        assert tournament.is_dirty() is False
+
+    def test_has_played(self):
+        self.T1.status = Status.INITIALIZED
+        self.T1.start_round()
+        (player1, _), (player2, _) = self.T1.current_round().games[0]
+        (player3, _), _ = self.T1.current_round().games[1]
+
+        assert self.T1.has_played(player1, player2) is True
+        assert self.T1.has_played(player2, player1) is True
+        assert self.T1.has_played(player1, player3) is False
+
+    def test_has_played_per_tournament(self):
+        self.T1.status = Status.INITIALIZED
+        self.T1.start_round()
+        (player1, _), (player2, _) = self.T1.current_round().games[0]
+
+        T2 = Tournament(World, "Test2", "TestAre2", "01.01.2020", "02.01.2020", "bullet")
+        World.add_tournament(T2)
+        World.add_actor(World.get_actor(player1), T2)
+        World.add_actor(World.get_actor(player2), T2)
+
+        assert T2.has_played(player1, player2) is False
+
+    def test_has_played_more_seats(self):
+        self.T1.status = Status.INITIALIZED
+        self.T1.start_round()
+        (player1, _), (player2, _) = self.T1.current_round().games[0]
+
+        for i in range(10):
+            World.add_actor(Player(f"Q{i}", "q", "1.1.1979", "M", 1000 + i), self.T1)
+
+        assert self.T1.has_played(player1, player2) is True
+        assert self.T1.has_played(player1, self.T1.players[-1]) is False
+
+    def test_opponent_matrix_rebuilt_on_load(self):
+        data, tournament = self._reload_world()
+        (player1, _), (player2, _) = tournament.current_round().games[0]
+        assert tournament.has_played(player1, player2) is True
+        assert tournament.is_dirty() is False
+
+    def test_list_tournaments(self):
+        t = self.T1.list_tournaments(World)
+        assert isinstance(t, tuple)
+        assert len(t) == 1
+
     # --- get_overall_infos ---
 
     def test_get_overall_infos_format(self):
@@ -163,6 +163,28 @@ class TestWorld:
         with pytest.raises(NoActiveTournamentError):
             World.get_actors()
 
+    def test_get_actors_copy(self):
+        World.add_tournament(self.T1)
+        World.add_actor(self.P1, self.T1)
+
+        World.get_actors(self.T1).append(self.P2)
+        assert World.get_actors(self.T1) == [self.P1]
+
+    def test_get_actors_after_load(self):
+        World.add_tournament(self.T1)
+        World.add_actor(self.P1, self.T1)
+        World.add_actor(self.P2, self.T1)
+        World.add_actor(Player("P3", "p", "1.1.1979", "M", 1500), self.T2)
+
+        World.load(
+            [self.T1.serialize()], [x.serialize() for x in World.get_all_actors()]
+        )
+        tournament = World.tournaments[0]
+        assert [x.uid for x in World.get_actors(tournament)] == tournament.players
+
+        World.add_actor(Player("P4", "p", "1.1.1979", "M", 1600), tournament)
+        assert len(World.get_actors(tournament)) == 3
+
     # --- get all actors ---
 
     def test_get_all_actors_valid(self):
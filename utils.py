@@ -7,6 +7,9 @@
 import random
 import datetime
 
+from model.player import Player
+from model.tournament import Tournament, Status
+
 
 def get_fake_score_from_elo(elo1, elo2, symbol=False):
 
@@ -145,5 +148,67 @@ class FakePlayer:
         return r_list
 
 
+def gen_fake_tournament(world, num_players, num_rounds=4, played_rounds=0):
+    """Register a tournament filled with fake players, then play some rounds.
+
+    Parameters
+    ----------
+    world : World
+        the world instance in which the tournament and the players are registered
+    num_players : int
+        the number of fake players to register
+    num_rounds : int(4)
+        the number of rounds of the tournament
+    played_rounds : int(0)
+        the number of rounds to play with fake results (see play_fake_round)
+    """
+
+    tournament = Tournament(
+        world,
+        "Tournoi de test",
+        "Caen",
+        "20/12/2020",
+        "21/12/2020",
+        "bullet",
+        num_rounds=num_rounds,
+    )
+    world.add_tournament(tournament)
+    world.set_active_tournament(tournament)
+
+    for p in FakePlayer().gen(num_players):
+        player = Player(
+            p["familyname"], p["firstname"], p["birthdate"], p["sex"], p["elo"]
+        )
+        world.add_actor(player, tournament)
+
+    tournament.status = Status.INITIALIZED
+
+    for i in range(played_rounds):
+        play_fake_round(world, tournament)
+
+    return tournament
+
+
+def play_fake_round(world, tournament):
+    """Start a new round and set fake results (based on the ELO) to all its games.
+
+    Parameters
+    ----------
+    world : World
+        the world instance containing all tournament's and player's instances
+    tournament : Tournament
+        the tournament instance to play
+    """
+
+    tournament.start_round()
+
+    for i, game in enumerate(tournament.current_round().games):
+        player1 = world.get_actor(game[0][0])
+        player2 = world.get_actor(game[1][0])
+        tournament.set_results(i, *get_fake_score_from_elo(player1.elo, player2.elo))
+
+    tournament.current_round().close()
+
+
 # test  = fakePlayer()
 # print(test.gen(4))
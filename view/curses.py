@@ -27,6 +27,12 @@ class CurseView:
     focus : Curses.window
         This is any of the previous windows
 
+    The windows are erased (not cleared) and batched with noutrefresh / doupdate,
+    so curses only sends the changed characters to the terminal.
+    The last select list drawn in each window is kept (_frames), and moving its
+    selection only repaints the previously and newly highlighted rows.
+    The long lists are scrolled: only the rows fitting in the window are read.
+
     Public Methods
     --------------
     close()
@@ -42,10 +48,14 @@ class CurseView:
         Display the given message in the error window
     display_select(screen, options, current_row, colors=[1, 2])
         Display the given list as a menu and highlight the currently selected row
-    display_list(screen, rows, colors=[1, 2])
+    display_list(screen, rows, colors=[1, 2], top=0)
         Display the given list as a centered multi-lines list
     display_text(screen, text, colors=[1, 2])
         Display the given text at the center of the given window
+    display_status(text)
+        Display the given save status at the right of the head window
+    page_size(screen)
+        Return the number of rows of a list fitting in the given window
 
     init_form(screen, rows, source=None)
         Display a form and return the edit-box instances (the controller do the editing part)
@@ -69,8 +79,14 @@ class CurseView:
         Save the last item drawn so we can refraw it if needed (TODO problems with forms)
     _set_background_color(screen)
         Change the target window background color (and reset content... so call it first)
+    _draw_status()
+        Draw the current save status at the right of the head window
+    _update(screen)
+        Copy the window to the virtual screen, and update the terminal (unless deferred)
     """
 
+    STATUS_WIDTH = 30
+
     def __init__(self):
         logging.info("< Open Main View")
 
@@ -104,6 +120,9 @@ class CurseView:
 
         self.focus = self.menu
         self._last_draws = {}
+        self._frames = {}  # window -> (select list frame, highlighted row)
+        self._deferred = False
+        self._status = ""
 
     # === PUBLIC METHODS ===
 
@@ -123,16 +142,19 @@ class CurseView:
     # --- Clear screens --
 
     def clear_head(self):
-        self.head.clear()
-        self.head.refresh()
+        self._frames.pop(self.head, None)
+        self.head.erase()
+        self._update(self.head)
 
     def clear_main(self):
-        self.main.clear()
-        self.main.refresh()
+        self._frames.pop(self.main, None)
+        self.main.erase()
+        self._update(self.main)
 
     def clear_menu(self):
-        self.menu.clear()
-        self.menu.refresh()
+        self._frames.pop(self.menu, None)
+        self.menu.erase()
+        self._update(self.menu)
 
     # --- Display ---
 
@@ -151,21 +173,24 @@ class CurseView:
 
         # print msg
         if text == "":
-            self.error.clear()
+            self.error.erase()
         else:
             self.error.addstr(0, x, str(text))
 
-        self.error.refresh()
+        self._update(self.error)
 
     def display_select(self, screen, options, current_row, colors=[1, 2]):
         """Display the given list as a menu and highlight the currently selected row.
 
+        Only the rows fitting in the window are read from the list, and the list
+        is scrolled to keep the selected row visible.
+
         Parameters
         ----------
         screen : Curses.window
             The window on which the drawing takes place
-        options : dict
-            A dictionary containing the various informations required to draw the menu
+        options : list(str)
+            The labels of the rows (any sequence, see model.rows.LazyRows)
         current_row : int
             The row index of the currently selected row
         colors : list(int)
@@ -177,60 +202,79 @@ class CurseView:
         # turn off cursor blinking
         curses.curs_set(0)
 
-        self._set_background_color(screen)
         colors[0] = 1  # TODO
 
-        # clear screen
-        screen.clear()
+        # keep the scroll offset of the list, unless the selected row left the window
+        last = self._frames.get(screen)
+        top = last[2] if last is not None and last[0][0] is options else 0
+        page = self.page_size(screen)
+        if current_row >= 0:
+            top = min(max(top, current_row - page + 1), current_row)
+        top = max(0, min(top, len(options) - page))
+
+        visible = options[top: top + page]
+        width = max([len(x) for x in visible], default=0)
+
+        # repaint the highlighted rows only if the same rows are still drawn
+        frame = (options, list(colors), screen is self.focus, top)
+        if last is not None and last[0][0] is options and last[0][1:] == frame[1:]:
+            rows = (last[1], current_row)
+        else:
+            self._set_background_color(screen)
+            rows = range(top, top + len(visible))
+        self._frames[screen] = (frame, current_row, top)
 
         # get screen size
         h, w = screen.getmaxyx()
+        y = h // 2 - len(visible) // 2 - top
 
-        # display select list
-        for i, option in enumerate(options):
-            if i < self._mainH - 1:
+        # display select list (aligned to the larger visible row)
+        for i in rows:
+            if top <= i < top + len(visible):
+                option = visible[i - top].ljust(width)
                 x = w // 2 - len(option) // 2
-                y = h // 2 - min(len(options), self._mainH - 1) // 2 + i
 
                 if i == current_row:
                     screen.attron(curses.color_pair(colors[0]))
-                    screen.addstr(y, x, option)
+                    screen.addstr(y + i, x, option)
                     screen.attroff(curses.color_pair(colors[0]))
                 else:
-                    screen.addstr(y, x, option)
+                    screen.addstr(y + i, x, option)
 
         # update screen
         self._set_focus_design()
-        screen.refresh()
+        self._update(screen)
 
-    def display_list(self, screen, rows, colors=[1, 2]):
+    def display_list(self, screen, rows, colors=[1, 2], top=0):
         """Display the given list as a centered multi-lines list.
 
         Parameters
         ----------
         screen : Curses.window
             The window on which the drawing takes place
-        rows : dict
-            A dictionary containing the various informations required to draw the input fields
+        rows : list(str)
+            The lines to display
         colors : list(int)
             The colorsettings to use for drawing
+        top : int(0)
+            The index of the first line to display (scroll offset)
         """
 
-        self._save_last_draw(screen, rows, colors=colors)
+        self._save_last_draw(screen, rows, colors=colors, top=top)
 
         self._set_background_color(screen)
 
         h, w = screen.getmaxyx()
         max_txt = max([len(x) for x in rows])
+        visible = rows[top: top + self.page_size(screen)]
         x = w // 2 - max_txt // 2
-        y = (h - min(len(rows), self._mainH - 1)) // 2
-        for i, row in enumerate(rows):
-            if i < self._mainH - 1:
-                screen.addstr(y + i, x, row)
+        y = (h - len(visible)) // 2
+        for i, row in enumerate(visible):
+            screen.addstr(y + i, x, row)
 
         # update screen
         self._set_focus_design()
-        screen.refresh()
+        self._update(screen)
 
     def display_text(self, screen, text, colors=[1, 2]):
         """Display the given text at the center of the given window.
@@ -254,9 +298,39 @@ class CurseView:
         y = h // 2
         screen.addstr(y, x, text)
 
+        if screen is self.head:
+            self._draw_status()
+
         # update screen
         self._set_focus_design()
-        screen.refresh()
+        self._update(screen)
+
+    def display_status(self, text):
+        """Display the given save status at the right of the head window.
+
+        Parameters
+        ----------
+        text : str
+            The text to display (nothing is redrawn if it didn't change)
+        """
+
+        if text == self._status:
+            return
+
+        self._status = text
+        self._draw_status()
+        self._update(self.head)
+
+    def page_size(self, screen):
+        """Return the number of rows of a list fitting in the given window (inside its border).
+
+        Parameters
+        ----------
+        screen : Curses.window
+            The window to measure
+        """
+
+        return max(1, screen.getmaxyx()[0] - 2)
 
     # --- Forms methods ---
 
@@ -288,7 +362,7 @@ class CurseView:
 
         text_boxes, text_wins, error_box = self._draw_form(screen, rows, source)
         screen.border()
-        screen.refresh()
+        self._update(screen)
         return text_boxes, text_wins, error_box
 
     def close_form(self, screen):
@@ -314,7 +388,7 @@ class CurseView:
 
         v = input_tb.gather().strip()
 
-        input_win.clear()
+        input_win.erase()
         input_win.addstr(v)
 
         input_tb.edit(control_function)
@@ -334,10 +408,16 @@ class CurseView:
         if refresh is False:
             return
 
-        for win in self._last_draws.values():
-            eval(f"self.{win[0]}")(*win[1], **win[2])
+        # the windows are redrawn in one terminal update
+        self._deferred = True
+        try:
+            for win in self._last_draws.values():
+                getattr(self, win[0])(*win[1], **win[2])
+        finally:
+            self._deferred = False
 
         self._set_focus_design()
+        curses.doupdate()
 
     def swap_focus(self):
         """ Swap focus between the main and menu windows. """
@@ -418,7 +498,7 @@ class CurseView:
 
             sub2 = sub.subwin(1, width - 2, y_off + 2, x_off + 1)
             if source is not None:
-                sub2.addstr(str(eval("source." + row["name"])))
+                sub2.addstr(str(getattr(source, row["name"])))
             elif row["placeholder"] is not None:
                 sub2.addstr(str(row["placeholder"]))
             tb = curses.textpad.Textbox(sub2)
@@ -435,7 +515,7 @@ class CurseView:
         """ Display a border around the currently focused window. """
 
         self.focus.border()
-        self.focus.refresh()
+        self.focus.noutrefresh()
 
     def _save_last_draw(self, *args, **kwargs):
         """Save the last item drawn so we can refraw it if needed.
@@ -468,8 +548,36 @@ class CurseView:
             The window to target
         """
 
-        screen.clear()
+        if screen is self.screen:
+            self._frames.clear()  # the full screen covers the other windows
+        else:
+            self._frames.pop(screen, None)
+
+        screen.erase()
         if screen is self.main:
             screen.bkgd(" ", curses.color_pair(2) | curses.A_BOLD)
         else:
             screen.bkgd(" ", curses.color_pair(3) | curses.A_BOLD)
+
+    def _draw_status(self):
+        """ Draw the current save status at the right of the head window. """
+
+        h, w = self.head.getmaxyx()
+        if w <= self.STATUS_WIDTH + 1:
+            return
+
+        text = self._status[: self.STATUS_WIDTH].rjust(self.STATUS_WIDTH)
+        self.head.addstr(0, w - self.STATUS_WIDTH - 1, text)
+
+    def _update(self, screen):
+        """Copy the window to the virtual screen, and update the terminal (unless deferred).
+
+        Parameters
+        ----------
+        screen : Curses.window
+            The window to copy
+        """
+
+        screen.noutrefresh()
+        if self._deferred is False:
+            curses.doupdate()